@@ -0,0 +1,285 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple
+
+from core.health import SensorHealth
+from core.history import SampleHistory
+from drivers.lidar import EMPTY_SAMPLE, Lidar, LidarSample
+from utils.logger import log
+
+# Pause after a failed transaction so a dead bus does not spin the CPU
+ERROR_BACKOFF = 0.01
+
+# Called from a sampler thread with the sensor index and its new sample
+SampleListener = Callable[[int, LidarSample], None]
+
+
+def sample_once(lidar: Lidar, history: SampleHistory, health: SensorHealth) -> bool:
+    """Runs one timed transaction and records its outcome."""
+    start = time.monotonic()
+    ok = lidar.update()
+    health.record(ok, lidar.last_status, time.monotonic() - start)
+    if ok:
+        history.append(lidar.sample)
+    return ok
+
+
+def recover(lidar: Lidar, health: SensorHealth) -> None:
+    """Reopens the bus of a failing sensor and schedules the next attempt."""
+    delay = health.backoff()
+    try:
+        lidar.reopen()
+        health.reopen_count += 1
+        log("INFO", "ACQUISITION", f"Reopened I2C bus {lidar.bus_id}")
+    except Exception as e:
+        log(
+            "WARN",
+            "ACQUISITION",
+            f"Reopening bus {lidar.bus_id} failed: {e}, retry in {delay:.1f}s",
+        )
+
+
+class BusSampler(threading.Thread):
+    """
+    Continuously samples a single Lidar on its own I2C bus.
+
+    Every successful frame is published as a fresh, timestamped
+    LidarSample, so readers never see a half-updated reading and never
+    have to wait for a bus transaction. A failing bus is reopened with
+    exponential backoff without affecting the samplers of other buses.
+    """
+
+    def __init__(
+        self,
+        lidar: Lidar,
+        period: float = 0.0,
+        ready: Optional[threading.Event] = None,
+        history: Optional[SampleHistory] = None,
+        health: Optional[SensorHealth] = None,
+        on_sample: Optional[Callable[[LidarSample], None]] = None,
+    ) -> None:
+        """
+        Args:
+            lidar (Lidar): Sensor owned exclusively by this sampler.
+            period (float): Extra idle time between transactions (seconds).
+            ready (threading.Event): Set after the first good frame.
+            history (SampleHistory): Receives every good frame.
+            health (SensorHealth): Transaction statistics of the sensor.
+            on_sample (Callable): Called with every good frame once it is
+                the latest sample.
+        """
+        super().__init__(name=f"LidarSampler-{lidar.bus_id}", daemon=True)
+        self.lidar: Lidar = lidar
+        self.period: float = period
+        self.latest: LidarSample = EMPTY_SAMPLE
+        self.count: int = 0
+
+        # An empty history is falsy, so `or` would drop the engine's one
+        self.history: SampleHistory = (
+            history if history is not None else SampleHistory()
+        )
+        self.health: SensorHealth = (
+            health if health is not None else SensorHealth(lidar.bus_id)
+        )
+
+        self._ready = ready
+        self._on_sample = on_sample
+        self._stop_event = threading.Event()
+        self._started_at: float = 0.0
+
+    def run(self) -> None:
+        self._started_at = time.monotonic()
+        log("INFO", "ACQUISITION", f"Sampler for bus {self.lidar.bus_id} started")
+
+        while not self._stop_event.is_set():
+            wait = self.health.retry_in()
+            if wait > 0:
+                self._stop_event.wait(wait)
+                continue
+            if self.health.needs_reopen:
+                recover(self.lidar, self.health)
+
+            if sample_once(self.lidar, self.history, self.health):
+                # Reference assignment is atomic, readers get a coherent sample.
+                self.latest = self.lidar.sample
+                self.count += 1
+                if self._ready is not None:
+                    self._ready.set()
+                if self._on_sample is not None:
+                    self._on_sample(self.latest)
+            else:
+                self._stop_event.wait(ERROR_BACKOFF)
+
+            if self.period > 0:
+                self._stop_event.wait(self.period)
+
+        log("INFO", "ACQUISITION", f"Sampler for bus {self.lidar.bus_id} stopped")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def sample_rate(self) -> float:
+        """Returns the average number of good frames per second."""
+        elapsed = time.monotonic() - self._started_at
+        if not self._started_at or elapsed <= 0:
+            return 0.0
+        return self.count / elapsed
+
+
+class AcquisitionEngine:
+    """
+    Runs one BusSampler per LIDAR so that independent I2C buses are read
+    concurrently instead of one after another.
+
+    Without background samplers the same fan-out is available on demand
+    through poll() and, for asyncio callers, apoll().
+    """
+
+    def __init__(
+        self,
+        lidars: Sequence[Lidar],
+        period: float = 0.0,
+        history_size: int = 256,
+    ) -> None:
+        """
+        Args:
+            lidars (Sequence[Lidar]): Sensors, one per I2C bus.
+            period (float): Extra idle time between transactions per bus.
+            history_size (int): Samples kept per sensor for statistics.
+        """
+        self.lidars: Tuple[Lidar, ...] = tuple(lidars)
+        self.period: float = period
+        self.histories: Tuple[SampleHistory, ...] = tuple(
+            SampleHistory(history_size) for _ in self.lidars
+        )
+        self.health: Tuple[SensorHealth, ...] = tuple(
+            SensorHealth(lidar.bus_id) for lidar in self.lidars
+        )
+        self._samplers: Tuple[BusSampler, ...] = ()
+        self._ready: list[threading.Event] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Replaced, never mutated, so samplers iterate without a lock
+        self._listeners: Tuple[SampleListener, ...] = ()
+
+    def add_listener(self, listener: SampleListener) -> None:
+        """Registers a callback for every good frame of the samplers."""
+        self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener: SampleListener) -> None:
+        self._listeners = tuple(l for l in self._listeners if l is not listener)
+
+    def _notify(self, index: int, sample: LidarSample) -> None:
+        for listener in self._listeners:
+            listener(index, sample)
+
+    @property
+    def running(self) -> bool:
+        return any(s.is_alive() for s in self._samplers)
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._ready = [threading.Event() for _ in self.lidars]
+        self._samplers = tuple(
+            BusSampler(
+                lidar,
+                period=self.period,
+                ready=self._ready[i],
+                history=self.histories[i],
+                health=self.health[i],
+                on_sample=functools.partial(self._notify, i),
+            )
+            for i, lidar in enumerate(self.lidars)
+        )
+        for sampler in self._samplers:
+            sampler.start()
+
+        log(
+            "INFO",
+            "ACQUISITION",
+            f"Acquisition started on buses {[l.bus_id for l in self.lidars]}",
+        )
+
+    def wait_ready(self, timeout: float = 1.0) -> bool:
+        """
+        Blocks until every sampler has published at least one frame.
+
+        Returns:
+            bool: True if all sensors are ready, False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        for ready in self._ready:
+            if not ready.wait(max(0.0, deadline - time.monotonic())):
+                return False
+        return True
+
+    def snapshot(self) -> Tuple[LidarSample, ...]:
+        """Returns the latest sample of every sensor without blocking."""
+        if not self._samplers:
+            return tuple(lidar.sample for lidar in self.lidars)
+        return tuple(s.latest for s in self._samplers)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self.lidars), thread_name_prefix="LidarIO"
+            )
+        return self._executor
+
+    def _update(self, index: int) -> bool:
+        lidar, health = self.lidars[index], self.health[index]
+
+        # Skip a sick bus while it backs off so it cannot slow the others
+        if health.retry_in() > 0:
+            return False
+        if health.needs_reopen:
+            recover(lidar, health)
+
+        return sample_once(lidar, self.histories[index], health)
+
+    def stale_mask(self, max_age: float) -> Tuple[bool, ...]:
+        """Flags sensors without a good frame in the last max_age seconds."""
+        now = time.monotonic()
+        return tuple(h.is_stale(max_age, now) for h in self.health)
+
+    def poll(self) -> Tuple[LidarSample, ...]:
+        """
+        Runs one transaction per bus concurrently and returns the snapshot.
+        While the background samplers run, returns their latest samples.
+        """
+        if not self.running:
+            list(self._get_executor().map(self._update, range(len(self.lidars))))
+        return self.snapshot()
+
+    async def apoll(self) -> Tuple[LidarSample, ...]:
+        """Awaitable poll(): fans the bus transactions out through an executor."""
+        if not self.running:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, self._update, i)
+                    for i in range(len(self.lidars))
+                )
+            )
+        return self.snapshot()
+
+    def sample_rate(self) -> float:
+        """Returns the aggregate good-frame rate across all buses."""
+        return sum(s.sample_rate() for s in self._samplers)
+
+    def stop(self, timeout: float = 1.0) -> None:
+        for sampler in self._samplers:
+            sampler.stop()
+        for sampler in self._samplers:
+            sampler.join(timeout=timeout)
+        self._samplers = ()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        log("INFO", "ACQUISITION", "Acquisition stopped")
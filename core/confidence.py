@@ -0,0 +1,90 @@
+from typing import Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+# TFmini-S: below this strength the reported distance is unreliable
+STRENGTH_MIN = 100.0
+
+# Strength at which the signal term saturates at full confidence
+STRENGTH_FULL = 1000.0
+
+# Spread (meters) of recent inlier readings that halves the confidence
+SPREAD_SCALE = 0.02
+
+MIN_RANGE = 0.01
+
+
+class Detection:
+    """Fused range of all sensors with its confidence in [0, 1]."""
+
+    __slots__ = ("range_m", "confidence")
+
+    def __init__(self, range_m: float = 0.0, confidence: float = 0.0) -> None:
+        self.range_m = range_m
+        self.confidence = confidence
+
+    def __bool__(self) -> bool:
+        return self.range_m > 0
+
+    def __iter__(self) -> Iterator[float]:
+        yield self.range_m
+        yield self.confidence
+
+    def __repr__(self) -> str:
+        return (
+            f"Detection(range_m={self.range_m:.3f}, confidence={self.confidence:.2f})"
+        )
+
+
+def score_readings(
+    distance: NDArray[np.float64],
+    strength: NDArray[np.float64],
+    spread: NDArray[np.float64],
+    valid_fraction: NDArray[np.float64],
+    max_range: float,
+    min_range: float = MIN_RANGE,
+) -> NDArray[np.float64]:
+    """
+    Scores the readings of all sensors at once.
+
+    Args:
+        distance: Filtered distance per sensor (meters, 0 when unknown).
+        strength: Median signal strength per sensor.
+        spread: Standard deviation of recent inlier distances (meters).
+        valid_fraction: Share of recent samples without a sensor error code.
+        max_range: Detection threshold (meters).
+        min_range: Closest distance accepted as a hit (meters).
+
+    Returns:
+        Confidence per sensor in [0, 1], 0 for readings outside the range gate.
+    """
+    in_range = (distance > min_range) & (distance < max_range)
+
+    signal = np.clip(
+        (strength - STRENGTH_MIN) / (STRENGTH_FULL - STRENGTH_MIN), 0.0, 1.0
+    )
+    stability = SPREAD_SCALE / (SPREAD_SCALE + spread)
+
+    return np.where(in_range, signal * stability * valid_fraction, 0.0)
+
+
+def fuse(
+    distance: NDArray[np.float64],
+    confidence: NDArray[np.float64],
+    min_confidence: float = 0.0,
+) -> Detection:
+    """
+    Confidence-weighted mean of the accepted readings.
+
+    The fused confidence treats sensors as independent evidence:
+    1 - prod(1 - c) over the accepted readings.
+    """
+    accepted = (confidence > 0) & (confidence >= min_confidence)
+    if not np.any(accepted):
+        return Detection()
+
+    weights = confidence[accepted]
+    range_m = float(np.average(distance[accepted], weights=weights))
+    combined = float(1.0 - np.prod(1.0 - weights))
+    return Detection(range_m, combined)
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import deque
+from typing import Optional, Sequence
+
+import numpy as np
+
+from drivers.lidar import STATUS_BAD_CHECKSUM, STATUS_BAD_HEADER, STATUS_IO_ERROR
+
+# Consecutive failed transactions before the bus is reopened
+REOPEN_AFTER = 10
+
+BACKOFF_MIN = 0.1
+BACKOFF_MAX = 5.0
+
+
+class SensorHealth:
+    """
+    Rolling transaction statistics of one LIDAR and the reopen backoff
+    state of its bus.
+
+    Updated only by the thread that talks to the sensor; readers get
+    plain numbers and never block it for long.
+    """
+
+    def __init__(self, bus_id: int, window: int = 200) -> None:
+        """
+        Args:
+            bus_id (int): I2C bus of the sensor, for reporting.
+            window (int): Number of recent transactions the rates cover.
+        """
+        self.bus_id: int = bus_id
+        self.total: int = 0
+        self.consecutive_failures: int = 0
+        self.last_good: float = 0.0
+        self.reopen_count: int = 0
+
+        self._statuses: deque = deque(maxlen=window)
+        self._latencies: deque = deque(maxlen=window)
+        self._backoff: float = BACKOFF_MIN
+        self._retry_at: float = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool, status: int, latency: float) -> None:
+        with self._lock:
+            self.total += 1
+            self._statuses.append(status)
+            self._latencies.append(latency)
+
+        if ok:
+            self.consecutive_failures = 0
+            self.last_good = time.monotonic()
+            self._backoff = BACKOFF_MIN
+        else:
+            self.consecutive_failures += 1
+
+    def _rate(self, statuses: Sequence[int]) -> float:
+        with self._lock:
+            recent = list(self._statuses)
+        if not recent:
+            return 0.0
+        return sum(1 for s in recent if s in statuses) / len(recent)
+
+    def error_rate(self) -> float:
+        """Share of recent transactions that failed on the bus."""
+        return self._rate((STATUS_IO_ERROR,))
+
+    def checksum_failure_rate(self) -> float:
+        """Share of recent transactions that returned a corrupt frame."""
+        return self._rate((STATUS_BAD_HEADER, STATUS_BAD_CHECKSUM))
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 95, 99)):
+        """Returns transaction latency percentiles in seconds."""
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=np.float64)
+        if latencies.size == 0:
+            return tuple(0.0 for _ in percentiles)
+        return tuple(float(v) for v in np.percentile(latencies, percentiles))
+
+    def is_stale(self, max_age: float, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return self.last_good == 0.0 or now - self.last_good > max_age
+
+    @property
+    def needs_reopen(self) -> bool:
+        return self.consecutive_failures >= REOPEN_AFTER
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        """Seconds until the bus of a failing sensor may be tried again."""
+        if not self.needs_reopen:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._retry_at - now)
+
+    def backoff(self) -> float:
+        """Schedules the next reopen attempt and returns the wait in seconds."""
+        delay = self._backoff
+        self._retry_at = time.monotonic() + delay
+        self._backoff = min(self._backoff * 2, BACKOFF_MAX)
+        return delay
+
+    def as_dict(self, max_age: float = 0.2) -> dict:
+        p50, p95, p99 = self.latency_percentiles()
+        return {
+            "bus_id": self.bus_id,
+            "total": self.total,
+            "error_rate": self.error_rate(),
+            "checksum_failure_rate": self.checksum_failure_rate(),
+            "consecutive_failures": self.consecutive_failures,
+            "last_good": self.last_good,
+            "stale": self.is_stale(max_age),
+            "reopen_count": self.reopen_count,
+            "latency_p50": p50,
+            "latency_p95": p95,
+            "latency_p99": p99,
+        }
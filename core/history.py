@@ -0,0 +1,231 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from drivers.lidar import STATUS_OK, LidarSample
+
+# Scale factor that turns a MAD into a standard deviation estimate
+MAD_TO_STD = 1.4826
+
+# TFmini-S range resolution (meters); deviations below it are never outliers
+RANGE_RESOLUTION = 0.01
+
+Window = Tuple[
+    NDArray[np.float64],  # distance (m)
+    NDArray[np.float64],  # strength
+    NDArray[np.float64],  # temperature (°C)
+    NDArray[np.float64],  # timestamp (monotonic s)
+    NDArray[np.int8],  # status
+]
+
+
+class SampleHistory:
+    """
+    Fixed-capacity ring buffer of LIDAR samples backed by NumPy arrays.
+
+    One writer (the bus sampler) appends, any number of readers take
+    windowed copies and run vectorized statistics on them.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        """
+        Args:
+            capacity (int): Number of samples kept before the oldest is overwritten.
+        """
+        self.capacity: int = capacity
+        self._distance = np.zeros(capacity, dtype=np.float64)
+        self._strength = np.zeros(capacity, dtype=np.float64)
+        self._temperature = np.zeros(capacity, dtype=np.float64)
+        self._timestamp = np.zeros(capacity, dtype=np.float64)
+        self._status = np.zeros(capacity, dtype=np.int8)
+
+        self._head: int = 0
+        self._count: int = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, sample: LidarSample) -> None:
+        with self._lock:
+            i = self._head
+            self._distance[i] = sample.distance / 100.0
+            self._strength[i] = sample.strength
+            self._temperature[i] = sample.temperature
+            self._timestamp[i] = sample.timestamp
+            self._status[i] = sample.status
+            self._head = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._head = 0
+            self._count = 0
+
+    def window(
+        self,
+        n: Optional[int] = None,
+        max_age: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> Window:
+        """
+        Returns copies of the most recent samples in chronological order.
+
+        Args:
+            n (int): Maximum number of samples (default: all stored).
+            max_age (float): Drop samples older than this many seconds.
+            until (float): Ignore samples taken after this time, so the
+                window ends at a sample that was handed out earlier.
+        """
+        with self._lock:
+            count = self._count
+            if n is not None and until is None:
+                count = min(n, count)
+            idx = (self._head - count + np.arange(count)) % self.capacity
+            if until is not None:
+                end = int(np.searchsorted(self._timestamp[idx], until, side="right"))
+                idx = idx[max(end - n, 0) if n is not None else 0 : end]
+            window = (
+                self._distance[idx],
+                self._strength[idx],
+                self._temperature[idx],
+                self._timestamp[idx],
+                self._status[idx],
+            )
+
+        if max_age is not None:
+            recent = window[3] >= time.monotonic() - max_age
+            window = tuple(a[recent] for a in window)
+        return window
+
+    def valid_distances(
+        self, n: Optional[int] = None, max_age: Optional[float] = None
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Returns (distance, timestamp) of samples without a sensor error code."""
+        distance, _, _, timestamp, status = self.window(n, max_age)
+        ok = status == STATUS_OK
+        return distance[ok], timestamp[ok]
+
+    def median(self, n: Optional[int] = None, max_age: Optional[float] = None) -> float:
+        distance, _ = self.valid_distances(n, max_age)
+        return float(np.median(distance)) if distance.size else 0.0
+
+    def robust_distance(
+        self,
+        n: Optional[int] = None,
+        max_age: Optional[float] = None,
+        k: float = 3.0,
+    ) -> float:
+        """
+        Median distance after MAD-based outlier rejection.
+
+        Returns 0.0 unless more than half of the window holds valid
+        samples, so isolated hits among misses are not reported.
+        """
+        distance, _, _, _, status = self.window(n, max_age)
+        if distance.size == 0:
+            return 0.0
+
+        valid = distance[status == STATUS_OK]
+        if valid.size * 2 <= distance.size:
+            return 0.0
+
+        return float(np.median(valid[inlier_mask(valid, k)]))
+
+    def summary(
+        self,
+        n: Optional[int] = None,
+        max_age: Optional[float] = None,
+        k: float = 3.0,
+    ) -> Tuple[float, float, float, float]:
+        """
+        Condenses the window into the inputs of confidence scoring.
+
+        Returns:
+            tuple: See summarize().
+        """
+        return summarize(self.window(n, max_age), k)
+
+    def sample_rate(self, n: Optional[int] = None) -> float:
+        """Returns the sample rate (Hz) over the window."""
+        timestamp = self.window(n)[3]
+        if timestamp.size < 2:
+            return 0.0
+        span = timestamp[-1] - timestamp[0]
+        return float((timestamp.size - 1) / span) if span > 0 else 0.0
+
+    def range_rate(
+        self,
+        n: Optional[int] = None,
+        max_age: Optional[float] = None,
+        k: float = 3.0,
+    ) -> float:
+        """Returns the least-squares range rate (m/s) of the inlier samples."""
+        distance, timestamp = self.valid_distances(n, max_age)
+        if distance.size < 3:
+            return 0.0
+
+        keep = inlier_mask(distance, k)
+        if np.count_nonzero(keep) < 3:
+            return 0.0
+
+        t = timestamp[keep] - timestamp[keep][0]
+        if np.ptp(t) <= 0:
+            return 0.0
+        slope, _ = np.polyfit(t, distance[keep], 1)
+        return float(slope)
+
+
+def inlier_mask(values: NDArray[np.float64], k: float = 3.0) -> NDArray[np.bool_]:
+    """
+    Flags values within k scaled MADs of the median.
+
+    Args:
+        values: 1-D array of distances (meters).
+        k: Rejection threshold in standard deviations.
+
+    Returns:
+        Boolean mask, True for inliers.
+    """
+    if values.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    deviation = np.abs(values - np.median(values))
+    mad = np.median(deviation)
+    threshold = max(k * MAD_TO_STD * mad, RANGE_RESOLUTION)
+    # Small tolerance so exact multiples of the resolution survive rounding
+    return deviation <= threshold + 1e-9
+
+
+def summarize(window: Window, k: float = 3.0) -> Tuple[float, float, float, float]:
+    """
+    Condenses a window into the inputs of confidence scoring.
+
+    Args:
+        window: Samples as returned by SampleHistory.window().
+        k: Outlier rejection threshold in standard deviations.
+
+    Returns:
+        tuple: (robust distance, median strength, inlier spread,
+        valid fraction); all zero for an empty window.
+    """
+    distance, strength, _, _, status = window
+    if distance.size == 0:
+        return 0.0, 0.0, 0.0, 0.0
+
+    ok = status == STATUS_OK
+    valid_fraction = np.count_nonzero(ok) / distance.size
+    if valid_fraction <= 0.5:
+        return 0.0, 0.0, 0.0, float(valid_fraction)
+
+    valid = distance[ok]
+    inliers = valid[inlier_mask(valid, k)]
+    return (
+        float(np.median(inliers)),
+        float(np.median(strength[ok])),
+        float(np.std(inliers)),
+        float(valid_fraction),
+    )
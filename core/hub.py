@@ -0,0 +1,141 @@
+import itertools
+import threading
+from collections import deque
+from typing import Deque, NamedTuple, Optional, Sequence, Tuple
+
+from core.acquisition import AcquisitionEngine
+from drivers.lidar import LidarSample
+
+
+class SampleSet(NamedTuple):
+    """
+    Latest sample of every sensor after one of them delivered a frame.
+
+    Consumers score the set with LMSStation.score_samples(), which ends
+    each sensor's history window at the sample in the set.
+    """
+
+    sequence: int
+    sensor: int
+    samples: Tuple[LidarSample, ...]
+
+
+class Subscription:
+    """
+    Bounded queue of SampleSets for one consumer.
+
+    When the queue is full the oldest entry is dropped, so a slow consumer
+    always gets the most recent data instead of a backlog.
+    """
+
+    def __init__(
+        self, hub: "AcquisitionHub", sensors: Sequence[int], maxsize: int = 1
+    ) -> None:
+        """
+        Args:
+            hub (AcquisitionHub): Hub delivering to this subscription.
+            sensors (Sequence[int]): Sensor indices whose frames are wanted.
+            maxsize (int): Entries kept before the oldest is dropped.
+        """
+        self.sensors: Tuple[int, ...] = tuple(sensors)
+        self.dropped: int = 0
+        self.closed: bool = False
+
+        self._hub = hub
+        self._items: Deque[SampleSet] = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+
+    def _offer(self, item: SampleSet) -> None:
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[SampleSet]:
+        """
+        Takes the oldest queued entry, waiting up to timeout for one.
+
+        Returns:
+            SampleSet: Next entry, None on timeout or once closed.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self.closed, timeout)
+            return self._items.popleft() if self._items else None
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class AcquisitionHub:
+    """
+    Fans the frames of the acquisition samplers out to subscribers.
+
+    The engine's BusSamplers read every sensor at the maximum rate; each
+    good frame is offered to the subscriptions interested in that sensor,
+    directly from the sampler thread. Control loops and locate score the
+    delivered sets instead of polling the buses themselves; telemetry reads
+    the StationState they publish.
+    """
+
+    def __init__(self, engine: AcquisitionEngine) -> None:
+        self.engine: AcquisitionEngine = engine
+        # next() on a count is atomic, samplers need no lock to number sets
+        self._sequence = itertools.count(1)
+
+        # Replaced, never mutated, so samplers iterate without a lock
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._lock = threading.Lock()
+        self.engine.add_listener(self._on_sample)
+
+    def subscribe(
+        self, sensors: Optional[Sequence[int]] = None, maxsize: int = 1
+    ) -> Subscription:
+        """
+        Opens a subscription, starting background sampling if needed.
+
+        Args:
+            sensors (Sequence[int]): Sensor indices of interest, all by
+                default.
+            maxsize (int): Queue length, 1 for latest-value semantics.
+
+        Returns:
+            Subscription: Receives a SampleSet per frame of those sensors.
+        """
+        if sensors is None:
+            sensors = range(len(self.engine.lidars))
+        subscription = Subscription(self, sensors, maxsize)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription,)
+        if not self.engine.running:
+            self.engine.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = tuple(
+                s for s in self._subscriptions if s is not subscription
+            )
+
+    def _on_sample(self, index: int, sample: LidarSample) -> None:
+        subscriptions = [s for s in self._subscriptions if index in s.sensors]
+        if not subscriptions:
+            return
+        item = SampleSet(next(self._sequence), index, self.engine.snapshot())
+        for subscription in subscriptions:
+            subscription._offer(item)
+
+    def close(self) -> None:
+        """Closes all subscriptions and detaches from the engine."""
+        self.engine.remove_listener(self._on_sample)
+        for subscription in self._subscriptions:
+            subscription.close()
@@ -0,0 +1,67 @@
+import os
+import threading
+from typing import Callable, Iterable, Optional, Tuple
+
+from drivers.frame_log import FILE_HEADER, FILE_MAGIC, RECORD, check_header
+from drivers.lidar import Lidar
+from utils.logger import log
+
+
+class FrameRecorder:
+    """
+    Appends every raw TFmini-S frame read by the attached sensors, with
+    the pointing at that moment, to a binary log of fixed-size
+    records.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pointing: Optional[Callable[[float], Tuple[float, float]]] = None,
+    ) -> None:
+        """
+        Args:
+            path (str): Log file; appended to if it already exists.
+            pointing (Callable): Returns (az, el) in degrees at a monotonic
+                frame time.
+        """
+        self.path: str = path
+        self.count: int = 0
+        self._pointing = pointing
+        self._lidars: list[Lidar] = []
+        self._lock = threading.Lock()
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            check_header(path)
+
+        self._file = open(path, "ab")
+        if new_file:
+            self._file.write(FILE_HEADER.pack(FILE_MAGIC, RECORD.size, 0))
+
+        log("INFO", "RECORDER", f"Recording LIDAR frames to {path}")
+
+    def attach(self, lidars: Iterable[Lidar]) -> None:
+        for lidar in lidars:
+            lidar.frame_listener = self.record
+            self._lidars.append(lidar)
+
+    def record(self, lidar: Lidar, frame: bytes, timestamp: float) -> None:
+        if self._pointing is not None:
+            az, el = self._pointing(timestamp)
+        else:
+            az, el = 0.0, 0.0
+        packed = RECORD.pack(timestamp, lidar.bus_id, lidar.address, frame, az, el)
+        with self._lock:
+            self._file.write(packed)
+            self.count += 1
+
+    def close(self) -> None:
+        for lidar in self._lidars:
+            if lidar.frame_listener == self.record:
+                lidar.frame_listener = None
+        self._lidars.clear()
+
+        with self._lock:
+            self._file.close()
+        log("INFO", "RECORDER", f"Recorded {self.count} frames to {self.path}")
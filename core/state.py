@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import NamedTuple, Tuple
+
+
+class StationState(NamedTuple):
+    """
+    Consistent view of the station at one instant.
+
+    All fields are taken together when the snapshot is built, so a reader
+    never combines a pointing from one moment with a range from another.
+    Times are time.monotonic() seconds.
+    """
+
+    az: float
+    el: float
+    range_m: float
+    confidence: float
+    distances: Tuple[float, ...]
+    confidences: Tuple[float, ...]
+    sample_times: Tuple[float, ...]
+    timestamp: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return time.monotonic() - self.timestamp
+
+
+EMPTY_STATE = StationState(0.0, 0.0, 0.0, 0.0, (), (), (), 0.0)
+
+
+class StateCell:
+    """
+    Holds the latest StationState for any number of writers and readers.
+
+    publish() replaces the reference to an immutable snapshot and get()
+    reads it. Writers serialize on a lock, e.g. a tracking loop and the
+    async detection iterator; readers never take it, since reading the
+    reference is atomic under the interpreter lock.
+    """
+
+    def __init__(self, initial: StationState = EMPTY_STATE) -> None:
+        self._state: StationState = initial
+        self.version: int = 0
+        self._lock = threading.Lock()
+
+    def publish(self, state: StationState) -> None:
+        """Makes state the current snapshot, safe from several threads."""
+        with self._lock:
+            self._state = state
+            self.version += 1
+
+    def get(self) -> StationState:
+        return self._state
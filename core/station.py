@@ -1,12 +1,67 @@
-from typing import Optional, Callable
+from typing import Any, AsyncIterator, Optional, Callable, Sequence, Tuple
+import asyncio
+import functools
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import threading
 import time
+import numpy as np
+from numpy.typing import NDArray
 from drivers.lidar import Lidar
+from drivers.lidar_array import (
+    DEFAULT_ARRAY_PATH,
+    DEFAULT_SENSORS,
+    SensorArray,
+    SensorConfig,
+    load_array,
+)
+from drivers.lidar_calibration import DEFAULT_PROFILE_PATH, apply_profiles
+from core.acquisition import AcquisitionEngine
+from core.confidence import Detection, fuse, score_readings
+from core.history import summarize
+from core.hub import AcquisitionHub, SampleSet
+from core.recorder import FrameRecorder
+from core.state import StateCell, StationState
 from drivers.azimuth_controller import AzimuthController
-from drivers.servo_motor import Servo
+from drivers.azimuth_motion import AzimuthMotionExecutor
+from drivers.backends import SIM, BackendConfig, load_backends, open_i2c, open_pwm
+from drivers.servo_calibration import DEFAULT_CALIBRATION_PATH
+from drivers.servo_motor import ARRIVAL_MARGIN, Servo
 from utils.logger import log
 
 
+class CoordinatedMove:
+    """Handle of a two-axis move started by LMSStation.move_to()."""
+
+    def __init__(self, az_motion: AzimuthMotionExecutor, el_arrived: Future) -> None:
+        self._az_motion = az_motion
+        self._el_arrived = el_arrived
+
+    @property
+    def done(self) -> bool:
+        return self._az_motion.done and self._el_arrived.done()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until both axes have arrived.
+
+        Returns:
+            bool: True once both are done, False on timeout or when the
+            servo failed to move.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._az_motion.wait(timeout):
+            return False
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            self._el_arrived.result(timeout=remaining)
+        except FutureTimeoutError:
+            return False
+        except Exception as e:
+            log("ERROR", "STATION", f"Elevation move failed: {e}")
+            return False
+        return True
+
+
 class LMSStation:
     def __init__(
         self,
@@ -16,34 +71,114 @@ class LMSStation:
         threshold: float = 0.2,
         el_min: float = 30,
         el_max: float = 150,
+        lidar_profiles: Optional[str] = DEFAULT_PROFILE_PATH,
+        filter_window: int = 5,
+        sample_max_age: float = 0.2,
+        min_confidence: float = 0.3,
+        background_sampling: bool = True,
+        bus_factory: Optional[Callable[[int], Any]] = None,
+        hardware_timing: bool = False,
+        az_wrap: bool = False,
+        az_cable_limits: Optional[Tuple[float, float]] = None,
+        gpio_backend: Optional[str] = None,
+        servo_calibration: Optional[str] = DEFAULT_CALIBRATION_PATH,
+        lidar_array: Optional[str] = DEFAULT_ARRAY_PATH,
+        backends: Optional[BackendConfig] = None,
+        scene: Optional[Any] = None,
     ) -> None:
 
         self.gear_ratio: int = gear_ratio
         self.microstep: int = microstep
         self.step_delay: float = step_delay
         self.dist_threshold: float = threshold
+        self.filter_window: int = filter_window
+        self.sample_max_age: float = sample_max_age
+        self.min_confidence: float = min_confidence
 
         self.el_min: float = el_min
         self.el_max: float = el_max
 
-        self.distance: float = 0.0
-        self.elevation: float = el_min
+        # Hardware or simulated GPIO, PWM and I2C, from LMS_BACKEND and
+        # friends by default; simulated LIDARs see the target of scene
+        self.backends: BackendConfig = (
+            backends if backends is not None else load_backends()
+        )
+        if self.backends.i2c == SIM and scene is None:
+            from drivers.sim_bus import Scene
+
+            scene = Scene()
+        self.scene = scene
 
-        self.lidar1: Lidar = Lidar(bus_id=1, address=0x10)
-        self.lidar2: Lidar = Lidar(bus_id=3, address=0x10)
-        self.lidar3: Lidar = Lidar(bus_id=4, address=0x10)
-        self.lidar4: Lidar = Lidar(bus_id=5, address=0x10)
+        # Latest fused reading with its pointing, written by whichever loop
+        # is currently detecting (locate or elevation tracking)
+        self.state: StateCell = StateCell()
+        self.recorder: Optional[FrameRecorder] = None
 
+        # Bus, address, mounting offset and role of every sensor; all
+        # readings are vectors indexed like array.sensors
+        sensors = DEFAULT_SENSORS if lidar_array is None else load_array(lidar_array)
+        self.array: SensorArray = SensorArray(sensors)
+
+        # Motors come first, simulated LIDARs look along their history
         self.az_actuator: AzimuthController = AzimuthController(
-            gear_ratio=self.gear_ratio, arg_microstep=self.microstep
+            gear_ratio=self.gear_ratio,
+            arg_microstep=self.microstep,
+            hardware_timing=hardware_timing,
+            wrap=az_wrap,
+            cable_limits=az_cable_limits,
+            gpio_backend=gpio_backend or self.backends.gpio,
+            step_delay=self.step_delay,
         )
+        self.az_motion: AzimuthMotionExecutor = self.az_actuator.motion
 
-        self.servo: Servo = Servo(angle=self.elevation)
+        self.servo: Servo = Servo(
+            angle=el_min,
+            pi=open_pwm(self.backends.pwm),
+            calibration=servo_calibration,
+        )
+
+        # A bus factory substitutes the I2C buses, e.g. with a ReplayBus
+        def make_lidar(sensor: SensorConfig) -> Lidar:
+            if bus_factory is not None:
+                bus = bus_factory(sensor.bus_id)
+            elif self.backends.i2c == SIM:
+                bus = open_i2c(
+                    sensor.bus_id,
+                    SIM,
+                    scene=self.scene,
+                    offset=(sensor.az_offset, sensor.el_offset),
+                    pointing=self.pointing_at,
+                )
+            else:
+                # Hardware buses are opened anew by Lidar.reopen()
+                return Lidar(
+                    bus_id=sensor.bus_id,
+                    address=sensor.address,
+                    bus_factory=functools.partial(
+                        open_i2c, sensor.bus_id, self.backends.i2c
+                    ),
+                )
+            return Lidar(bus_id=sensor.bus_id, address=sensor.address, bus=bus)
+
+        self.lidars: Tuple[Lidar, ...] = tuple(
+            make_lidar(s) for s in self.array.sensors
+        )
+        if lidar_profiles is not None:
+            applied = apply_profiles(self.lidars, lidar_profiles)
+            log("INFO", "STATION", f"Applied {applied} LIDAR latency profile(s)")
+
+        self.acquisition: AcquisitionEngine = AcquisitionEngine(self.lidars)
+        self.hub: AcquisitionHub = AcquisitionHub(self.acquisition)
+        if background_sampling:
+            self.acquisition.start()
+            if not self.acquisition.wait_ready(timeout=1.0):
+                log("WARN", "STATION", "Not all LIDARs delivered a first frame")
 
         log(
             "INFO",
             "STATION",
-            f"LMS Station initialized. Threshold: {self.dist_threshold}m, "
+            f"LMS Station initialized. {len(self.lidars)} LIDARs, "
+            f"Threshold: {self.dist_threshold}m, "
             f"El Limits: [{self.el_min}, {self.el_max}]",
         )
 
@@ -51,44 +186,268 @@ class LMSStation:
     def azimuth(self) -> float:
         return self.az_actuator.current_angle
 
-    def read_lidars(self):
-        self.lidar1.update()
-        self.lidar2.update()
-        self.lidar3.update()
-        self.lidar4.update()
-        return (
-            self.lidar1.distance / 100.0,
-            self.lidar2.distance / 100.0,
-            self.lidar3.distance / 100.0,
-            self.lidar4.distance / 100.0,
-        )
+    @property
+    def elevation(self) -> float:
+        """Servo angle estimated along the move in progress."""
+        return self.servo.get_angle()
+
+    def pointing_at(self, t: Optional[float] = None) -> Tuple[float, float]:
+        """
+        Looks up (az, el) at a monotonic time in the motion histories.
+
+        Both axes record their planned timeline, so a time during a move
+        gets the interpolated position instead of the last target.
+
+        Args:
+            t (float): time.monotonic() seconds, now by default.
+        """
+        if t is None:
+            t = time.monotonic()
+        az = self.az_actuator.history.angle_at(t)
+        el = self.servo.history.angle_at(t)
+        return float(az), float(el)
 
-    def detect_target(self) -> bool:
-        d1, d2, d3, d4 = self.read_lidars()
+    @property
+    def distance(self) -> float:
+        """Fused range of the latest published state in metres."""
+        return self.state.get().range_m
 
-        valid_points: list[float] = []
-        for d in (d1, d2, d3, d4):
-            if 0.01 < d < self.dist_threshold and d != 655.35:
-                valid_points.append(d)
+    @property
+    def confidence(self) -> float:
+        return self.state.get().confidence
+
+    def read_lidars(self, filtered: bool = False) -> NDArray[np.float64]:
+        """Returns the range of every sensor in metres, 0.0 where stale."""
+        samples = self.acquisition.poll()
+        if filtered:
+            return self._filtered_distances()
+        return self._fresh_distances(samples)
+
+    async def aread_lidars(self, filtered: bool = False) -> NDArray[np.float64]:
+        samples = await self.acquisition.apoll()
+        if filtered:
+            return self._filtered_distances()
+        return self._fresh_distances(samples)
+
+    def _fresh_distances(self, samples) -> NDArray[np.float64]:
+        distances = np.array([s.distance for s in samples], dtype=np.float64) / 100.0
+        # Stale readings are reported as 0.0 so nobody acts on old data
+        stale = np.array(self.acquisition.stale_mask(self.sample_max_age), dtype=bool)
+        distances[stale] = 0.0
+        return distances
+
+    def _filtered_distances(self) -> NDArray[np.float64]:
+        return np.array(
+            [
+                h.robust_distance(self.filter_window, max_age=self.sample_max_age)
+                for h in self.acquisition.histories
+            ],
+            dtype=np.float64,
+        )
 
-        if valid_points:
-            self.distance = sum(valid_points) / len(valid_points)
-            return True
+    def lidar_health(self) -> list[dict]:
+        return [h.as_dict(self.sample_max_age) for h in self.acquisition.health]
+
+    def start_recording(self, path: str) -> FrameRecorder:
+        """Logs every raw LIDAR frame with the pointing at its read time."""
+        self.stop_recording()
+        self.recorder = FrameRecorder(path, pointing=self.pointing_at)
+        self.recorder.attach(self.lidars)
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def set_lidar_mode(self, mode: str) -> bool:
+        # Every sensor is switched even after one has failed
+        ok = all([lidar.apply_mode(mode) for lidar in self.lidars])
+        if not ok:
+            log("WARN", "STATION", f"Not all LIDARs switched to {mode} mode")
+        return ok
+
+    def score_lidars(
+        self, max_range: Optional[float] = None
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64], Tuple[float, ...]]:
+        """
+        Reads every sensor once and scores its recent samples.
+
+        Returns:
+            tuple: (distance, confidence) per sensor and the time of the
+            newest sample each score is based on, 0.0 for none.
+        """
+        self.acquisition.poll()
+        return self._score(max_range)
+
+    def score_samples(
+        self,
+        samples: Optional[SampleSet],
+        sensors: Optional[Sequence[int]] = None,
+        max_range: Optional[float] = None,
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64], Tuple[float, ...]]:
+        """
+        Scores a SampleSet delivered by the hub without reading the buses.
+
+        The window of every sensor ends at its sample in the set, frames
+        that arrived since are left to the next set.
+
+        Args:
+            samples (SampleSet): Set taken from a subscription; None, as
+                returned on a timeout, scores as no reading.
+            sensors (Sequence[int]): Sensors to score, all by default. The
+                others score zero.
+
+        Returns:
+            tuple: See score_lidars().
+        """
+        if samples is None:
+            return self._score(max_range, sensors=())
+        until = [s.timestamp for s in samples.samples]
+        return self._score(max_range, sensors, until)
+
+    def _score(
+        self,
+        max_range: Optional[float] = None,
+        sensors: Optional[Sequence[int]] = None,
+        until: Optional[Sequence[float]] = None,
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64], Tuple[float, ...]]:
+        histories = self.acquisition.histories
+        if sensors is None:
+            sensors = range(len(histories))
+
+        # Each window is read once, so the scores and their sample times
+        # come from the same samples; unscored sensors get an empty one
+        windows = [
+            h.window(
+                self.filter_window if i in sensors else 0,
+                max_age=self.sample_max_age,
+                until=until[i] if until is not None else None,
+            )
+            for i, h in enumerate(histories)
+        ]
+        summaries = np.array([summarize(w) for w in windows]).reshape(-1, 4)
+        sample_times = tuple(float(w[3][-1]) if w[3].size else 0.0 for w in windows)
+        distance, strength, spread, valid_fraction = summaries.T
+        confidence = score_readings(
+            distance,
+            strength,
+            spread,
+            valid_fraction,
+            max_range=max_range if max_range is not None else self.dist_threshold,
+        )
+        return distance, confidence, sample_times
+
+    def detect_target(self, samples: Optional[SampleSet] = None) -> Detection:
+        """
+        Fuses the readings of all sensors into a Detection and publishes it.
+
+        Args:
+            samples (SampleSet): Set delivered by the hub to score instead
+                of reading every sensor.
+        """
+        if samples is not None:
+            return self._fuse(*self.score_samples(samples))
+        return self._fuse(*self.score_lidars())
+
+    async def adetect_target(self) -> Detection:
+        await self.acquisition.apoll()
+        return self._fuse(*self._score())
+
+    async def fused_samples(self, period: float = 0.01) -> AsyncIterator[Detection]:
+        """Yields a fused Detection every `period` seconds, forever."""
+        while True:
+            yield await self.adetect_target()
+            await asyncio.sleep(period)
 
-        self.distance = 0.0
-        return False
+    def _fuse(
+        self,
+        distance: NDArray[np.float64],
+        confidence: NDArray[np.float64],
+        sample_times: Tuple[float, ...],
+    ) -> Detection:
+        detection = fuse(distance, confidence, self.min_confidence)
+        self.publish_state(detection, distance, confidence, sample_times)
+        return detection
+
+    def publish_state(
+        self,
+        detection: Detection,
+        distance: NDArray[np.float64],
+        confidence: NDArray[np.float64],
+        sample_times: Tuple[float, ...],
+    ) -> StationState:
+        """
+        Publishes a detection with the pointing at its newest sample, so
+        readings taken during a move are tagged where they were measured.
+
+        Args:
+            sample_times: Time of the newest sample scored per sensor, as
+                returned with the scores by score_lidars().
+        """
+        now = time.monotonic()
+        az, el = self.pointing_at(max(sample_times, default=0.0) or now)
+        state = StationState(
+            az=az,
+            el=el,
+            range_m=detection.range_m,
+            confidence=detection.confidence,
+            distances=tuple(distance.tolist()),
+            confidences=tuple(confidence.tolist()),
+            sample_times=sample_times,
+            timestamp=now,
+        )
+        self.state.publish(state)
+        return state
 
     def move_to(
-        self, az_angle: float, el_angle: float, delay: Optional[float] = None
-    ) -> None:
-
-        move_delay: float = delay if delay is not None else self.step_delay
-
-        self.az_actuator.move_to_angle(az_angle, delay=move_delay)
-
-        clamped_el: float = max(self.el_min, min(el_angle, self.el_max))
-        self.servo.set_angle(clamped_el)
-        self.elevation = self.servo.get_angle()
+        self,
+        az_angle: float,
+        el_angle: float,
+        wait: bool = True,
+        synchronize: bool = True,
+    ) -> "CoordinatedMove":
+        """
+        Moves both axes at the same time, so a slew takes as long as the
+        slower axis. With synchronize the faster axis is slowed down to
+        arrive together with the other one. Long azimuth moves follow the
+        planned profile at the slew microstep, see
+        AzimuthMotionExecutor.slew_to().
+
+        Returns:
+            CoordinatedMove: Handle of the move, finished when wait is set
+            unless an axis failed to arrive in time.
+        """
+        az_target = self.az_actuator.resolve_target(az_angle)
+        el_target = max(self.el_min, min(el_angle, self.el_max))
+
+        az_delta = az_target - self.azimuth
+        az_distance = abs(az_delta)
+        el_distance = abs(el_target - self.servo.get_angle())
+
+        az_time = self.az_motion.slew_time(az_delta)
+        el_time = el_distance / self.servo.speed
+
+        az_speed = el_speed = None
+        if synchronize and az_distance > 0 and el_distance > 0:
+            if az_time < el_time:
+                az_speed = self.az_motion.speed_for_time(az_delta, el_time, slew=True)
+            else:
+                el_speed = el_distance / az_time
+
+        self.az_motion.slew_to(az_target, max_speed=az_speed)
+        move = CoordinatedMove(
+            self.az_motion, self.servo.set_angle(el_target, speed=el_speed)
+        )
+        timeout = max(az_time, el_time) + ARRIVAL_MARGIN
+        if wait and not move.wait(timeout):
+            log(
+                "WARN",
+                "STATION",
+                f"Move to az={az_target:.2f}° el={el_target:.2f}° "
+                f"did not finish within {timeout:.1f}s",
+            )
+        return move
 
     def move_azimuth_incremental(
         self,
@@ -102,8 +461,10 @@ class LMSStation:
 
         current_az: float = self.azimuth
         remaining: float = target_az - current_az
+        # The axis moves in whole steps, within half a step is on target
+        tolerance: float = 0.5 / self.az_actuator.steps_per_degree
 
-        while abs(remaining) > 1e-6:
+        while abs(remaining) > tolerance:
             if stop_event.is_set():
                 return False
             if timeout_deadline is not None and time.time() > timeout_deadline:
@@ -148,47 +509,117 @@ class LMSStation:
 
         return False
 
-    def move_elevation(
-        self, target_el: float, tolerance_deg: float = 0.5, timeout: float = 1.0
-    ) -> float:
-        clamped_el = max(self.el_min, min(target_el, self.el_max))
-        self.servo.set_angle(clamped_el)
+    def sweep_azimuth(
+        self,
+        target_az: float,
+        speed: float,
+        stop_event: threading.Event,
+        timeout_deadline: Optional[float] = None,
+        on_poll: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """
+        Moves to target_az without stopping, calling on_poll on the way.
+
+        Unlike move_azimuth_incremental() there is no dwell: detections are
+        tagged with the pointing at their sample time, see publish_state().
+
+        Args:
+            target_az (float): Azimuth at the end of the sweep in degrees.
+            speed (float): Sweep speed in degrees/second.
+
+        Returns:
+            bool: True when on_poll reported a target; the axis is then
+            brought to a stop.
+        """
+        self.az_motion.move_to(target_az, max_speed=speed)
 
-        start = time.time()
         while True:
-            cur_el = self.servo.get_angle()
-            self.elevation = cur_el
+            if stop_event.is_set() or (
+                timeout_deadline is not None and time.time() > timeout_deadline
+            ):
+                self.az_motion.stop()
+                return False
 
-            if abs(cur_el - clamped_el) <= tolerance_deg:
-                break
+            if on_poll is not None:
+                try:
+                    if on_poll():
+                        self.az_motion.stop()
+                        return True
+                except Exception:
+                    pass
 
-            if (time.time() - start) > timeout:
-                log(
-                    "WARN",
-                    "STATION",
-                    f"Servo did not reach {clamped_el}° within timeout; "
-                    f"at {cur_el}°",
-                )
+            if self.az_motion.wait(0.01):
                 break
 
-            time.sleep(0.01)
+        if on_poll is not None:
+            try:
+                return bool(on_poll())
+            except Exception:
+                pass
+
+        return False
+
+    def move_elevation(
+        self,
+        target_el: float,
+        tolerance_deg: float = 0.5,
+        timeout: float = 1.0,
+        wait: bool = True,
+    ) -> float:
+        """
+        Commands the elevation servo; with wait=False returns at once and
+        the servo finishes the move in its own thread.
+        """
+        clamped_el = max(self.el_min, min(target_el, self.el_max))
+        arrived = self.servo.set_angle(clamped_el)
+
+        if wait:
+            try:
+                arrived.result(timeout=timeout)
+            except FutureTimeoutError:
+                cur_el = self.servo.get_angle()
+                if abs(cur_el - clamped_el) > tolerance_deg:
+                    log(
+                        "WARN",
+                        "STATION",
+                        f"Servo did not reach {clamped_el}° within timeout; "
+                        f"at {cur_el}°",
+                    )
+            except Exception as e:
+                log("ERROR", "STATION", f"Elevation move failed: {e}")
 
         return self.elevation
 
+    def target_direction(self, state: StationState) -> Tuple[float, float]:
+        """
+        Corrects the pointing of a state by the mounting offsets of the
+        sensors that detected the target, weighted by their confidence.
+        """
+        confidences = np.asarray(state.confidences, dtype=np.float64)
+        detected = (np.asarray(state.distances) > 0) & (
+            confidences >= self.min_confidence
+        )
+        az_offset, el_offset = self.array.offset(np.where(detected, confidences, 0.0))
+        return state.az + az_offset, state.el + el_offset
+
     def log_target_found(self) -> dict:
+        state = self.state.get()
+        az, el = self.target_direction(state)
         log(
             "INFO",
             "LOCATION ROUTINE",
             f"Found target at:\n"
-            f"- az: {self.azimuth}\n"
-            f"- el: {self.elevation}\n"
-            f"- range: {self.distance}",
+            f"- az: {az}\n"
+            f"- el: {el}\n"
+            f"- range: {state.range_m}\n"
+            f"- confidence: {state.confidence:.2f}",
         )
         return {
             "timestamp": time.time(),
-            "az": self.azimuth,
-            "el": self.elevation,
-            "range_m": self.distance,
+            "az": az,
+            "el": el,
+            "range_m": state.range_m,
+            "confidence": state.confidence,
         }
 
     def enable(self) -> None:
@@ -196,15 +627,17 @@ class LMSStation:
         log("INFO", "STATION", "LMS Station enabled")
 
     def disable(self) -> None:
+        self.az_motion.stop()
         self.az_actuator.disable()
         self.servo.stop()
         log("INFO", "STATION", "LMS Station disabled")
 
     def cleanup(self) -> None:
         self.az_actuator.cleanup()
-        self.servo.stop()
-        self.lidar1.close()
-        self.lidar2.close()
-        self.lidar3.close()
-        self.lidar4.close()
+        self.servo.close()
+        self.hub.close()
+        self.acquisition.stop()
+        self.stop_recording()
+        for lidar in self.lidars:
+            lidar.close()
         log("INFO", "STATION", "LMS Station cleaned up")
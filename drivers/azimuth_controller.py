@@ -1,41 +1,318 @@
+import dataclasses
+import math
+import time
+
+import numpy as np
+
+from drivers.azimuth_motion import AzimuthMotionExecutor
+from drivers.motion_history import MotionHistory
+from drivers.motion_planner import MotionLimits, plan_periods
 from drivers.stepper_motor import StepperMotor
+from utils.logger import log
+
+# Azimuth slew limits in degrees, seconds
+MAX_SPEED = 60.0
+MAX_ACCEL = 240.0
+MAX_JERK = 2400.0
+START_SPEED = 5.0
+
+# Moves shorter than this keep the caller's constant step delay
+PLAN_MIN_DEGREES = 5.0
+
+# Microstep used for long slews and the shortest move that uses it
+SLEW_MICROSTEP = 1
+SLEW_MIN_DEGREES = 10.0
+
+# Half period of a fine step at constant speed (seconds)
+STEP_DELAY = 0.005
 
 
 class AzimuthController:
-    def __init__(self, gear_ratio=4, arg_microstep=8):
-        self.motor = StepperMotor(microstep=arg_microstep)
+    def __init__(
+        self,
+        gear_ratio=4,
+        arg_microstep=8,
+        hardware_timing=False,
+        limits=MotionLimits(MAX_SPEED, MAX_ACCEL, MAX_JERK, START_SPEED),
+        plan_min_degrees=PLAN_MIN_DEGREES,
+        wrap=False,
+        cable_limits=None,
+        gpio_backend=None,
+        slew_microstep=SLEW_MICROSTEP,
+        slew_min_degrees=SLEW_MIN_DEGREES,
+        step_delay=STEP_DELAY,
+    ):
+        """
+        Args:
+            gear_ratio (int): Motor turns per azimuth turn.
+            arg_microstep (int): Microstepping divisor of the driver.
+            hardware_timing (bool): Generate step pulses with pigpio waveforms.
+            limits (MotionLimits): Slew limits per degree, None to disable
+                acceleration planning.
+            plan_min_degrees (float): Shortest move that is planned.
+            wrap (bool): Treat targets modulo 360° and take the shortest way.
+            cable_limits (Tuple[float, float]): Lowest and highest azimuth
+                the cabling allows, unlimited by default.
+            gpio_backend (str): GPIO library of the stepper driver pins.
+            slew_microstep (int): Coarser microstep for long moves, equal
+                to arg_microstep to always use the fine one.
+            slew_min_degrees (float): Shortest move done at slew_microstep.
+            step_delay (float): Half period of a fine step for the motion
+                executor when limits is None.
+        """
+        self.motor = StepperMotor(
+            microstep=arg_microstep,
+            hardware_timing=hardware_timing,
+            gpio_backend=gpio_backend,
+        )
         self.gear_ratio = gear_ratio
 
-        self.current_angle = 0
+        # Position is kept in whole fine microsteps, sub-step remainders of
+        # relative moves are carried over instead of being lost
+        self.position_steps = 0
+        self._remainder = 0.0
+        # Angle over time from the pulse timeline, for pointing lookups
+        self.history = MotionHistory()
 
         self.steps_per_degree = (
             self.motor.motor_steps_per_rev * self.motor.microstep * self.gear_ratio
         ) / 360
 
+        self.limits = limits
+        self.step_delay = step_delay
+        self.plan_min_steps = int(plan_min_degrees * self.steps_per_degree)
+
+        self.wrap = wrap
+        self.cable_limits = cable_limits
+
+        self.fine_microstep = self.motor.microstep
+        self.slew_microstep = slew_microstep
+        self.slew_min_steps = int(slew_min_degrees * self.steps_per_degree)
+        # Fine microsteps per pulse in slew mode
+        self.slew_ratio = max(1, self.fine_microstep // slew_microstep)
+
+        self._motion = None
+
+    @property
+    def motion(self):
+        """Background motion executor of the axis, started on first use."""
+        if self._motion is None:
+            self._motion = AzimuthMotionExecutor(self)
+            self._motion.start()
+        return self._motion
+
+    def set_velocity(self, deg_per_s):
+        """
+        Turns the axis continuously at deg_per_s until the next velocity
+        or position command; 0 decelerates to a stop.
+
+        Args:
+            deg_per_s (float): Signed azimuth rate in degrees per second.
+        """
+        self.motion.set_velocity(deg_per_s)
+
+    @property
+    def current_angle(self):
+        return self.position_steps / self.steps_per_degree
+
+    def record_steps(self, start_time, periods, start_steps, step):
+        """
+        Adds a pulse train to the motion history before it is sent.
+
+        Args:
+            start_time (float): Monotonic time of the first pulse.
+            periods (Sequence[float]): Seconds per pulse.
+            start_steps (int): Position before the train in fine microsteps.
+            step (int): Signed fine microsteps per pulse.
+        """
+        periods = np.asarray(periods, dtype=np.float64)
+        # A step is counted at the middle of its period
+        times = start_time + np.cumsum(periods) - periods / 2
+        steps = start_steps + step * np.arange(1, periods.size + 1)
+        self.history.record(start_time, start_steps / self.steps_per_degree)
+        self.history.extend(times, steps / self.steps_per_degree)
+
+    def sync_steps(self, position_steps):
+        """Records a step position reached without move_by_degree()."""
+        self.position_steps = position_steps
+        self._remainder = 0.0
+
     def enable(self):
         self.motor.enable()
 
-    def move_by_degree(self, delta_degree, delay):
-        if delta_degree == 0:
+    def _within_limits(self, angle):
+        if self.cable_limits is None:
+            return True
+        low, high = self.cable_limits
+        return low <= angle <= high
+
+    def resolve_target(self, target_angle):
+        """
+        Maps a requested azimuth onto the angle the axis should go to.
+
+        In wrap mode the target is taken modulo 360° and the shortest way
+        is preferred, the long way round only when the short one would
+        cross a cable limit. Targets outside the limits are clamped.
+
+        Args:
+            target_angle (float): Requested azimuth in degrees.
+
+        Returns:
+            float: Azimuth to move to in degrees.
+        """
+        current = self.current_angle
+        if self.wrap:
+            delta = (target_angle - current + 180.0) % 360.0 - 180.0
+            other = delta - 360.0 if delta > 0 else delta + 360.0
+            for candidate in (current + delta, current + other):
+                if self._within_limits(candidate):
+                    return candidate
+            target_angle = current + delta
+
+        if not self._within_limits(target_angle):
+            low, high = self.cable_limits
+            clamped = min(max(target_angle, low), high)
+            log(
+                "WARN",
+                "AZIMUTH",
+                f"Target {target_angle:.2f}° beyond cable limits, "
+                f"clamped to {clamped:.2f}°",
+            )
+            return clamped
+        return target_angle
+
+    def _segments(self, steps):
+        """
+        Splits a move of `steps` fine microsteps into (pulses, ratio)
+        parts, each pulse moving `ratio` fine microsteps.
+        """
+        ratio = self.slew_ratio
+        if ratio == 1 or abs(steps) < self.slew_min_steps:
+            return [(abs(steps), 1)]
+
+        # Coarse pulses only stay on the fine grid when they start at a
+        # slew step boundary: fine steps up to the boundary, coarse pulses
+        # for the bulk, fine steps for the rest
+        sign = 1 if steps > 0 else -1
+        lead = (-sign * self.position_steps) % ratio
+        pulses = (abs(steps) - lead) // ratio
+        tail = abs(steps) - lead - pulses * ratio
+        return [(lead, 1), (pulses, ratio), (tail, 1)]
+
+    def _is_planned(self, pulses, ratio):
+        return self.limits is not None and pulses * ratio >= self.plan_min_steps
+
+    def _plan(self, pulses, ratio, max_speed):
+        limits = self.limits
+        if max_speed is not None and max_speed < limits.max_speed:
+            limits = dataclasses.replace(limits, max_speed=max_speed)
+        return plan_periods(pulses, limits.scaled(self.steps_per_degree / ratio))
+
+    def _step_delay(self, delay, max_speed):
+        # A speed cap in deg/s can only lengthen the caller's delay
+        if max_speed is None:
+            return delay
+        return max(delay, 1 / (2 * max_speed * self.steps_per_degree))
+
+    def _pulse(self, pulses, ratio, delay, sign, max_speed=None):
+        """Sends pulses of `ratio` fine microsteps each in direction sign."""
+        if pulses == 0:
             return
+        start = time.monotonic()
+        if self._is_planned(pulses, ratio):
+            periods = self._plan(pulses, ratio, max_speed)
+            self.record_steps(start, periods, self.position_steps, sign * ratio)
+            self.motor.step_periods(periods)
+        else:
+            # Same angular speed as fine steps at the caller's delay
+            delay = self._step_delay(delay, max_speed)
+            periods = np.full(pulses, 2 * delay * ratio)
+            self.record_steps(start, periods, self.position_steps, sign * ratio)
+            self.motor.step(pulses, delay=delay * ratio)
 
-        steps = int(delta_degree * self.steps_per_degree)
+    def _move_steps(self, exact_steps, delay, max_speed=None):
+        exact_steps += self._remainder
+        steps = math.trunc(exact_steps)
+        self._remainder = exact_steps - steps
+
+        if steps == 0:
+            return
 
-        if steps != 0:
-            self.motor.enable()
-            self.motor.set_direction(clockwise=(steps > 0))
+        sign = 1 if steps > 0 else -1
+        self.motor.enable()
+        self.motor.set_direction(clockwise=(steps > 0))
+
+        for pulses, ratio in self._segments(steps):
+            if ratio == 1:
+                self._pulse(pulses, 1, delay, sign, max_speed)
+            else:
+                self.motor.set_microstepping_state(self.slew_microstep)
+                try:
+                    self._pulse(pulses, ratio, delay, sign, max_speed)
+                finally:
+                    self.motor.set_microstepping_state(self.fine_microstep)
+            self.position_steps += sign * pulses * ratio
+
+    def plans(self, delta_degree):
+        """
+        Tells whether a move by delta_degree from the current position
+        leaves constant-speed fine steps, i.e. is planned under the limits
+        or made at the slew microstep.
+        """
+        steps = round(delta_degree * self.steps_per_degree)
+        return any(
+            ratio > 1 or self._is_planned(pulses, ratio)
+            for pulses, ratio in self._segments(steps)
+        )
+
+    def move_time(self, delta_degree, delay, max_speed=None):
+        """
+        Duration of a move by delta_degree from the current position.
+
+        Args:
+            delta_degree (float): Signed length of the move in degrees.
+            delay (float): Step delay of the constant-speed parts.
+            max_speed (float): Speed cap in deg/s, the limits by default.
+
+        Returns:
+            float: Seconds from the first pulse to the last.
+        """
+        steps = round(delta_degree * self.steps_per_degree)
+        duration = 0.0
+        for pulses, ratio in self._segments(steps):
+            if pulses == 0:
+                continue
+            if self._is_planned(pulses, ratio):
+                duration += float(self._plan(pulses, ratio, max_speed).sum())
+            else:
+                duration += pulses * 2 * self._step_delay(delay, max_speed) * ratio
+        return duration
+
+    def move_by_degree(self, delta_degree, delay):
+        if delta_degree == 0:
+            return
 
-            self.motor.step(abs(steps), delay=delay)
+        self._move_steps(delta_degree * self.steps_per_degree, delay)
 
-            self.current_angle += delta_degree
+    def move_to_angle(self, target_angle, delay, max_speed=None):
+        """
+        Moves to an absolute azimuth, blocking until it is reached.
 
-    def move_to_angle(self, target_angle, delay):
-        delta = target_angle - self.current_angle
-        self.move_by_degree(delta, delay)
+        Args:
+            target_angle (float): Azimuth in degrees, see resolve_target().
+            delay (float): Step delay of the constant-speed parts.
+            max_speed (float): Speed cap in deg/s, the limits by default.
+        """
+        target_angle = self.resolve_target(target_angle)
+        target_steps = target_angle * self.steps_per_degree
+        self._remainder = 0.0
+        self._move_steps(round(target_steps) - self.position_steps, delay, max_speed)
 
     def disable(self):
         self.motor.disable()
 
     def cleanup(self):
+        if self._motion is not None:
+            self._motion.shutdown()
         self.motor.disable()
         self.motor.cleanup()
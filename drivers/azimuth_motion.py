@@ -0,0 +1,515 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from drivers.motion_planner import MotionLimits
+from utils.logger import log
+
+if TYPE_CHECKING:
+    from drivers.azimuth_controller import AzimuthController
+
+# Longest step batch sent to the motor at once; bounds how late a new
+# target or a stop request is noticed
+BATCH_TIME = 0.01
+
+# Slowest commanded speed, used when the limits have no start speed
+MIN_SPEED = 1.0  # deg/s
+
+# Bisection steps when fitting a speed cap to a move time
+SPEED_SEARCH_ITERATIONS = 20
+
+
+def constant_speed_limits(step_delay: float, steps_per_degree: float) -> MotionLimits:
+    """
+    Limits in degrees of an axis without acceleration planning: every step
+    takes 2 * step_delay, like the constant-speed moves of the controller.
+    """
+    speed = 1.0 / (2 * step_delay * steps_per_degree)
+    # Starting at full speed makes every step the same length; the
+    # acceleration then only bounds the stop time to one batch
+    return MotionLimits(speed, speed / BATCH_TIME, start_speed=speed)
+
+
+@dataclass(frozen=True)
+class MotionStatus:
+    position: int
+    angle: float
+    velocity: float
+    target: float
+    done: bool
+    jogging: bool
+
+
+class AzimuthMotionExecutor(threading.Thread):
+    """
+    Runs azimuth moves in a dedicated thread.
+
+    Targets can be changed at any time with move_to(); the motion blends
+    into the new target under the controller's speed and acceleration
+    limits without stopping first, reversing through a controlled
+    deceleration when needed.
+
+    set_velocity() switches to continuous jog mode, where the axis follows
+    a commanded rate under the same limits and stops short of the cable
+    limits.
+
+    slew_to() hands long moves that are not retargeted to the controller,
+    which plans them under its limits (an S-curve with a jerk limit) and
+    makes them at the coarse slew microstep.
+
+    Steps are sent in batches of at most BATCH_TIME seconds, so the
+    reaction to a new command is bounded. The reported position counts
+    the steps handed to the motor and runs at most one batch ahead of the
+    shaft.
+    """
+
+    def __init__(self, controller: "AzimuthController") -> None:
+        """
+        Args:
+            controller (AzimuthController): Axis moved by this executor.
+        """
+        super().__init__(name="AzimuthMotion", daemon=True)
+        self.controller: "AzimuthController" = controller
+
+        steps_per_degree = controller.steps_per_degree
+        limits = controller.limits
+        if limits is None:
+            limits = constant_speed_limits(controller.step_delay, steps_per_degree)
+        self._max_speed: float = limits.max_speed * steps_per_degree
+        self._accel: float = limits.accel * steps_per_degree
+        self._min_speed: float = max(limits.start_speed, MIN_SPEED) * steps_per_degree
+
+        self._position: int = controller.position_steps
+        self._target: int = self._position
+        # Speed cap of the current positioning move, steps/s
+        self._cruise: float = self._max_speed
+        self._speed: float = 0.0
+        self._direction: int = 1
+        # Commanded rate in steps/s while jogging, None in position mode
+        self._jog: Optional[float] = None
+        # Pending slew_to() as (angle, max_speed), and whether one runs
+        self._slew: Optional[Tuple[float, Optional[float]]] = None
+        self._slewing: bool = False
+
+        cable_limits = controller.cable_limits
+        self._limit_steps = (
+            None
+            if cable_limits is None
+            else tuple(limit * steps_per_degree for limit in cable_limits)
+        )
+
+        self._cond = threading.Condition()
+        self._done = threading.Event()
+        self._done.set()
+        self._running: bool = True
+
+    # Commands
+
+    def move_to(self, angle: float, max_speed: Optional[float] = None) -> None:
+        """
+        Sets a new target azimuth in degrees and returns immediately.
+
+        Args:
+            angle (float): Target azimuth in degrees.
+            max_speed (float): Speed cap of this move in deg/s, the axis
+                limit by default.
+        """
+        with self._cond:
+            if self._done.is_set():
+                self._sync_position()
+            angle = self.controller.resolve_target(angle)
+            self._jog = None
+            self._slew = None
+            self._target = round(angle * self.controller.steps_per_degree)
+            self._cruise = self._cruise_speed(max_speed)
+            if self._target != self._position or self._speed > 0:
+                self._done.clear()
+            self._cond.notify()
+
+    def slew_to(self, angle: float, max_speed: Optional[float] = None) -> None:
+        """
+        Moves to angle like move_to(), but through the controller's planned
+        path when the controller plans a move of that length.
+
+        A planned slew starts from a standstill and cannot be retargeted or
+        cut short: commands given while it runs take effect once it has
+        ended, and the reported position is updated at its end.
+
+        Args:
+            angle (float): Target azimuth in degrees.
+            max_speed (float): Speed cap of this move in deg/s, the axis
+                limit by default.
+        """
+        controller = self.controller
+        with self._cond:
+            if self._done.is_set():
+                self._sync_position()
+            angle = controller.resolve_target(angle)
+            delta = angle - self._position / controller.steps_per_degree
+            if self._slewing or not controller.plans(delta):
+                self.move_to(angle, max_speed)
+                return
+
+            self._jog = None
+            self._slew = (angle, max_speed)
+            self._cruise = self._max_speed
+            if self._speed > 0:
+                # Brake first, the slew starts once the axis stands still
+                self._target = self._stop_target()
+            self._done.clear()
+            self._cond.notify()
+
+    def move_by(self, delta: float) -> None:
+        with self._cond:
+            moving = not self._done.is_set() and self._jog is None
+            base = self._target if moving else None
+        if base is None:
+            self.move_to(self.controller.current_angle + delta)
+        else:
+            self.move_to(base / self.controller.steps_per_degree + delta)
+
+    def set_velocity(self, deg_per_s: float) -> None:
+        """
+        Jogs the axis at deg_per_s (signed) until the next command.
+
+        Cheap enough to be called by a control loop at a high rate, rate
+        changes are followed under the acceleration limit.
+        """
+        with self._cond:
+            if self._done.is_set():
+                self._sync_position()
+            self._slew = None
+            self._jog = deg_per_s * self.controller.steps_per_degree
+            if self._wants_motion() or self._speed > 0:
+                self._done.clear()
+            self._cond.notify()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Decelerates to a standstill as quickly as the limits allow.
+
+        Returns:
+            bool: True once stopped, False on timeout.
+        """
+        with self._cond:
+            # A jog ends in position mode, like a move cut short
+            self._jog = None
+            self._slew = None
+            self._cruise = self._max_speed
+            # A running slew ends at its own target
+            if not self._slewing:
+                self._target = self._stop_target()
+            self._cond.notify()
+
+        if timeout is None:
+            timeout = self.stop_time() + 2 * BATCH_TIME
+        return self._done.wait(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        self.stop()
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self.join(timeout=timeout)
+
+    # Status
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def status(self) -> MotionStatus:
+        steps_per_degree = self.controller.steps_per_degree
+        with self._cond:
+            jogging = self._jog is not None
+            target = self._position if jogging else self._target
+            return MotionStatus(
+                position=self._position,
+                angle=self._position / steps_per_degree,
+                velocity=self._direction * self._speed / steps_per_degree,
+                target=target / steps_per_degree,
+                done=self._done.is_set(),
+                jogging=jogging,
+            )
+
+    def stop_time(self) -> float:
+        """Upper bound on the time a stop() takes from full speed."""
+        return self._max_speed / self._accel
+
+    def move_time(self, distance: float, max_speed: Optional[float] = None) -> float:
+        """
+        Duration of a positioning move from a standstill, replaying the
+        step-by-step speed profile of the executor.
+
+        Args:
+            distance (float): Length of the move in degrees.
+            max_speed (float): Speed cap in deg/s, the axis limit by default.
+
+        Returns:
+            float: Seconds from start to arrival.
+        """
+        cruise = self._cruise_speed(max_speed)
+        cruise_stop = self._stopping_distance(cruise)
+        target = round(abs(distance) * self.controller.steps_per_degree)
+
+        position, direction = 0, 1
+        speed = elapsed = 0.0
+        while True:
+            remaining = target - position
+            if speed == 0:
+                if remaining == 0:
+                    return elapsed
+                direction = 1 if remaining > 0 else -1
+                speed = self._min_speed
+            elif speed == cruise and remaining * direction > cruise_stop:
+                # Constant speed until the deceleration point, in one go
+                cruise_steps = abs(remaining) - math.floor(cruise_stop)
+                elapsed += cruise_steps / cruise
+                position += direction * cruise_steps
+                continue
+            else:
+                speed = self._approach_speed(speed, remaining, direction, cruise)
+            elapsed += 1 / speed
+            position += direction
+            if speed <= self._min_speed and (target - position) * direction <= 0:
+                speed = 0.0
+
+    def slew_time(self, distance: float, max_speed: Optional[float] = None) -> float:
+        """
+        Duration of a slew_to() from a standstill at the current position.
+
+        Args:
+            distance (float): Signed length of the move in degrees.
+            max_speed (float): Speed cap in deg/s, the axis limit by default.
+
+        Returns:
+            float: Seconds from start to arrival.
+        """
+        controller = self.controller
+        if not controller.plans(distance):
+            return self.move_time(distance, max_speed)
+        return controller.move_time(distance, controller.step_delay, max_speed)
+
+    def speed_for_time(
+        self, distance: float, duration: float, slew: bool = False
+    ) -> float:
+        """
+        Slowest speed cap that still covers distance within duration.
+
+        Args:
+            distance (float): Length of the move in degrees.
+            duration (float): Wanted move time in seconds.
+            slew (bool): Fit the cap to slew_to() instead of move_to().
+
+        Returns:
+            float: Speed cap in deg/s for move_to() or slew_to(), within
+            the axis limits.
+        """
+        move_time = self.slew_time if slew else self.move_time
+        steps_per_degree = self.controller.steps_per_degree
+        low = self._min_speed / steps_per_degree
+        high = self._max_speed / steps_per_degree
+        if move_time(distance, high) >= duration:
+            return high
+
+        # Move time falls as the cap rises
+        for _ in range(SPEED_SEARCH_ITERATIONS):
+            mid = (low + high) / 2
+            if move_time(distance, mid) > duration:
+                low = mid
+            else:
+                high = mid
+        return high
+
+    # Motion
+
+    def _sync_position(self) -> None:
+        # The controller may have been moved directly while we were idle
+        self._position = self.controller.position_steps
+
+    def _stop_target(self) -> int:
+        if self._speed == 0:
+            return self._position
+        return self._position + self._direction * math.ceil(self._stopping_distance())
+
+    def _wants_motion(self) -> bool:
+        if self._jog is None:
+            return self._target != self._position
+        direction = 1 if self._jog > 0 else -1
+        return self._jog != 0 and self._jog_speed(direction) > 0
+
+    def _idle(self) -> bool:
+        return self._speed == 0 and self._slew is None and not self._wants_motion()
+
+    def _cruise_speed(self, max_speed: Optional[float]) -> float:
+        """Speed cap in steps/s for a cap in deg/s, within the limits."""
+        if max_speed is None:
+            return self._max_speed
+        cruise = max_speed * self.controller.steps_per_degree
+        return min(max(cruise, self._min_speed), self._max_speed)
+
+    def _stopping_distance(self, speed: Optional[float] = None) -> float:
+        if speed is None:
+            speed = self._speed
+        return max(0.0, speed**2 - self._min_speed**2) / (2 * self._accel)
+
+    def _approach_speed(
+        self, speed: float, remaining: int, direction: int, cruise: float
+    ) -> float:
+        """Speed of the next step of a positioning move already under way."""
+        approaching = remaining * direction > 0
+        if not approaching or abs(remaining) <= self._stopping_distance(speed):
+            return math.sqrt(max(speed**2 - 2 * self._accel, self._min_speed**2))
+        if speed > cruise:
+            # Slowed down by a retarget with a lower speed cap
+            return max(math.sqrt(max(speed**2 - 2 * self._accel, 0.0)), cruise)
+        return min(math.sqrt(speed**2 + 2 * self._accel), cruise)
+
+    def _jog_speed(self, direction: int) -> float:
+        """Jog speed wanted in direction, 0 to stop or reverse."""
+        if self._jog * direction <= 0:
+            return 0.0
+        if self._limit_steps is not None:
+            edge = self._limit_steps[1] if direction > 0 else self._limit_steps[0]
+            if (edge - self._position) * direction <= self._stopping_distance() + 1:
+                return 0.0
+        return min(abs(self._jog), self._max_speed)
+
+    def _next_jog_step(self) -> Optional[float]:
+        if self._speed == 0:
+            if self._jog == 0:
+                return None
+            self._direction = 1 if self._jog > 0 else -1
+            wanted = self._jog_speed(self._direction)
+            if wanted == 0:
+                return None
+            self._speed = min(self._min_speed, wanted)
+            return 1 / self._speed
+
+        wanted = self._jog_speed(self._direction)
+        if self._speed < wanted:
+            self._speed = min(math.sqrt(self._speed**2 + 2 * self._accel), wanted)
+        elif self._speed > wanted:
+            floor = wanted if wanted > 0 else self._min_speed
+            self._speed = max(
+                math.sqrt(max(self._speed**2 - 2 * self._accel, 0.0)), floor
+            )
+        return 1 / self._speed
+
+    def _next_step(self) -> Optional[float]:
+        """Updates speed and direction for the next step, returns its period."""
+        if self._jog is not None:
+            return self._next_jog_step()
+
+        remaining = self._target - self._position
+
+        if self._speed == 0:
+            if remaining == 0:
+                return None
+            self._direction = 1 if remaining > 0 else -1
+            self._speed = self._min_speed
+            return 1 / self._speed
+
+        self._speed = self._approach_speed(
+            self._speed, remaining, self._direction, self._cruise
+        )
+        return 1 / self._speed
+
+    def _after_step(self) -> None:
+        self._position += self._direction
+        if self._jog is not None:
+            stopping = self._jog_speed(self._direction) == 0
+            if stopping and self._speed <= self._min_speed:
+                self._speed = 0.0
+            return
+
+        remaining = self._target - self._position
+        at_crawl = self._speed <= self._min_speed
+        if at_crawl and (remaining == 0 or remaining * self._direction < 0):
+            self._speed = 0.0
+
+    def _plan_batch(self) -> List[float]:
+        # A batch ends at a standstill, so it never changes direction
+        periods: List[float] = []
+        elapsed = 0.0
+        while elapsed < BATCH_TIME:
+            period = self._next_step()
+            if period is None:
+                break
+            periods.append(period)
+            elapsed += period
+            self._after_step()
+            if self._speed == 0:
+                break
+        return periods
+
+    def run(self) -> None:
+        log("INFO", "AZIMUTH MOTION", "Motion executor started")
+        motor = self.controller.motor
+
+        while True:
+            with self._cond:
+                while self._running and self._idle():
+                    self._done.set()
+                    self._cond.wait()
+                if not self._running:
+                    break
+                slew = self._slew if self._speed == 0 else None
+                if slew is not None:
+                    self._slew = None
+                    self._slewing = True
+                    angle = slew[0]
+                    self._target = round(angle * self.controller.steps_per_degree)
+                else:
+                    periods = self._plan_batch()
+                    direction = self._direction
+                    position = self._position
+
+            if slew is not None:
+                self._run_slew(*slew)
+                continue
+            if not periods:
+                continue
+
+            motor.enable()
+            if motor.direction != (direction > 0):
+                motor.set_direction(clockwise=direction > 0)
+            try:
+                self.controller.record_steps(
+                    time.monotonic(),
+                    periods,
+                    position - direction * len(periods),
+                    direction,
+                )
+                motor.step_periods(periods)
+            except Exception as e:
+                log("ERROR", "AZIMUTH MOTION", f"Step batch failed: {e}")
+                with self._cond:
+                    self._speed = 0.0
+                    self._target = self._position
+                continue
+
+            with self._cond:
+                self.controller.sync_steps(self._position)
+
+        log("INFO", "AZIMUTH MOTION", "Motion executor stopped")
+
+    def _run_slew(self, angle: float, max_speed: Optional[float]) -> None:
+        controller = self.controller
+        failed = False
+        try:
+            controller.move_to_angle(angle, controller.step_delay, max_speed)
+        except Exception as e:
+            log("ERROR", "AZIMUTH MOTION", f"Slew failed: {e}")
+            failed = True
+
+        with self._cond:
+            self._slewing = False
+            self._position = controller.position_steps
+            if failed:
+                self._target = self._position
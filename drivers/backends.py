@@ -0,0 +1,142 @@
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from drivers.gpio_backend import GPIO_BACKENDS, RPiGpioBackend, SimulatedGpioBackend
+from utils.logger import log
+
+# Backend names shared by the GPIO, PWM and I2C registries
+SIM = "sim"
+
+
+class SimulatedPwm:
+    """
+    Stand-in for a pigpio connection that keeps the servo pulse widths in
+    memory instead of driving a pin.
+    """
+
+    connected = True
+
+    def __init__(self) -> None:
+        self.pulse_widths: Dict[int, float] = {}
+
+    def set_servo_pulsewidth(self, pin: int, pulsewidth: float) -> None:
+        self.pulse_widths[pin] = pulsewidth
+
+    def stop(self) -> None:
+        pass
+
+
+def _open_pigpio() -> Any:
+    import pigpio
+
+    return pigpio.pi()
+
+
+def _open_smbus(bus_id: int) -> Any:
+    from smbus2 import SMBus
+
+    return SMBus(bus_id)
+
+
+def _open_sim_bus(
+    bus_id: int,
+    scene: Any = None,
+    offset: Optional[Tuple[float, float]] = None,
+    pointing: Optional[Callable[[], Tuple[float, float]]] = None,
+) -> Any:
+    from drivers.sim_bus import Scene, SimulatedBus
+
+    scene = scene if scene is not None else Scene()
+    return SimulatedBus(scene, bus_id, offset=offset, pointing=pointing)
+
+
+# Factories import their library only when a device is opened, so no
+# hardware library is loaded unless the station actually uses it
+PWM_BACKENDS: Dict[str, Callable[..., Any]] = {
+    "pigpio": _open_pigpio,
+    SIM: SimulatedPwm,
+}
+
+I2C_BACKENDS: Dict[str, Callable[..., Any]] = {
+    "smbus2": _open_smbus,
+    SIM: _open_sim_bus,
+}
+
+
+def _lookup(registry: Dict[str, Callable[..., Any]], kind: str, name: str):
+    if name not in registry:
+        raise ValueError(f"Unknown {kind} backend {name!r}")
+    return registry[name]
+
+
+def open_pwm(backend: Optional[str] = None) -> Any:
+    """
+    Opens the named servo PWM backend, pigpio by default.
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    return _lookup(PWM_BACKENDS, "PWM", backend or "pigpio")()
+
+
+def open_i2c(bus_id: int, backend: Optional[str] = None, **kwargs) -> Any:
+    """
+    Opens an I2C bus with the smbus2.SMBus i2c_rdwr/close interface.
+
+    Args:
+        bus_id (int): Bus number, /dev/i2c-<bus_id> on hardware.
+        backend (str): "smbus2" (default) or "sim".
+        **kwargs: Backend options, e.g. the Scene and beam offset of a
+            simulated bus.
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    return _lookup(I2C_BACKENDS, "I2C", backend or "smbus2")(bus_id, **kwargs)
+
+
+@dataclass(frozen=True)
+class BackendConfig:
+    """Names of the GPIO, PWM and I2C backends of a station."""
+
+    gpio: str = RPiGpioBackend.name
+    pwm: str = "pigpio"
+    i2c: str = "smbus2"
+
+    def __post_init__(self) -> None:
+        _lookup(GPIO_BACKENDS, "GPIO", self.gpio)
+        _lookup(PWM_BACKENDS, "PWM", self.pwm)
+        _lookup(I2C_BACKENDS, "I2C", self.i2c)
+
+    @property
+    def simulated(self) -> bool:
+        return SIM in (self.gpio, self.pwm, self.i2c)
+
+
+HARDWARE = BackendConfig()
+SIMULATION = BackendConfig(gpio=SimulatedGpioBackend.name, pwm=SIM, i2c=SIM)
+
+
+def load_backends() -> BackendConfig:
+    """
+    Reads the backends from the environment: LMS_BACKEND selects
+    "hardware" (default) or "sim" for everything, GPIO_BACKEND,
+    PWM_BACKEND and I2C_BACKEND override single ones.
+
+    Raises:
+        ValueError: If a backend name is unknown
+    """
+    preset = os.getenv("LMS_BACKEND", "hardware")
+    if preset not in ("hardware", SIM):
+        raise ValueError(f"Unknown LMS_BACKEND {preset!r}")
+    base = SIMULATION if preset == SIM else HARDWARE
+
+    config = BackendConfig(
+        gpio=os.getenv("GPIO_BACKEND", base.gpio),
+        pwm=os.getenv("PWM_BACKEND", base.pwm),
+        i2c=os.getenv("I2C_BACKEND", base.i2c),
+    )
+    if config.simulated:
+        log("INFO", "BACKENDS", f"Simulated hardware: {config}")
+    return config
@@ -0,0 +1,89 @@
+import mmap
+import struct
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from drivers.lidar import FRAME_SIZE
+
+# Layout of the raw frame logs written by core.recorder.FrameRecorder
+FILE_MAGIC = b"LMSFRM01"
+
+# Magic, record size, reserved
+FILE_HEADER = struct.Struct("<8sII")
+
+# Timestamp, bus, address, raw frame, commanded az, commanded el, padding
+RECORD = struct.Struct(f"<dHH{FRAME_SIZE}sff3x")
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("bus_id", "<u2"),
+        ("address", "<u2"),
+        ("frame", "u1", (FRAME_SIZE,)),
+        ("az", "<f4"),
+        ("el", "<f4"),
+        ("pad", "V3"),
+    ]
+)
+
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+
+class FrameRecord(NamedTuple):
+    timestamp: float
+    bus_id: int
+    address: int
+    frame: bytes
+    az: float
+    el: float
+
+
+class FrameLog:
+    """Memory-mapped, random-access reader of a LIDAR frame log."""
+
+    def __init__(self, path: str) -> None:
+        check_header(path)
+        self.path: str = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        count = (len(self._mmap) - FILE_HEADER.size) // RECORD.size
+        self.records = np.frombuffer(
+            self._mmap, dtype=RECORD_DTYPE, count=count, offset=FILE_HEADER.size
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> FrameRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        offset = FILE_HEADER.size + index * RECORD.size
+        return FrameRecord(*RECORD.unpack_from(self._mmap, offset))
+
+    def bus_ids(self) -> Tuple[int, ...]:
+        return tuple(int(b) for b in np.unique(self.records["bus_id"]))
+
+    def indices_for(self, bus_id: int) -> np.ndarray:
+        """Returns the record indices of one bus in recording order."""
+        return np.flatnonzero(self.records["bus_id"] == bus_id)
+
+    def close(self) -> None:
+        # Views into the mapping must be dropped before it can be closed
+        self.records = self.records[:0].copy()
+        self._mmap.close()
+        self._file.close()
+
+
+def check_header(path: str) -> None:
+    with open(path, "rb") as f:
+        header = f.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size:
+        raise ValueError(f"{path} is not a LIDAR frame log")
+
+    magic, record_size, _ = FILE_HEADER.unpack(header)
+    if magic != FILE_MAGIC or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a compatible LIDAR frame log")
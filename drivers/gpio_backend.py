@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence
+
+from utils.logger import log
+
+LOW = 0
+HIGH = 1
+
+
+class GpioBackend(ABC):
+    """
+    Output-only access to a fixed group of GPIO lines (BCM numbering).
+
+    write_many() changes several lines with as few calls into the kernel
+    as the library allows.
+    """
+
+    name = "base"
+
+    def __init__(self, pins: Sequence[int]) -> None:
+        self.pins = tuple(pins)
+
+    @abstractmethod
+    def write(self, pin: int, level: int) -> None:
+        """Sets one line to LOW or HIGH."""
+
+    def write_many(self, levels: Dict[int, int]) -> None:
+        for pin, level in levels.items():
+            self.write(pin, level)
+
+    def release(self) -> None:
+        pass
+
+
+class RPiGpioBackend(GpioBackend):
+    """RPi.GPIO, one call per line change."""
+
+    name = "rpi"
+
+    def __init__(self, pins: Sequence[int], lib=None) -> None:
+        super().__init__(pins)
+        if lib is None:
+            import RPi.GPIO as lib
+        self._gpio = lib
+
+        self._gpio.setmode(self._gpio.BCM)
+        for pin in self.pins:
+            self._gpio.setup(pin, self._gpio.OUT)
+
+    def write(self, pin: int, level: int) -> None:
+        self._gpio.output(pin, level)
+
+    def write_many(self, levels: Dict[int, int]) -> None:
+        self._gpio.output(list(levels), list(levels.values()))
+
+    def release(self) -> None:
+        self._gpio.cleanup(list(self.pins))
+
+
+class GpiodBackend(GpioBackend):
+    """libgpiod v2, all lines held by a single line request."""
+
+    name = "gpiod"
+
+    def __init__(
+        self,
+        pins: Sequence[int],
+        chip: str = "/dev/gpiochip0",
+        consumer: str = "lms-stepper",
+        lib=None,
+    ) -> None:
+        super().__init__(pins)
+        if lib is None:
+            import gpiod as lib
+        line = lib.line
+
+        self._values = (line.Value.INACTIVE, line.Value.ACTIVE)
+        self._request = lib.request_lines(
+            chip,
+            consumer=consumer,
+            config={
+                self.pins: lib.LineSettings(
+                    direction=line.Direction.OUTPUT,
+                    output_value=line.Value.INACTIVE,
+                )
+            },
+        )
+
+    def write(self, pin: int, level: int) -> None:
+        self._request.set_value(pin, self._values[level])
+
+    def write_many(self, levels: Dict[int, int]) -> None:
+        values = self._values
+        self._request.set_values({pin: values[lvl] for pin, lvl in levels.items()})
+
+    def release(self) -> None:
+        self._request.release()
+
+
+class LgpioBackend(GpioBackend):
+    """lgpio, the lines claimed as one group written with a bit mask."""
+
+    name = "lgpio"
+
+    def __init__(self, pins: Sequence[int], chip: int = 0, lib=None) -> None:
+        super().__init__(pins)
+        if lib is None:
+            import lgpio as lib
+        self._lgpio = lib
+
+        self._handle = lib.gpiochip_open(chip)
+        lib.group_claim_output(self._handle, list(self.pins), [LOW] * len(self.pins))
+        self._leader = self.pins[0]
+        self._bits = {pin: 1 << i for i, pin in enumerate(self.pins)}
+
+    def write(self, pin: int, level: int) -> None:
+        bit = self._bits[pin]
+        self._lgpio.group_write(self._handle, self._leader, bit if level else 0, bit)
+
+    def write_many(self, levels: Dict[int, int]) -> None:
+        bits = mask = 0
+        for pin, level in levels.items():
+            bit = self._bits[pin]
+            mask |= bit
+            if level:
+                bits |= bit
+        self._lgpio.group_write(self._handle, self._leader, bits, mask)
+
+    def release(self) -> None:
+        self._lgpio.group_free(self._handle, self._leader)
+        self._lgpio.gpiochip_close(self._handle)
+
+
+class SimulatedGpioBackend(GpioBackend):
+    """Keeps the line levels in memory, for running without a Pi."""
+
+    name = "sim"
+
+    def __init__(self, pins: Sequence[int]) -> None:
+        super().__init__(pins)
+        self.levels: Dict[int, int] = {pin: LOW for pin in self.pins}
+
+    def write(self, pin: int, level: int) -> None:
+        self.levels[pin] = level
+
+    def write_many(self, levels: Dict[int, int]) -> None:
+        self.levels.update(levels)
+
+
+GPIO_BACKENDS = {
+    backend.name: backend
+    for backend in (RPiGpioBackend, GpiodBackend, LgpioBackend, SimulatedGpioBackend)
+}
+
+
+def open_backend(
+    pins: Sequence[int], backend: Optional[str] = None, **kwargs
+) -> GpioBackend:
+    """
+    Opens the named GPIO backend for pins, RPi.GPIO by default.
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = backend or RPiGpioBackend.name
+    if name not in GPIO_BACKENDS:
+        raise ValueError(f"Unknown GPIO backend {name!r}")
+    log("INFO", "GPIO", f"Using {name} backend for pins {list(pins)}")
+    return GPIO_BACKENDS[name](pins, **kwargs)
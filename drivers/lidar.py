@@ -1,23 +1,154 @@
+import ctypes
+import struct
+import threading
 import time
-from smbus2 import SMBus, i2c_msg
+from drivers.backends import open_i2c
 from utils.logger import log
 
+FRAME_SIZE = 9
+
+# i2c_msg flag of a read transaction, as in smbus2
+I2C_M_RD = 0x0001
+FRAME_HEADER = 0x59
+
+# Header, Header, Dist, Strength, Temp, Checksum (little endian)
+FRAME_STRUCT = struct.Struct("<BBHHHB")
+
+# Distance codes the sensor reports instead of a range
+DIST_WEAK_SIGNAL = 0xFFFF  # -1: strength below 100
+DIST_SATURATED = 0xFFFE  # -2: signal strength saturated
+DIST_AMBIENT_SATURATED = 0xFFFC  # -4: ambient light saturated
+
+# Sample / transaction status codes
+STATUS_OK = 0
+STATUS_WEAK_SIGNAL = 1
+STATUS_SATURATED = 2
+STATUS_AMBIENT_SATURATED = 3
+STATUS_BAD_HEADER = 4
+STATUS_BAD_CHECKSUM = 5
+STATUS_IO_ERROR = 6
+
+_DIST_STATUS = {
+    DIST_WEAK_SIGNAL: STATUS_WEAK_SIGNAL,
+    DIST_SATURATED: STATUS_SATURATED,
+    DIST_AMBIENT_SATURATED: STATUS_AMBIENT_SATURATED,
+}
+
+# Worst-case delay between the data request and the read in
+# trigger-then-poll mode, used until a calibrated profile is applied and as
+# the fallback when a frame comes back invalid
+TRIGGER_READ_DELAY = 0.01
+
+# Worst-case settling time after a configuration command
+COMMAND_DELAY = 0.1
+
+# Extra attempts at TRIGGER_READ_DELAY after an invalid frame
+MAX_READ_RETRIES = 1
+
+DEFAULT_FRAME_RATE = 100
+
+# Sensor settings per station operating mode
+LIDAR_MODES = {
+    "tracking": {"frame_rate": 250, "kalman": False},
+    "locate": {"frame_rate": 100, "kalman": True},
+}
+
+
+class LidarSample:
+    """A single decoded TFmini-S frame."""
+
+    __slots__ = ("distance", "strength", "temperature", "timestamp", "status")
+
+    def __init__(
+        self, distance=0, strength=0, temperature=0.0, timestamp=0.0, status=STATUS_OK
+    ):
+        self.distance = distance
+        self.strength = strength
+        self.temperature = temperature
+        self.timestamp = timestamp
+        self.status = status
+
+    def __repr__(self):
+        return (
+            f"LidarSample(distance={self.distance}, strength={self.strength}, "
+            f"temperature={self.temperature:.2f}, timestamp={self.timestamp:.6f}, "
+            f"status={self.status})"
+        )
+
+
+EMPTY_SAMPLE = LidarSample()
+
 
 class Lidar:
-    def __init__(self, bus_id=1, address=0x10):
+    def __init__(self, bus_id=1, address=0x10, bus=None, bus_factory=None):
+        """
+        Args:
+            bus_id (int): I2C bus number.
+            address (int): I2C address of the sensor.
+            bus: Object with the smbus2.SMBus i2c_rdwr/close interface to
+                use instead of opening /dev/i2c-<bus_id> through the I2C
+                backend, e.g. a ReplayBus. It is kept across reopen().
+            bus_factory (Callable): Opens a new bus, called again by
+                reopen(). Defaults to the I2C backend.
+        """
         self.bus_id = bus_id
         self.address = address
         self.distance = 0
         self.strength = 0
         self.temperature = 0
+        self.sample = EMPTY_SAMPLE
+        self.last_status = STATUS_OK
+        self._last_error = None
+
+        # Called with (lidar, raw_frame, timestamp) for every frame read
+        self.frame_listener = None
+
+        self.read_delay = TRIGGER_READ_DELAY
+        self.command_delay = COMMAND_DELAY
+        self.max_retries = MAX_READ_RETRIES
+
+        self.streaming = False
+        self.frame_rate = DEFAULT_FRAME_RATE
+        # Free-running rate restored by stop_streaming()
+        self._poll_frame_rate = DEFAULT_FRAME_RATE
+        self._next_frame_at = 0.0
+        # Operating mode from LIDAR_MODES the sensor is configured for
+        self.mode = None
+
+        # Serializes transactions so commands never interleave with a read
+        self._lock = threading.RLock()
 
         # Header, Len, ID, Get Data, Checksum
         self.GET_DATA_CMD = [0x5A, 0x05, 0x00, 0x01, 0x60]
         self.KALMAN_FILTER_OFF_CMD = [0x5A, 0x05, 0x39, 0x00, 0x98]
         self.KALMAN_FILTER_ON_CMD = [0x5A, 0x05, 0x39, 0x01, 0x99]
+        self.OUTPUT_OFF_CMD = [0x5A, 0x05, 0x07, 0x00, 0x66]
+        self.OUTPUT_ON_CMD = [0x5A, 0x05, 0x07, 0x01, 0x67]
+
+        # smbus2 is only needed for the transaction structs, so it is loaded
+        # with the first sensor instead of with the module
+        from smbus2 import i2c_msg
+
+        self._write_msg = i2c_msg.write
+
+        # Transaction buffers are allocated once and reused by every update()
+        self._request_msg = self._write_msg(self.address, self.GET_DATA_CMD)
+        self._frame_buf = ctypes.create_string_buffer(FRAME_SIZE)
+        self._read_msg = i2c_msg(
+            addr=self.address, flags=I2C_M_RD, len=FRAME_SIZE, buf=self._frame_buf
+        )
+        self._frame = memoryview(self._frame_buf).cast("B")
+        self._checksummed = self._frame[: FRAME_SIZE - 1]
+
+        if bus is not None:
+            self._open_bus = lambda: bus
+        elif bus_factory is not None:
+            self._open_bus = bus_factory
+        else:
+            self._open_bus = lambda: open_i2c(bus_id)
 
         try:
-            self.bus = SMBus(self.bus_id)
+            self.bus = self._open_bus()
             log(
                 "INFO",
                 "LIDAR BUS" + str(self.bus_id),
@@ -27,70 +158,237 @@ class Lidar:
             log("ERROR", "LIDAR", f"Failed to open I2C bus: {e}")
             raise
 
+    @staticmethod
+    def _frame_rate_cmd(rate):
+        # Header, Len, ID, Rate LSB, Rate MSB, Checksum
+        cmd = [0x5A, 0x06, 0x03, rate & 0xFF, (rate >> 8) & 0xFF]
+        cmd.append(sum(cmd) & 0xFF)
+        return cmd
+
     def _send_comand(self, command):
-        try:
-            write = i2c_msg.write(self.address, command)
-            self.bus.i2c_rdwr(write)
-            time.sleep(0.1)
-            return True
-        except Exception as e:
-            log("ERROR", "LIDAR", f"Command {command} failed: {e}")
-            return False
+        with self._lock:
+            try:
+                write = self._write_msg(self.address, command)
+                self.bus.i2c_rdwr(write)
+                time.sleep(self.command_delay)
+                return True
+            except Exception as e:
+                log("ERROR", "LIDAR", f"Command {command} failed: {e}")
+                return False
+
+    def apply_profile(self, profile):
+        """
+        Uses the calibrated delays of a LatencyProfile instead of the
+        worst-case defaults.
+        """
+        self.read_delay = min(profile.read_delay, TRIGGER_READ_DELAY)
+        self.command_delay = min(profile.command_delay, COMMAND_DELAY)
+        log(
+            "INFO",
+            "LIDAR",
+            f"Bus {self.bus_id}: read delay {self.read_delay * 1000:.2f} ms, "
+            f"command delay {self.command_delay * 1000:.1f} ms",
+        )
 
     def set_kalman_filter(self, active=True):
         cmd = self.KALMAN_FILTER_ON_CMD if active else self.KALMAN_FILTER_OFF_CMD
         status = "ON" if active else "OFF"
+        self.mode = None
 
         if self._send_comand(cmd):
             log("INFO", "LIDAR", f"Kalman filter turned {status}")
             return True
         return False
 
+    def set_frame_rate(self, rate):
+        """
+        Sets the internal measurement rate of the sensor (Hz).
+        A rate of 0 puts the sensor into single-shot trigger mode, which
+        update() does not support: it never sends the trigger command.
+        """
+        if not 0 <= rate <= 1000:
+            log("WARN", "LIDAR", f"Invalid frame rate: {rate}")
+            return False
+
+        self.mode = None
+        if self._send_comand(self._frame_rate_cmd(rate)):
+            self.frame_rate = rate
+            log("INFO", "LIDAR", f"Frame rate set to {rate} Hz")
+            return True
+        return False
+
+    def set_output(self, enabled=True):
+        cmd = self.OUTPUT_ON_CMD if enabled else self.OUTPUT_OFF_CMD
+        return self._send_comand(cmd)
+
+    def start_streaming(self, frame_rate=DEFAULT_FRAME_RATE):
+        """
+        Switches to continuous output: the sensor measures on its own at
+        frame_rate and update() reads its latest output frame once per
+        frame period, without sending a data request or waiting for the
+        trigger-then-poll delay.
+        """
+        if frame_rate <= 0:
+            log("WARN", "LIDAR", "Streaming needs a frame rate above 0 Hz")
+            return False
+
+        if not self.streaming:
+            self._poll_frame_rate = self.frame_rate or DEFAULT_FRAME_RATE
+        if not (self.set_frame_rate(frame_rate) and self.set_output(True)):
+            return False
+
+        self.streaming = True
+        self._next_frame_at = time.monotonic()
+        log("INFO", "LIDAR", f"Streaming at {frame_rate} Hz")
+        return True
+
+    def stop_streaming(self):
+        """
+        Returns to trigger-then-poll reads: update() requests each frame
+        and reads it after the read delay. The sensor keeps measuring at
+        the frame rate it had before streaming, so every request returns a
+        new measurement.
+        """
+        self.streaming = False
+        return self.set_frame_rate(self._poll_frame_rate)
+
+    def apply_mode(self, mode):
+        """
+        Applies the frame rate and on-chip filtering of an operating mode
+        from LIDAR_MODES, e.g. "tracking" or "locate". No commands are sent
+        when the sensor is already in that mode.
+        """
+        settings = LIDAR_MODES.get(mode)
+        if settings is None:
+            log("WARN", "LIDAR", f"Unknown LIDAR mode: {mode}")
+            return False
+        if mode == self.mode:
+            return True
+
+        if not (
+            self.set_kalman_filter(settings["kalman"])
+            and self.start_streaming(settings["frame_rate"])
+        ):
+            return False
+        self.mode = mode
+        return True
+
+    def _wait_for_frame(self):
+        # Do not fetch faster than the sensor produces new frames
+        now = time.monotonic()
+        if self._next_frame_at > now:
+            time.sleep(self._next_frame_at - now)
+            now = self._next_frame_at
+        self._next_frame_at = now + 1.0 / self.frame_rate
+
     def update(self):
         """
-        Triggers a measurement and updates the internal state.
+        Fetches a measurement and updates the internal state.
+        In trigger mode the sensor is polled, in streaming mode the next
+        frame produced by the sensor is read.
         Returns True if successful, False otherwise.
         """
-        try:
-            write = i2c_msg.write(self.address, self.GET_DATA_CMD)
+        if self.streaming:
+            self._wait_for_frame()
 
-            read = i2c_msg.read(self.address, 9)
+        with self._lock:
+            return self._read_frame(self.read_delay, request=not self.streaming)
 
-            self.bus.i2c_rdwr(write)
+    def probe(self, read_delay, command=None, command_delay=0.0):
+        """
+        Runs a single transaction with explicit delays and no retries,
+        optionally preceded by a configuration command. Used by latency
+        calibration.
 
-            time.sleep(0.01)
+        Returns:
+            int: Transaction status code.
+        """
+        with self._lock:
+            if command is not None:
+                try:
+                    self.bus.i2c_rdwr(self._write_msg(self.address, command))
+                except Exception:
+                    self.last_status = STATUS_IO_ERROR
+                    return STATUS_IO_ERROR
+                time.sleep(command_delay)
+            self.last_status = self._transact(read_delay)
+            return self.last_status
 
-            self.bus.i2c_rdwr(read)
-            data = list(read)
+    def _read_frame(self, read_delay, request=True):
+        status = self._transact(read_delay, request)
 
-            if data[0] == 0x59 and data[1] == 0x59:
-                checksum = sum(data[:8]) & 0xFF
-                if checksum != data[8]:
-                    log("WARN", "LIDAR", "Checksum mismatch")
-                    return False
+        # A calibrated delay can be marginal, retry with the worst-case one
+        retries = self.max_retries
+        while status >= STATUS_BAD_HEADER and retries > 0:
+            status = self._transact(TRIGGER_READ_DELAY, request)
+            retries -= 1
 
-                self.distance = data[2] | (data[3] << 8)
-                self.strength = data[4] | (data[5] << 8)
+        self.last_status = status
+        if status == STATUS_IO_ERROR:
+            log("ERROR", "LIDAR", f"Read error: {self._last_error}")
+            return False
+        if status == STATUS_BAD_HEADER:
+            log("WARN", "LIDAR", f"Invalid frame header: {hex(self._frame[0])}")
+            return False
+        if status == STATUS_BAD_CHECKSUM:
+            log("WARN", "LIDAR", "Checksum mismatch")
+            return False
+        return True
 
-                temp_raw = data[6] | (data[7] << 8)
-                self.temperature = (temp_raw / 8.0) - 256
+    def _transact(self, read_delay, request=True):
+        # Without a request the sensor answers with its latest output frame
+        try:
+            if request:
+                self.bus.i2c_rdwr(self._request_msg)
+                time.sleep(read_delay)
+            self.bus.i2c_rdwr(self._read_msg)
+        except Exception as e:
+            self._last_error = e
+            return STATUS_IO_ERROR
 
-                return True
-            else:
-                log("WARN", "LIDAR", f"Invalid frame header: {hex(data[0])}")
-                return False
+        timestamp = time.monotonic()
+        if self.frame_listener is not None:
+            self.frame_listener(self, bytes(self._frame), timestamp)
+        return self._parse_frame(timestamp)
 
-        except Exception as e:
-            log("ERROR", "LIDAR", f"Read error: {e}")
-            return False
+    def _parse_frame(self, timestamp):
+        frame = self._frame
+        if frame[0] != FRAME_HEADER or frame[1] != FRAME_HEADER:
+            return STATUS_BAD_HEADER
+
+        if sum(self._checksummed) & 0xFF != frame[8]:
+            return STATUS_BAD_CHECKSUM
+
+        _, _, distance, strength, temp_raw, _ = FRAME_STRUCT.unpack_from(frame)
+        temperature = (temp_raw / 8.0) - 256
+        status = _DIST_STATUS.get(distance, STATUS_OK)
+
+        self.distance = distance
+        self.strength = strength
+        self.temperature = temperature
+        self.sample = LidarSample(distance, strength, temperature, timestamp, status)
+        return status
 
     def get_data(self):
         """Returns the last valid reading."""
-        return {
-            "distance": self.distance,
-            "strength": self.strength,
-            "temperature": round(self.temperature, 2),
-        }
+        return self.sample
+
+    def reopen(self):
+        """
+        Closes and reopens the I2C bus after persistent failures, then
+        restores streaming if it was active. Raises if the bus cannot be
+        opened.
+        """
+        self.mode = None
+        with self._lock:
+            try:
+                self.bus.close()
+            except Exception:
+                pass
+            self.bus = self._open_bus()
+
+        if self.streaming:
+            self.start_streaming(self.frame_rate)
 
     def close(self):
         self.bus.close()
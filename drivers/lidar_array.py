@@ -0,0 +1,143 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.logger import log
+
+DEFAULT_ARRAY_PATH = os.getenv("LIDAR_ARRAY", "lidar_array.json")
+
+# Sensors that steer an axis look to one side of the boresight, given by
+# the sign of their mounting offset on that axis; range sensors only
+# contribute to detection.
+ROLE_ELEVATION = "elevation"
+ROLE_AZIMUTH = "azimuth"
+ROLE_RANGE = "range"
+ROLES = (ROLE_ELEVATION, ROLE_AZIMUTH, ROLE_RANGE)
+
+
+@dataclass(frozen=True)
+class SensorConfig:
+    """
+    One LIDAR of the array.
+
+    Offsets are the beam direction relative to the station pointing in
+    degrees, with elevation positive upwards.
+    """
+
+    bus_id: int
+    address: int = 0x10
+    az_offset: float = 0.0
+    el_offset: float = 0.0
+    role: str = ROLE_RANGE
+
+    def __post_init__(self) -> None:
+        if self.role not in ROLES:
+            raise ValueError(f"Unknown sensor role {self.role!r}")
+        if self.role == ROLE_ELEVATION and self.el_offset == 0:
+            raise ValueError(
+                f"Elevation sensor on bus {self.bus_id} needs an el_offset"
+            )
+        if self.role == ROLE_AZIMUTH and self.az_offset == 0:
+            raise ValueError(f"Azimuth sensor on bus {self.bus_id} needs an az_offset")
+
+
+# Sensor 1 looks above sensor 2, sensor 3 left of sensor 4
+DEFAULT_SENSORS: Tuple[SensorConfig, ...] = (
+    SensorConfig(bus_id=1, el_offset=1.5, role=ROLE_ELEVATION),
+    SensorConfig(bus_id=3, el_offset=-1.5, role=ROLE_ELEVATION),
+    SensorConfig(bus_id=4, az_offset=-1.5, role=ROLE_AZIMUTH),
+    SensorConfig(bus_id=5, az_offset=1.5, role=ROLE_AZIMUTH),
+)
+
+
+class SensorArray:
+    """
+    Layout of the LIDAR array as vectors indexed like the sensors, so
+    readings of any number of sensors are processed with masks.
+    """
+
+    def __init__(self, sensors: Sequence[SensorConfig] = DEFAULT_SENSORS) -> None:
+        """
+        Args:
+            sensors (Sequence[SensorConfig]): Sensors in acquisition order.
+
+        Raises:
+            ValueError: If there are no sensors or two share a bus address.
+        """
+        if not sensors:
+            raise ValueError("A sensor array needs at least one sensor")
+        keys = [(s.bus_id, s.address) for s in sensors]
+        if len(set(keys)) != len(keys):
+            raise ValueError(f"Duplicate sensor bus addresses in {keys}")
+
+        self.sensors: Tuple[SensorConfig, ...] = tuple(sensors)
+        self.az_offsets: NDArray[np.float64] = np.array(
+            [s.az_offset for s in sensors], dtype=np.float64
+        )
+        self.el_offsets: NDArray[np.float64] = np.array(
+            [s.el_offset for s in sensors], dtype=np.float64
+        )
+        self.roles: NDArray[np.str_] = np.array([s.role for s in sensors])
+
+    def __len__(self) -> int:
+        return len(self.sensors)
+
+    def mask(self, role: str) -> NDArray[np.bool_]:
+        return self.roles == role
+
+    def indices(self, role: str) -> Tuple[int, ...]:
+        return tuple(np.flatnonzero(self.mask(role)).tolist())
+
+    def sides(self, role: str) -> NDArray[np.float64]:
+        """
+        Returns -1 or +1 per sensor for the side of the boresight it looks
+        to on the axis of role (below/left is -1), 0 for other sensors.
+        """
+        offsets = self.el_offsets if role == ROLE_ELEVATION else self.az_offsets
+        return np.sign(offsets) * self.mask(role)
+
+    def offset(self, weights: NDArray[np.float64]) -> Tuple[float, float]:
+        """
+        Mean (az, el) mounting offset weighted per sensor, e.g. by the
+        confidence of its detection; (0, 0) when all weights are zero.
+        """
+        total = float(np.sum(weights))
+        if total <= 0:
+            return 0.0, 0.0
+        return (
+            float(np.dot(weights, self.az_offsets) / total),
+            float(np.dot(weights, self.el_offsets) / total),
+        )
+
+
+def load_array(path: str = DEFAULT_ARRAY_PATH) -> Tuple[SensorConfig, ...]:
+    """
+    Reads the sensor layout from a JSON list of SensorConfig fields.
+
+    Returns:
+        Tuple[SensorConfig, ...]: Configured sensors, DEFAULT_SENSORS if
+        the file is missing or unusable.
+    """
+    if not os.path.exists(path):
+        return DEFAULT_SENSORS
+
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+        sensors = tuple(SensorConfig(**entry) for entry in entries)
+        SensorArray(sensors)
+    except (OSError, ValueError, TypeError) as e:
+        log("WARN", "LIDAR ARRAY", f"Could not read {path}: {e}")
+        return DEFAULT_SENSORS
+    return sensors
+
+
+def save_array(sensors: Iterable[SensorConfig], path: str = DEFAULT_ARRAY_PATH) -> None:
+    entries = [asdict(s) for s in sensors]
+    with open(path, "w") as f:
+        json.dump(entries, f, indent=2)
+    log("INFO", "LIDAR ARRAY", f"Saved {len(entries)} sensor(s) to {path}")
@@ -0,0 +1,151 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from drivers.lidar import COMMAND_DELAY, STATUS_BAD_HEADER, TRIGGER_READ_DELAY, Lidar
+from utils.logger import log
+
+DEFAULT_PROFILE_PATH = os.getenv("LIDAR_PROFILES", "lidar_profiles.json")
+
+READ_DELAY_CANDIDATES = (0.0, 0.0005, 0.001, 0.002, 0.003, 0.005, 0.0075, 0.01)
+COMMAND_DELAY_CANDIDATES = (0.005, 0.01, 0.02, 0.05, 0.1)
+
+
+@dataclass
+class LatencyProfile:
+    bus_id: int
+    address: int
+    read_delay: float = TRIGGER_READ_DELAY
+    command_delay: float = COMMAND_DELAY
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return (self.bus_id, self.address)
+
+
+def _shortest_valid_delay(
+    lidar: Lidar,
+    candidates: Sequence[float],
+    trials: int,
+    command: Optional[list] = None,
+) -> Optional[float]:
+    for delay in sorted(candidates):
+        for _ in range(trials):
+            if command is None:
+                status = lidar.probe(read_delay=delay)
+            else:
+                status = lidar.probe(
+                    read_delay=lidar.read_delay, command=command, command_delay=delay
+                )
+            if status >= STATUS_BAD_HEADER:
+                break
+        else:
+            return delay
+    return None
+
+
+def calibrate(
+    lidar: Lidar,
+    trials: int = 50,
+    margin: float = 1.5,
+    read_candidates: Sequence[float] = READ_DELAY_CANDIDATES,
+    command_candidates: Sequence[float] = COMMAND_DELAY_CANDIDATES,
+) -> LatencyProfile:
+    """
+    Measures the shortest delays for which every one of `trials`
+    transactions returns a valid frame with a good checksum.
+
+    Args:
+        lidar (Lidar): Sensor to calibrate, in trigger-then-poll mode.
+        trials (int): Consecutive valid frames required per candidate.
+        margin (float): Safety factor applied to the measured delays.
+
+    Returns:
+        LatencyProfile: Calibrated delays, or the worst-case defaults for
+        a delay that never produced valid frames.
+    """
+    profile = LatencyProfile(bus_id=lidar.bus_id, address=lidar.address)
+
+    read_delay = _shortest_valid_delay(lidar, read_candidates, trials)
+    if read_delay is None:
+        log("WARN", "CALIBRATION", f"Bus {lidar.bus_id}: no valid read delay found")
+    else:
+        profile.read_delay = min(read_delay * margin, TRIGGER_READ_DELAY)
+        lidar.read_delay = profile.read_delay
+
+    # Re-sending the current frame rate is harmless and exercises the
+    # sensor's command handling
+    command = lidar._frame_rate_cmd(lidar.frame_rate)
+    command_delay = _shortest_valid_delay(
+        lidar, command_candidates, max(1, trials // 5), command=command
+    )
+    if command_delay is None:
+        log("WARN", "CALIBRATION", f"Bus {lidar.bus_id}: no valid command delay found")
+    else:
+        profile.command_delay = min(command_delay * margin, COMMAND_DELAY)
+
+    log(
+        "INFO",
+        "CALIBRATION",
+        f"Bus {lidar.bus_id}: read delay {profile.read_delay * 1000:.2f} ms, "
+        f"command delay {profile.command_delay * 1000:.1f} ms",
+    )
+    return profile
+
+
+def load_profiles(
+    path: str = DEFAULT_PROFILE_PATH,
+) -> Dict[Tuple[int, int], LatencyProfile]:
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+        profiles = [LatencyProfile(**entry) for entry in entries]
+    except (OSError, ValueError, TypeError, KeyError) as e:
+        log("WARN", "CALIBRATION", f"Could not read {path}: {e}")
+        return {}
+
+    return {p.key: p for p in profiles}
+
+
+def save_profiles(
+    profiles: Iterable[LatencyProfile], path: str = DEFAULT_PROFILE_PATH
+) -> None:
+    merged = load_profiles(path)
+    merged.update({p.key: p for p in profiles})
+
+    with open(path, "w") as f:
+        json.dump([asdict(p) for p in merged.values()], f, indent=2)
+    log("INFO", "CALIBRATION", f"Saved {len(merged)} profile(s) to {path}")
+
+
+def apply_profiles(lidars: Iterable[Lidar], path: str = DEFAULT_PROFILE_PATH) -> int:
+    """
+    Applies stored profiles to matching sensors.
+
+    Returns:
+        int: Number of sensors that received a profile.
+    """
+    profiles = load_profiles(path)
+    applied = 0
+    for lidar in lidars:
+        profile = profiles.get((lidar.bus_id, lidar.address))
+        if profile is not None:
+            lidar.apply_profile(profile)
+            applied += 1
+    return applied
+
+
+if __name__ == "__main__":
+    buses = (1, 3, 4, 5)
+    results = []
+    for bus_id in buses:
+        lidar = Lidar(bus_id=bus_id, address=0x10)
+        try:
+            results.append(calibrate(lidar))
+        finally:
+            lidar.close()
+    save_profiles(results)
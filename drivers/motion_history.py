@@ -0,0 +1,97 @@
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+class MotionHistory:
+    """
+    Timeline of one axis: (monotonic time, angle) points in a ring buffer.
+
+    The angle between points is linearly interpolated, so the pointing at
+    the acquisition time of any recent sample can be looked up. Points are
+    appended in time order; a point earlier than the newest ones replaces
+    them, which lets a planned move be recorded ahead and cut short when
+    the axis is retargeted.
+    """
+
+    def __init__(self, capacity: int = 4096, angle: float = 0.0) -> None:
+        """
+        Args:
+            capacity (int): Points kept before the oldest is overwritten.
+            angle (float): Angle reported before anything is recorded.
+        """
+        self.capacity: int = capacity
+        self._time = np.zeros(capacity, dtype=np.float64)
+        self._angle = np.zeros(capacity, dtype=np.float64)
+        self._initial: float = angle
+
+        self._head: int = 0
+        self._count: int = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _truncate(self, t: float) -> None:
+        # Drops planned points later than t (lock held)
+        while self._count and self._time[(self._head - 1) % self.capacity] > t:
+            self._head = (self._head - 1) % self.capacity
+            self._count -= 1
+
+    def record(self, t: float, angle: float) -> None:
+        """Adds the angle at time t, replacing any points after t."""
+        with self._lock:
+            self._truncate(t)
+            i = self._head
+            self._time[i] = t
+            self._angle[i] = angle
+            self._head = (i + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, times: ArrayLike, angles: ArrayLike) -> None:
+        """Adds a run of points in time order, e.g. every step of a batch."""
+        times = np.asarray(times, dtype=np.float64)[-self.capacity :]
+        angles = np.asarray(angles, dtype=np.float64)[-self.capacity :]
+        if times.size == 0:
+            return
+        with self._lock:
+            self._truncate(times[0])
+            idx = (self._head + np.arange(times.size)) % self.capacity
+            self._time[idx] = times
+            self._angle[idx] = angles
+            self._head = (self._head + times.size) % self.capacity
+            self._count = min(self._count + times.size, self.capacity)
+
+    def window(self) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Returns copies of (time, angle) in chronological order."""
+        with self._lock:
+            idx = (self._head - self._count + np.arange(self._count)) % self.capacity
+            return self._time[idx], self._angle[idx]
+
+    def angle_at(self, t: ArrayLike) -> NDArray[np.float64]:
+        """
+        Interpolates the angle at one or more monotonic times.
+
+        Times before the oldest point get its angle, times after the
+        newest one hold the last angle.
+
+        Args:
+            t: Monotonic time or array of times in seconds.
+
+        Returns:
+            Angle in degrees, shaped like t.
+        """
+        times, angles = self.window()
+        if times.size == 0:
+            return np.full(np.shape(t), self._initial)
+        return np.interp(t, times, angles)
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        """Returns the newest (time, angle) point, None when empty."""
+        with self._lock:
+            if not self._count:
+                return None
+            i = (self._head - 1) % self.capacity
+            return float(self._time[i]), float(self._angle[i])
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Resolution of the numerically integrated acceleration ramps
+RAMP_SAMPLES = 512
+
+# Bisection steps when a move is too short to reach full speed
+PEAK_SEARCH_ITERATIONS = 40
+
+
+@dataclass(frozen=True)
+class MotionLimits:
+    """
+    Kinematic limits of a move, in steps and seconds.
+
+    Without a jerk limit moves follow a trapezoidal velocity profile,
+    with one an S-curve.
+    """
+
+    max_speed: float
+    accel: float
+    jerk: Optional[float] = None
+    start_speed: float = 0.0
+
+    def scaled(self, factor: float) -> "MotionLimits":
+        """Converts limits given per unit (e.g. degree) into steps."""
+        return MotionLimits(
+            self.max_speed * factor,
+            self.accel * factor,
+            None if self.jerk is None else self.jerk * factor,
+            self.start_speed * factor,
+        )
+
+
+def _cumtrapz(y: NDArray[np.float64], x: NDArray[np.float64]) -> NDArray[np.float64]:
+    out = np.zeros_like(y)
+    out[1:] = np.cumsum((y[1:] + y[:-1]) * np.diff(x) / 2)
+    return out
+
+
+def _ramp(
+    v0: float, v1: float, accel: float, jerk: Optional[float]
+) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """
+    Accelerates from v0 to v1.
+
+    Returns:
+        Tuple: Sample times and distance covered at each of them.
+    """
+    dv = v1 - v0
+    if dv <= 0:
+        return np.zeros(1), np.zeros(1)
+
+    if jerk is None:
+        t = np.linspace(0.0, dv / accel, RAMP_SAMPLES)
+        v = v0 + accel * t
+    else:
+        # Jerk-limited rise and fall of the acceleration, with a constant
+        # acceleration phase in between when dv is large enough
+        t_jerk = min(accel / jerk, np.sqrt(dv / jerk))
+        a_peak = jerk * t_jerk
+        t_total = 2 * t_jerk + (dv - a_peak * t_jerk) / a_peak
+        t = np.linspace(0.0, t_total, RAMP_SAMPLES)
+        a = np.minimum(np.minimum(jerk * t, a_peak), jerk * (t_total - t))
+        v = v0 + _cumtrapz(a, t)
+
+    return t, _cumtrapz(v, t)
+
+
+def _accel_phase(
+    steps: int, limits: MotionLimits
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], float]:
+    """Finds the fastest symmetric ramp that fits into `steps`."""
+    v0 = min(limits.start_speed, limits.max_speed)
+    t, s = _ramp(v0, limits.max_speed, limits.accel, limits.jerk)
+    if 2 * s[-1] <= steps:
+        return t, s, limits.max_speed
+
+    low, high = v0, limits.max_speed
+    for _ in range(PEAK_SEARCH_ITERATIONS):
+        peak = (low + high) / 2
+        t, s = _ramp(v0, peak, limits.accel, limits.jerk)
+        if 2 * s[-1] <= steps:
+            low = peak
+        else:
+            high = peak
+    t, s = _ramp(v0, low, limits.accel, limits.jerk)
+    return t, s, low
+
+
+@lru_cache(maxsize=256)
+def plan_periods(steps: int, limits: MotionLimits) -> NDArray[np.float64]:
+    """
+    Computes the period of every step of a move from rest to rest.
+
+    Profiles are cached by step count and limits, the returned array is
+    read-only.
+
+    Args:
+        steps (int): Number of steps of the move.
+        limits (MotionLimits): Speed, acceleration and jerk limits.
+
+    Returns:
+        NDArray: Seconds from each step pulse to the next.
+    """
+    if steps <= 0:
+        periods = np.zeros(0)
+        periods.setflags(write=False)
+        return periods
+
+    t_ramp, s_ramp, peak = _accel_phase(steps, limits)
+    ramp_time, ramp_dist = t_ramp[-1], s_ramp[-1]
+    cruise_time = (steps - 2 * ramp_dist) / peak if peak > 0 else 0.0
+    total_time = 2 * ramp_time + cruise_time
+
+    # Time at which the move reaches each step position
+    position = np.arange(1, steps + 1, dtype=np.float64)
+    accel = np.interp(position, s_ramp, t_ramp)
+    cruise = ramp_time + (position - ramp_dist) / peak
+    decel = total_time - np.interp(steps - position, s_ramp, t_ramp)
+    times = np.where(
+        position <= ramp_dist,
+        accel,
+        np.where(position >= steps - ramp_dist, decel, cruise),
+    )
+
+    periods = np.diff(times, prepend=0.0)
+    periods.setflags(write=False)
+    return periods
+
+
+def move_duration(steps: int, limits: MotionLimits) -> float:
+    """Returns the duration of a planned move in seconds."""
+    return float(plan_periods(steps, limits).sum())
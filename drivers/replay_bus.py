@@ -0,0 +1,116 @@
+import ctypes
+import time
+from typing import Optional, Tuple
+
+from drivers.frame_log import FrameLog
+from utils.logger import log
+
+
+class ReplayBus:
+    """
+    Stand-in for smbus2.SMBus that answers a Lidar's reads with the raw
+    frames recorded for one bus, in order.
+
+    Writes (data requests and commands) are accepted and ignored. By
+    default frames are served as fast as they are requested; with
+    realtime=True the recorded spacing is reproduced, scaled by speed.
+    """
+
+    def __init__(
+        self,
+        log_file: FrameLog,
+        bus_id: int,
+        loop: bool = False,
+        realtime: bool = False,
+        speed: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            log_file (FrameLog): Recorded session.
+            bus_id (int): Bus whose frames are replayed.
+            loop (bool): Start over when the recording is exhausted.
+            realtime (bool): Pace reads like the original session.
+            speed (float): Playback speed factor when realtime is set.
+        """
+        self.bus_id: int = bus_id
+        self.loop: bool = loop
+        self.realtime: bool = realtime
+        self.speed: float = speed
+
+        self._log = log_file
+        self._indices = log_file.indices_for(bus_id)
+        self._position: int = 0
+        self._started_at: Optional[float] = None
+        self._first_timestamp: float = 0.0
+
+        if len(self._indices) == 0:
+            log("WARN", "REPLAY", f"No frames recorded for bus {bus_id}")
+
+    @property
+    def exhausted(self) -> bool:
+        return self._position >= len(self._indices) and not self.loop
+
+    def pointing(self) -> Tuple[float, float]:
+        """Commanded (az, el) of the frame served last."""
+        if self._position == 0:
+            return 0.0, 0.0
+        record = self._log[
+            int(self._indices[(self._position - 1) % len(self._indices)])
+        ]
+        return record.az, record.el
+
+    def _next_record(self):
+        if self._position >= len(self._indices):
+            if not self.loop or len(self._indices) == 0:
+                raise OSError(f"Replay of bus {self.bus_id} exhausted")
+            self._position = 0
+            self._started_at = None
+
+        record = self._log[int(self._indices[self._position])]
+        self._position += 1
+
+        if self.realtime:
+            now = time.monotonic()
+            if self._started_at is None:
+                self._started_at = now
+                self._first_timestamp = record.timestamp
+            due = (
+                self._started_at
+                + (record.timestamp - self._first_timestamp) / self.speed
+            )
+            if due > now:
+                time.sleep(due - now)
+
+        return record
+
+    def i2c_rdwr(self, *msgs) -> None:
+        for msg in msgs:
+            if msg.flags & 0x0001:  # I2C_M_RD
+                frame = self._next_record().frame
+                ctypes.memmove(msg.buf, frame, min(msg.len, len(frame)))
+
+    def close(self) -> None:
+        pass
+
+
+if __name__ == "__main__":
+    import sys
+
+    from drivers.lidar import Lidar
+
+    # Replays a recorded session as fast as possible and reports throughput
+    frames = FrameLog(sys.argv[1])
+    for bus_id in frames.bus_ids():
+        lidar = Lidar(bus_id=bus_id, bus=ReplayBus(frames, bus_id))
+        lidar.read_delay = 0.0
+        good = total = 0
+        start = time.perf_counter()
+        while not lidar.bus.exhausted:
+            good += lidar.update()
+            total += 1
+        elapsed = time.perf_counter() - start
+        print(
+            f"Bus {bus_id}: {good}/{total} good frames, "
+            f"{total / max(elapsed, 1e-9):.0f} frames/s"
+        )
+    frames.close()
@@ -0,0 +1,171 @@
+import json
+import os
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import log
+
+DEFAULT_CALIBRATION_PATH = os.getenv("SERVO_CALIBRATION", "servo_calibration.json")
+
+# Pulse widths commanded during calibration, microseconds
+CALIBRATION_PULSES = tuple(range(500, 2501, 100))
+
+# Angular spacing of the lookup table entries, degrees
+LUT_RESOLUTION = 0.1
+
+# Pulse widths pigpio accepts for a servo, microseconds
+MIN_PULSE_US = 500.0
+MAX_PULSE_US = 2500.0
+
+
+class PulseTable:
+    """
+    Dense angle to pulse width table over 0–180°.
+
+    Built once from measured (angle, pulse) pairs; lookups interpolate
+    linearly between the two neighbouring entries. Angles beyond the
+    measured range follow the slope of the outermost pairs, clipped to the
+    pulse widths the servo accepts.
+    """
+
+    def __init__(
+        self,
+        points: Sequence[Tuple[float, float]],
+        resolution: float = LUT_RESOLUTION,
+        min_us: float = MIN_PULSE_US,
+        max_us: float = MAX_PULSE_US,
+    ) -> None:
+        """
+        Args:
+            points (Sequence[Tuple[float, float]]): Measured angle in
+                degrees and the pulse width in microseconds producing it.
+            resolution (float): Angle between table entries in degrees.
+            min_us (float): Shortest pulse width the table may command.
+            max_us (float): Longest pulse width the table may command.
+
+        Raises:
+            ValueError: If fewer than two points are given, the measured
+                angles do not increase with the pulse width or a measured
+                pulse width lies outside [min_us, max_us]
+        """
+        pairs = np.array(sorted(points, key=lambda p: p[1]), dtype=float)
+        if len(pairs) < 2:
+            raise ValueError("At least two calibration points are required")
+        angles, pulses = pairs[:, 0], pairs[:, 1]
+        if np.any(np.diff(angles) <= 0):
+            raise ValueError("Measured angles must increase with the pulse width")
+        if pulses[0] < min_us or pulses[-1] > max_us:
+            raise ValueError(
+                f"Measured pulse widths {pulses[0]:.0f}-{pulses[-1]:.0f} us "
+                f"exceed the servo range {min_us:.0f}-{max_us:.0f} us"
+            )
+
+        self.points: List[Tuple[float, float]] = [tuple(p) for p in pairs.tolist()]
+        self.resolution: float = resolution
+        self.__scale: float = 1.0 / resolution
+
+        grid = np.arange(0.0, 180.0 + resolution / 2, resolution)
+        table = np.interp(grid, angles, pulses)
+
+        # np.interp holds the end values, extend the end segments instead
+        low_slope = (pulses[1] - pulses[0]) / (angles[1] - angles[0])
+        high_slope = (pulses[-1] - pulses[-2]) / (angles[-1] - angles[-2])
+        below, above = grid < angles[0], grid > angles[-1]
+        table[below] = pulses[0] + (grid[below] - angles[0]) * low_slope
+        table[above] = pulses[-1] + (grid[above] - angles[-1]) * high_slope
+        # pigpio refuses widths outside the servo range
+        np.clip(table, min_us, max_us, out=table)
+
+        # Python floats index faster than NumPy scalars one at a time
+        self.__table: List[float] = table.tolist()
+        self.__last: int = len(self.__table) - 1
+
+    def pulse_width(self, angle: float) -> float:
+        """
+        Args:
+            angle (float): Servo angle within 0–180°.
+
+        Returns:
+            float: Interpolated pulse width in microseconds
+        """
+        position = angle * self.__scale
+        index = min(int(position), self.__last - 1)
+        low = self.__table[index]
+        return low + (position - index) * (self.__table[index + 1] - low)
+
+
+def load_calibration(
+    path: str = DEFAULT_CALIBRATION_PATH,
+    min_us: float = MIN_PULSE_US,
+    max_us: float = MAX_PULSE_US,
+) -> Optional[PulseTable]:
+    """
+    Builds the lookup table from a calibration file, limited to pulse
+    widths within [min_us, max_us].
+
+    Returns:
+        PulseTable: Table of the stored points, None if there is no usable
+        calibration.
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+        points = [(e["angle"], e["pulse_us"]) for e in entries]
+        return PulseTable(points, min_us=min_us, max_us=max_us)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log("WARN", "CALIBRATION", f"Could not read {path}: {e}")
+        return None
+
+
+def save_calibration(
+    points: Iterable[Tuple[float, float]], path: str = DEFAULT_CALIBRATION_PATH
+) -> None:
+    entries = [{"angle": angle, "pulse_us": pulse} for angle, pulse in points]
+    with open(path, "w") as f:
+        json.dump(entries, f, indent=2)
+    log("INFO", "CALIBRATION", f"Saved {len(entries)} servo point(s) to {path}")
+
+
+def record_points(
+    pi, pin: int = 18, pulses: Sequence[float] = CALIBRATION_PULSES
+) -> List[Tuple[float, float]]:
+    """
+    Steps the servo through `pulses` and asks for the angle measured at
+    each one, e.g. with an inclinometer on the LIDAR mount. An empty
+    answer skips the pulse.
+
+    Args:
+        pi (pigpio.pi): Connection to the pigpio daemon.
+        pin (int): GPIO pin of the servo.
+        pulses (Sequence[float]): Pulse widths to measure, microseconds.
+
+    Returns:
+        List[Tuple[float, float]]: Measured angle and pulse width pairs.
+    """
+    points = []
+    for pulse in pulses:
+        pi.set_servo_pulsewidth(pin, pulse)
+        answer = input(f"{pulse:.0f} us -> measured angle (°, empty to skip): ")
+        if answer.strip():
+            points.append((float(answer), float(pulse)))
+    pi.set_servo_pulsewidth(pin, 0)
+    return points
+
+
+if __name__ == "__main__":
+    import pigpio
+
+    pi = pigpio.pi()
+    if not pi.connected:
+        raise RuntimeError("Could not connect to pigpio daemon")
+    try:
+        points = record_points(pi)
+    finally:
+        pi.stop()
+    # Refuses inconsistent measurements before they are stored
+    PulseTable(points)
+    save_calibration(points)
@@ -1,19 +1,44 @@
-import pigpio
+import threading
 import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, List, Optional
+from drivers.backends import open_pwm
+from drivers.motion_history import MotionHistory
+from drivers.servo_calibration import (
+    DEFAULT_CALIBRATION_PATH,
+    PulseTable,
+    load_calibration,
+)
 from utils.logger import log
 
+if TYPE_CHECKING:
+    import pigpio
+
+# Interval between pulse width updates of a smooth move, one 50 Hz frame
+UPDATE_PERIOD = 0.02
+
+# Slack on the expected duration of a move before waiting for it gives up
+ARRIVAL_MARGIN = 1.0
+
 
 class Servo:
     """
     Class for controlling a standard PWM servo using pigpio.
 
+    Moves run in a background thread: set_angle() returns at once with a
+    future that completes when the servo is expected to have arrived, and
+    get_angle() estimates the position from the time elapsed and the
+    configured speed.
+
     Attributes:
         __pi: Connection to the pigpio daemon
         __pin: GPIO pin connected to the servo
         __min_us: Minimum PWM pulse width in microseconds
         __max_us: Maximum PWM pulse width in microseconds
         __speed: Maximum servo speed in degrees per second
-        __current_angle: Current angle of the servo
+        __table: Calibrated angle to pulse table, None for a linear mapping
+        __current_angle: Angle at the start of the current move
+        __target_angle: Angle the current move ends at
     """
 
     def __init__(
@@ -23,20 +48,29 @@ class Servo:
         min_us: float = 500,
         max_us: float = 2500,
         speed: int = 500,
+        update_period: float = UPDATE_PERIOD,
+        pi: Optional["pigpio.pi"] = None,
+        calibration: Optional[str] = DEFAULT_CALIBRATION_PATH,
     ) -> None:
         """
-        Initializes the servo object.
+        Initializes the servo object and waits for the initial move.
         Args:
             angle (float): Initial servo angle (0–180°)
             pin (int): GPIO pin for controlling the servo (default 18)
             min_us (float): Minimum PWM pulse width in microseconds
             max_us (float): Maximum PWM pulse width in microseconds
             speed (int): Maximum servo speed (degrees/second)
+            update_period (float): Seconds between pulse updates of a
+                smooth move
+            pi (pigpio.pi): Existing pigpio connection, a new one by default
+            calibration (str): Calibration file of measured angle/pulse
+                pairs, None or a missing file for the linear mapping
         Raises:
-            RuntimeError: If unable to connect to the pigpio daemon
+            RuntimeError: If unable to connect to the pigpio daemon or the
+                initial move fails
         """
 
-        self.__pi = pigpio.pi()
+        self.__pi = pi if pi is not None else open_pwm()
         if not self.__pi.connected:
             raise RuntimeError("Could not connect to pigpio daemon")
 
@@ -44,13 +78,47 @@ class Servo:
         self.__min_us: float = min_us
         self.__max_us: float = max_us
         self.__speed: int = speed
+        self.__update_period: float = update_period
+
+        self.__table: Optional[PulseTable] = None
+        if calibration is not None:
+            self.__table = load_calibration(calibration, min_us, max_us)
+        if self.__table is not None:
+            log(
+                "INFO",
+                "SERVO",
+                f"Using {len(self.__table.points)}-point calibration",
+            )
+
+        # Current move, linear from __current_angle at __start_time
         self.__current_angle: float = 0.0
+        self.__target_angle: float = 0.0
+        self.__start_time: float = time.monotonic()
+        self.__duration: float = 0.0
+        self.__smooth: bool = False
+        self.__moving: bool = False
+        self.__futures: List[Future] = []
+        # Start and end of every move, for pointing lookups
+        self.__history = MotionHistory()
+
+        self.__cond = threading.Condition()
+        self.__running: bool = True
+        self.__thread = threading.Thread(
+            target=self.__run, name="ServoTrajectory", daemon=True
+        )
+        self.__thread.start()
 
-        self.set_angle(angle)
+        arrived = self.set_angle(angle)
+        try:
+            arrived.result(timeout=self.__duration + ARRIVAL_MARGIN)
+        except Exception as e:
+            self.__shutdown()
+            raise RuntimeError(f"Servo could not reach {angle}°: {e!r}") from e
 
     def __angle_to_pwm(self, angle: float) -> float:
         """
-        Converts a servo angle (0–180°) to a PWM pulse width.
+        Converts a servo angle (0–180°) to a PWM pulse width, from the
+        calibration table when there is one.
 
         Args:
             angle (float): Target angle
@@ -64,6 +132,9 @@ class Servo:
         if angle < 0.0 or angle > 180.0:
             raise ValueError("Angle out of bounds")
 
+        if self.__table is not None:
+            return self.__table.pulse_width(angle)
+
         # Linear mapping: 0° -> min_us, 180° -> max_us
         pwm = self.__min_us + (self.__max_us - self.__min_us) * (angle / 180)
         return pwm
@@ -85,90 +156,220 @@ class Servo:
             raise ValueError(f"Angle {angle} out of bounds (0–180°)")
         return angle
 
-    def set_angle(self, angle: float, smooth: bool = True) -> None:
-        """
-        Moves the servo to a specific angle, waiting the required
-        physical time according to the servo's maximum speed.
+    def __estimate(self, now: float) -> float:
+        """Angle reached at `now` on the current move (lock held)."""
+        if self.__duration <= 0.0:
+            return self.__target_angle
+        progress = min(1.0, max(0.0, (now - self.__start_time) / self.__duration))
+        return self.__current_angle + progress * (
+            self.__target_angle - self.__current_angle
+        )
 
-        Args:
-            angle (float): Target angle (0–180°)
+    def set_angle(
+        self, angle: float, smooth: bool = True, speed: Optional[float] = None
+    ) -> Future:
         """
-        angle = self.__clamp_angle(angle)
+        Starts a move to a specific angle and returns immediately.
 
-        if smooth:
-            self.move_smooth(angle)
-        else:
-            # Convert angle to PWM signal
-            pwm = self.__angle_to_pwm(angle)
-            self.__pi.set_servo_pulsewidth(self.__pin, pwm)
+        A move in progress is retargeted from its estimated position. The
+        returned future resolves to the final angle once the servo is
+        expected to be there; futures of superseded moves resolve with
+        the move that replaced them.
 
-            # Calculate physical movement time
-            delta_angle = abs(angle - self.__current_angle)
-            time.sleep(delta_angle / self.__speed)  # Wait for servo to reach position
+        Args:
+            angle (float): Target angle (0–180°)
+            smooth (bool): Ramp the pulse width at the servo's speed
+                instead of jumping to the target pulse at once
+            speed (float): Speed of this move in degrees/second, at most
+                the servo's maximum speed
 
-            # Update current angle
-            self.__current_angle = angle
+        Returns:
+            Future: Completes when the move has taken its physical time
 
-    def rotate(self, delta: float) -> None:
+        Raises:
+            ValueError: If the angle is out of bounds
+        """
+        angle = self.__clamp_angle(angle)
+        future: Future = Future()
+
+        with self.__cond:
+            now = time.monotonic()
+            start = self.__estimate(now)
+            self.__current_angle = start
+            self.__target_angle = angle
+            self.__start_time = now
+            rate = self.__speed if speed is None else min(speed, self.__speed)
+            self.__duration = abs(angle - start) / rate
+            self.__history.record(now, start)
+            self.__history.record(now + self.__duration, angle)
+            self.__smooth = smooth
+            self.__moving = True
+            self.__futures.append(future)
+            if not smooth:
+                pwm = self.__angle_to_pwm(angle)
+                self.__pi.set_servo_pulsewidth(self.__pin, pwm)
+            self.__cond.notify()
+        return future
+
+    def rotate(self, delta: float) -> Future:
         """
-        Rotates the servo relative to its current position.
+        Rotates the servo relative to its commanded position.
 
         Args:
             delta (float): Change in angle (can be positive or negative)
+
+        Returns:
+            Future: Completes when the move has taken its physical time
         """
-        self.set_angle(self.__current_angle + delta)
+        with self.__cond:
+            target = self.__target_angle
+        return self.set_angle(target + delta)
 
     def get_angle(self) -> float:
         """
-        Returns the current angle of the servo.
+        Returns the estimated current angle of the servo.
 
         Returns:
-            float: Current servo angle
+            float: Servo angle interpolated along the current move
         """
-        return self.__current_angle
+        with self.__cond:
+            return self.__estimate(time.monotonic())
 
-    def move_smooth(self, target: float, step: float = 5.0) -> None:
-        """
-        Smoothly moves the servo to a target angle using incremental steps.
+    @property
+    def history(self) -> MotionHistory:
+        """Estimated angle over time, see MotionHistory.angle_at()."""
+        return self.__history
 
-        Args:
-            target (float): Target angle (0–180°)
-            step (float): Angle step per iteration (degrees)
-        """
+    @property
+    def speed(self) -> float:
+        """Maximum servo speed in degrees/second."""
+        return self.__speed
 
-        target = self.__clamp_angle(target)
-        current = self.__current_angle
+    def get_target(self) -> float:
+        """
+        Returns the angle of the last command.
 
-        if target == current:
-            return
+        Returns:
+            float: Commanded servo angle
+        """
+        with self.__cond:
+            return self.__target_angle
 
-        direction = 1.0 if target > current else -1.0
-        step *= direction
+    @property
+    def done(self) -> bool:
+        """True when no move is in progress."""
+        with self.__cond:
+            return not self.__moving
 
-        delay = abs(step) / self.__speed  # seconds per step
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the current move has finished.
 
-        angle = current
+        Args:
+            timeout (float): Seconds to wait at most, no limit by default
 
-        while (angle - target) * direction < 0:
-            angle += step
+        Returns:
+            bool: True once finished, False on timeout
+        """
+        with self.__cond:
+            return self.__cond.wait_for(lambda: not self.__moving, timeout)
 
-            # clamp final step
-            if (angle - target) * direction > 0:
-                angle = target
+    def move_smooth(self, target: float) -> Future:
+        """
+        Smoothly moves the servo to a target angle at its maximum speed.
 
-            pwm = self.__angle_to_pwm(angle)
-            self.__pi.set_servo_pulsewidth(self.__pin, pwm)
-            time.sleep(delay)
+        Args:
+            target (float): Target angle (0–180°)
 
-        self.__current_angle = target
+        Returns:
+            Future: Completes when the move has taken its physical time
+        """
+        return self.set_angle(target, smooth=True)
+
+    def __abandon(self, now: float) -> List[Future]:
+        """Ends the current move where it is estimated to be (lock held)."""
+        angle = self.__estimate(now)
+        self.__current_angle = self.__target_angle = angle
+        self.__duration = 0.0
+        self.__history.record(now, angle)
+        self.__moving = False
+        finished, self.__futures = self.__futures, []
+        self.__cond.notify_all()
+        return finished
+
+    def __run(self) -> None:
+        """Trajectory thread: ramps pulse widths and completes moves."""
+        while True:
+            error: Optional[Exception] = None
+            with self.__cond:
+                while self.__running and not self.__moving:
+                    self.__cond.wait()
+                if not self.__running:
+                    return
+
+                now = time.monotonic()
+                angle = self.__estimate(now)
+                remaining = self.__start_time + self.__duration - now
+                finished: List[Future] = []
+                try:
+                    if self.__smooth:
+                        pwm = self.__angle_to_pwm(angle)
+                        self.__pi.set_servo_pulsewidth(self.__pin, pwm)
+                except Exception as e:
+                    # The thread keeps serving later moves, this one fails
+                    error = e
+                    finished = self.__abandon(now)
+                    remaining = 0.0
+                else:
+                    if remaining <= 0.0:
+                        self.__moving = False
+                        finished, self.__futures = self.__futures, []
+                        self.__cond.notify_all()
+
+            if error is not None:
+                log("ERROR", "SERVO", f"Pulse update failed: {error}")
+            for future in finished:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(angle)
+
+            if remaining > 0.0:
+                # Wakes early when a new command arrives
+                with self.__cond:
+                    self.__cond.wait(min(remaining, self.__update_period))
 
     def stop(self) -> None:
         """
         Stops the servo by setting PWM width to 0 (turns off servo pulse).
+
+        A move in progress is abandoned where it is estimated to be and its
+        futures resolve to that angle.
         """
-        self.__pi.set_servo_pulsewidth(self.__pin, 0)
+        with self.__cond:
+            finished = self.__abandon(time.monotonic())
+            angle = self.__target_angle
+
+        try:
+            self.__pi.set_servo_pulsewidth(self.__pin, 0)
+        finally:
+            for future in finished:
+                future.set_result(angle)
         log(
             "INFO",
             "SERVO",
             f"Disabled motor",
         )
+
+    def close(self) -> None:
+        """
+        Stops the servo and ends the trajectory thread.
+        """
+        self.stop()
+        self.__shutdown()
+
+    def __shutdown(self) -> None:
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify_all()
+        self.__thread.join()
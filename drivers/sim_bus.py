@@ -0,0 +1,208 @@
+import ctypes
+import errno
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from drivers.lidar import DIST_WEAK_SIGNAL, FRAME_HEADER, FRAME_SIZE, FRAME_STRUCT
+from drivers.lidar_array import DEFAULT_SENSORS
+
+# Beam direction of each sensor relative to the station pointing, by I2C
+# bus: (azimuth, elevation) in degrees, as in the default array layout
+MOUNT_OFFSETS: Dict[int, Tuple[float, float]] = {
+    s.bus_id: (s.az_offset, s.el_offset) for s in DEFAULT_SENSORS
+}
+
+# TFmini-S field of view is 2 degrees
+BEAM_HALF_ANGLE = 1.0
+
+# Raw temperature word for 25 °C (temp / 8 - 256)
+TEMP_RAW_25C = 2248
+
+
+@dataclass
+class Scene:
+    """
+    A single point target moving at constant angular and radial rates,
+    seen by sensors with Gaussian range noise, dropped transactions and a
+    bus latency.
+
+    Angles are in degrees, with elevation in the servo convention where
+    90 is level. Ranges are in metres and times in seconds on the scene
+    clock.
+    """
+
+    target_az: float = 0.0
+    target_el: float = 90.0
+    target_range: float = 0.15
+    az_rate: float = 0.0
+    el_rate: float = 0.0
+    range_rate: float = 0.0
+    beam_half_angle: float = BEAM_HALF_ANGLE
+    noise_std: float = 0.002
+    strength: int = 1200
+    background_range: Optional[float] = None
+    background_strength: int = 300
+    dropout_rate: float = 0.0
+    corrupt_rate: float = 0.0
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    seed: Optional[int] = None
+    clock: Callable[[], float] = time.monotonic
+
+    def __post_init__(self) -> None:
+        self.az: float = 0.0
+        self.el: float = 90.0
+        self.rng = np.random.default_rng(self.seed)
+        self._t0: float = self.clock()
+        self._lock = threading.Lock()
+
+    def point(self, az: float, el: float) -> None:
+        """Sets the simulated station pointing."""
+        self.az, self.el = az, el
+
+    def pointing(self) -> Tuple[float, float]:
+        return self.az, self.el
+
+    def target_at(self, t: Optional[float] = None) -> Tuple[float, float, float]:
+        """Returns the target (az, el, range) at scene time t."""
+        dt = (self.clock() if t is None else t) - self._t0
+        return (
+            self.target_az + self.az_rate * dt,
+            self.target_el + self.el_rate * dt,
+            self.target_range + self.range_rate * dt,
+        )
+
+    def draw(self) -> Tuple[float, float, float, float]:
+        """
+        Draws the random parts of one transaction.
+
+        Returns:
+            Tuple: (dropout, corrupt, noise, latency) draws.
+        """
+        with self._lock:
+            u_drop, u_corrupt = self.rng.random(2)
+            noise = self.rng.normal(0.0, self.noise_std) if self.noise_std else 0.0
+            jitter = self.rng.random() * self.latency_jitter
+        return u_drop, u_corrupt, noise, self.latency + jitter
+
+
+def angular_separation(az1: float, el1: float, az2: float, el2: float) -> float:
+    """Great-circle angle in degrees between two servo-frame directions."""
+    a1, e1, a2, e2 = map(math.radians, (az1, el1 - 90.0, az2, el2 - 90.0))
+    cos_sep = math.sin(e1) * math.sin(e2) + math.cos(e1) * math.cos(e2) * math.cos(
+        a1 - a2
+    )
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos_sep))))
+
+
+def encode_frame(distance: int, strength: int, temp_raw: int = TEMP_RAW_25C) -> bytes:
+    """Builds a TFmini-S output frame with a valid checksum."""
+    body = FRAME_STRUCT.pack(
+        FRAME_HEADER, FRAME_HEADER, distance & 0xFFFF, strength & 0xFFFF, temp_raw, 0
+    )[:-1]
+    return body + bytes([sum(body) & 0xFF])
+
+
+class SimulatedBus:
+    """
+    Stand-in for smbus2.SMBus that answers a Lidar's reads with frames
+    computed from a Scene and the current simulated pointing.
+
+    Writes are accepted and ignored; every read renders a fresh frame. A
+    dropout raises OSError like a NACKed transaction on a real bus.
+    """
+
+    def __init__(
+        self,
+        scene: Scene,
+        bus_id: int,
+        offset: Optional[Tuple[float, float]] = None,
+        pointing: Optional[Callable[[], Tuple[float, float]]] = None,
+    ) -> None:
+        """
+        Args:
+            scene (Scene): Simulated world shared by all sensors.
+            bus_id (int): I2C bus the sensor sits on.
+            offset (Tuple[float, float]): Beam (az, el) offset in degrees,
+                MOUNT_OFFSETS of the bus by default.
+            pointing (Callable): Returns the station (az, el), the scene
+                pointing by default.
+        """
+        self.scene: Scene = scene
+        self.bus_id: int = bus_id
+        self.offset: Tuple[float, float] = (
+            offset if offset is not None else MOUNT_OFFSETS.get(bus_id, (0.0, 0.0))
+        )
+        self.pointing: Callable[[], Tuple[float, float]] = (
+            pointing if pointing is not None else scene.pointing
+        )
+        self.reads: int = 0
+        self.writes: int = 0
+
+    def render(self) -> bytes:
+        """Renders the frame the sensor would output right now."""
+        scene = self.scene
+        u_drop, u_corrupt, noise, latency = scene.draw()
+        if latency > 0:
+            time.sleep(latency)
+        if u_drop < scene.dropout_rate:
+            raise OSError(errno.EREMOTEIO, "Simulated I2C dropout")
+
+        az, el = self.pointing()
+        target_az, target_el, target_range = scene.target_at()
+        separation = angular_separation(
+            az + self.offset[0], el + self.offset[1], target_az, target_el
+        )
+
+        if separation <= scene.beam_half_angle:
+            distance = round(max(0.0, target_range + noise) * 100)
+            frame = encode_frame(distance, scene.strength)
+        elif scene.background_range is not None:
+            distance = round(max(0.0, scene.background_range + noise) * 100)
+            frame = encode_frame(distance, scene.background_strength)
+        else:
+            frame = encode_frame(DIST_WEAK_SIGNAL, 0)
+
+        if u_corrupt < scene.corrupt_rate:
+            frame = frame[:-1] + bytes([(frame[-1] + 1) & 0xFF])
+        return frame
+
+    def i2c_rdwr(self, *msgs) -> None:
+        for msg in msgs:
+            if msg.flags & 0x0001:  # I2C_M_RD
+                frame = self.render()
+                ctypes.memmove(msg.buf, frame, min(msg.len, FRAME_SIZE))
+                self.reads += 1
+            else:
+                self.writes += 1
+
+    def close(self) -> None:
+        pass
+
+
+def sim_bus_factory(scene: Scene) -> Callable[[int], SimulatedBus]:
+    """Returns a bus factory for LMSStation that simulates every bus."""
+    return lambda bus_id: SimulatedBus(scene, bus_id)
+
+
+if __name__ == "__main__":
+    from drivers.lidar import Lidar
+
+    # Driver and parser throughput without bus delays
+    scene = Scene(target_az=0.0, target_el=91.5, seed=0)
+    lidar = Lidar(bus_id=1, bus=SimulatedBus(scene, 1))
+    lidar.read_delay = 0.0
+
+    n = 20000
+    start = time.perf_counter()
+    good = sum(lidar.update() for _ in range(n))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{n} transactions in {elapsed:.3f}s: {n / elapsed:.0f}/s, "
+        f"{elapsed / n * 1e6:.1f} us each, {good} good frames"
+    )
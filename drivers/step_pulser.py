@@ -0,0 +1,209 @@
+import time
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import log
+
+if TYPE_CHECKING:
+    import pigpio
+
+# Shortest step period the A4988 and pigpio handle reliably
+MIN_PERIOD_US = 4
+
+# Upper bound on pulses held by the waves of one transmission; pigpio
+# shares roughly 12000 pulses between all waves
+MAX_WAVE_PULSES = 10000
+
+# Steps of irregular timing packed into one wave
+CHUNK_STEPS = 1000
+
+# Largest repeat count of a single wave chain loop
+MAX_LOOP_COUNT = 65535
+
+# Wave chains hold about 600 entries
+MAX_CHAIN_LENGTH = 500
+
+# Polling interval of wait()
+BUSY_POLL = 0.001
+
+
+def _runs(periods: np.ndarray) -> List[Tuple[int, int]]:
+    """Run-length encodes step periods into (period, count) pairs."""
+    if periods.size == 0:
+        return []
+    edges = np.flatnonzero(np.diff(periods)) + 1
+    starts = np.concatenate(([0], edges))
+    counts = np.diff(np.concatenate((starts, [periods.size])))
+    return [(int(periods[s]), int(c)) for s, c in zip(starts, counts)]
+
+
+class WavePulser:
+    """
+    Generates step pulse trains as DMA-timed pigpio waveforms.
+
+    A train is described by its step periods in microseconds. Runs of
+    equal periods are sent as one single-step wave repeated by a chain
+    loop, irregular stretches such as acceleration ramps as packed
+    waves. Once started, the pulses are timed by the pigpio daemon and
+    the calling thread is free.
+    """
+
+    def __init__(self, step_pin: int, pi: Optional["pigpio.pi"] = None) -> None:
+        """
+        Args:
+            step_pin (int): BCM pin of the STEP signal.
+            pi (pigpio.pi): Existing daemon connection, a new one by default.
+
+        Raises:
+            RuntimeError: If unable to connect to the pigpio daemon
+        """
+        # Imported here so the module loads on machines without pigpio
+        import pigpio
+
+        self.__pigpio = pigpio
+        self.__pi = pi if pi is not None else pigpio.pi()
+        if not self.__pi.connected:
+            raise RuntimeError("Could not connect to pigpio daemon")
+
+        self.step_pin: int = step_pin
+        self.__mask: int = 1 << step_pin
+        self.__waves: List[int] = []
+        self.__edges_us: np.ndarray = np.zeros(0)
+        self.__started_at: float = 0.0
+
+        self.__pi.set_mode(step_pin, pigpio.OUTPUT)
+        self.__pi.write(step_pin, 0)
+
+    def __step_wave(self, periods: Sequence[int]) -> int:
+        pulses = []
+        for period in periods:
+            high = period // 2
+            pulses.append(self.__pigpio.pulse(self.__mask, 0, high))
+            pulses.append(self.__pigpio.pulse(0, self.__mask, period - high))
+        self.__pi.wave_add_generic(pulses)
+        wave_id = self.__pi.wave_create()
+        if wave_id < 0:
+            raise RuntimeError(f"pigpio could not create a step wave ({wave_id})")
+        self.__waves.append(wave_id)
+        return wave_id
+
+    def __build_chain(self, periods: np.ndarray) -> List[int]:
+        chain: List[int] = []
+        irregular: List[int] = []
+        pulses = 0
+
+        def flush() -> None:
+            for i in range(0, len(irregular), CHUNK_STEPS):
+                chain.append(self.__step_wave(irregular[i : i + CHUNK_STEPS]))
+            irregular.clear()
+
+        for period, count in _runs(periods):
+            if count == 1:
+                irregular.append(period)
+                pulses += 2
+            else:
+                flush()
+                wave_id = self.__step_wave((period,))
+                pulses += 2
+                while count > 0:
+                    loops = min(count, MAX_LOOP_COUNT)
+                    chain += [255, 0, wave_id, 255, 1, loops & 0xFF, loops >> 8]
+                    count -= loops
+            if pulses > MAX_WAVE_PULSES:
+                raise ValueError(
+                    f"Step train needs more than {MAX_WAVE_PULSES} distinct pulses"
+                )
+        flush()
+
+        if len(chain) > MAX_CHAIN_LENGTH:
+            raise ValueError(f"Step train needs {len(chain)} chain entries")
+        return chain
+
+    def start(self, periods_us: Sequence[float]) -> None:
+        """
+        Starts transmitting one pulse per entry of periods_us.
+
+        Args:
+            periods_us (Sequence[float]): Step periods in microseconds.
+
+        Raises:
+            RuntimeError: If a train is still running or pigpio fails
+            ValueError: If the train does not fit pigpio's wave memory
+        """
+        if self.busy():
+            raise RuntimeError("A step train is already running")
+        self.__release()
+
+        periods = np.maximum(np.rint(periods_us), MIN_PERIOD_US).astype(np.int64)
+        # An empty train emits nothing, not the steps of the previous one
+        self.__edges_us = np.zeros(0)
+        if periods.size == 0:
+            return
+
+        try:
+            chain = self.__build_chain(periods)
+        except Exception:
+            self.__release()
+            raise
+
+        # Falling edges, in microseconds after the start, count the steps made
+        self.__edges_us = np.cumsum(periods) - (periods - periods // 2)
+        self.__started_at = time.monotonic()
+        status = self.__pi.wave_chain(chain)
+        if status != 0:
+            self.__release()
+            raise RuntimeError(f"pigpio rejected the step chain ({status})")
+
+    def start_constant(self, steps: int, delay: float) -> None:
+        """Starts `steps` pulses with `delay` seconds per pulse state."""
+        self.start(np.full(steps, 2 * delay * 1e6))
+
+    def busy(self) -> bool:
+        return bool(self.__pi.wave_tx_busy())
+
+    def steps_done(self) -> int:
+        """Steps emitted so far by the current train, from its schedule."""
+        if not self.busy():
+            return int(self.__edges_us.size)
+        elapsed_us = (time.monotonic() - self.__started_at) * 1e6
+        return int(np.searchsorted(self.__edges_us, elapsed_us, side="right"))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the current train has been sent.
+
+        Returns:
+            bool: True if finished, False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.busy():
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(BUSY_POLL)
+        self.__release()
+        return True
+
+    def stop(self) -> int:
+        """
+        Aborts the current train.
+
+        Returns:
+            int: Steps emitted before the abort.
+        """
+        done = self.steps_done()
+        self.__pi.wave_tx_stop()
+        self.__pi.write(self.step_pin, 0)
+        self.__release()
+        log("INFO", "PULSER", f"Step train stopped after {done} steps")
+        return done
+
+    def __release(self) -> None:
+        for wave_id in self.__waves:
+            self.__pi.wave_delete(wave_id)
+        self.__waves.clear()
+
+    def close(self) -> None:
+        if self.busy():
+            self.stop()
+        self.__release()
@@ -1,5 +1,7 @@
-import RPi.GPIO as GPIO
+import math
 import time
+from drivers.gpio_backend import HIGH, LOW, open_backend
+from drivers.step_pulser import WavePulser
 from utils.logger import log
 
 SAFE_MICROSTEP = 1
@@ -16,6 +18,8 @@ class StepperMotor:
         motor_steps_per_rev=200,
         start_pos=0,
         microstep=1,
+        hardware_timing=False,
+        gpio_backend=None,
     ):
         """
         Initializes GPIO pins and sets the initial microstepping resolution.
@@ -29,6 +33,10 @@ class StepperMotor:
             motor_steps_per_rev (int): Native steps of the motor.
             start_pos (int): Initial step count for tracking.
             microstep (int): Desired microstepping divisor (1, 2, 4, or 8).
+            hardware_timing (bool): Generate step pulses as pigpio DMA
+                waveforms instead of toggling the pin from Python.
+            gpio_backend (str): GPIO library driving the pins: "rpi"
+                (default), "gpiod" or "lgpio".
         """
 
         self.step_pin = step_pin
@@ -42,19 +50,26 @@ class StepperMotor:
         self.steps_per_rev = motor_steps_per_rev
 
         self.position = start_pos
+        # Fraction of a step at the current microstep that the position
+        # could not express after switching to a coarser one
+        self._remainder = 0.0
         self.direction = True
         self.enabled = False
 
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.step_pin, GPIO.OUT)
-        GPIO.setup(self.dir_pin, GPIO.OUT)
-        GPIO.setup(self.ms1_pin, GPIO.OUT)
-        GPIO.setup(self.ms2_pin, GPIO.OUT)
-        GPIO.setup(self.sleep_pin, GPIO.OUT)
+        self.pulser = None
+        self._train_active = False
+        self._train_direction = True
 
-        GPIO.output(self.sleep_pin, GPIO.LOW)
+        self.gpio = open_backend(
+            (step_pin, dir_pin, sleep_pin, ms1_pin, ms2_pin), gpio_backend
+        )
+
+        self.gpio.write(self.sleep_pin, LOW)
         self.set_microstepping_state(microstep)
 
+        if hardware_timing:
+            self.pulser = WavePulser(self.step_pin)
+
         log(
             "INFO",
             "STEPPER",
@@ -64,8 +79,10 @@ class StepperMotor:
     def set_microstepping_state(self, state):
         """
         Configures the A4988 MS1 and MS2 pins for a specific resolution.
-        Updates the internal steps_per_rev to ensure position tracking
-        remains accurate relative to the new step size.
+        Updates the internal steps_per_rev and rescales position to ensure
+        position tracking remains accurate relative to the new step size.
+        Sub-step positions lost by a coarser step are carried over and
+        restored when switching back.
 
         Args:
             state (int): The microstepping divisor.
@@ -80,9 +97,13 @@ class StepperMotor:
                 f"Invalid microstep state: {state} → fallback to {SAFE_MICROSTEP}",
             )
             state = SAFE_MICROSTEP
+        self.wait()
         ms1_val, ms2_val = microstepping_states[state]
-        GPIO.output(self.ms1_pin, ms1_val)
-        GPIO.output(self.ms2_pin, ms2_val)
+        self.gpio.write_many({self.ms1_pin: ms1_val, self.ms2_pin: ms2_val})
+        if self.microstep in microstepping_states:
+            exact = (self.position + self._remainder) * state / self.microstep
+            self.position = math.floor(exact)
+            self._remainder = exact - self.position
         self.steps_per_rev = self.motor_steps_per_rev * state
         self.microstep = state
 
@@ -92,14 +113,14 @@ class StepperMotor:
         so it stops being in sleep mode.
         Required before calling step().
         """
-        GPIO.output(self.sleep_pin, GPIO.HIGH)
+        self.gpio.write(self.sleep_pin, HIGH)
         self.enabled = True
 
     def disable(self):
         """
         De-energizes the motor coils to save power and prevent overheating.
         """
-        GPIO.output(self.sleep_pin, GPIO.LOW)
+        self.gpio.write(self.sleep_pin, LOW)
         self.enabled = False
         log(
             "INFO",
@@ -114,7 +135,8 @@ class StepperMotor:
         Args:
             clockwise (bool): True for CW rotation, False for CCW.
         """
-        GPIO.output(self.dir_pin, GPIO.HIGH if clockwise else GPIO.LOW)
+        self.wait()
+        self.gpio.write(self.dir_pin, HIGH if clockwise else LOW)
         self.direction = clockwise
 
     def step(self, steps=1, delay=0.01):
@@ -122,31 +144,127 @@ class StepperMotor:
         Generates a series of PWM pulses to move the motor.
 
         Updates the 'position' attribute based on the number of pulses
-        and the current direction.
+        and the current direction. With hardware timing the pulses are
+        sent as a pigpio waveform and the call returns once it is done.
 
         Args:
             steps (int): Number of steps to move.
             delay (float): Seconds between pulse states (controls speed).
         """
+        if self.pulser is not None:
+            self.step_async(steps, delay)
+            self.wait()
+            return
+
+        write, step_pin = self.gpio.write, self.step_pin
         for _ in range(steps):
-            GPIO.output(self.step_pin, GPIO.HIGH)
+            write(step_pin, HIGH)
             time.sleep(delay)
-            GPIO.output(self.step_pin, GPIO.LOW)
+            write(step_pin, LOW)
             time.sleep(delay)
 
-            if self.direction:
-                self.position = (self.position + 1) % self.steps_per_rev
-            else:
-                self.position = (self.position - 1) % self.steps_per_rev
+            self._advance(1, self.direction)
+
+    def step_periods(self, periods):
+        """
+        Moves one step per entry of periods, e.g. a planned acceleration
+        profile.
+
+        Args:
+            periods (Sequence[float]): Seconds from each step to the next.
+        """
+        if self.pulser is not None:
+            self.step_async(periods=[p * 1e6 for p in periods])
+            self.wait()
+            return
+
+        write, step_pin = self.gpio.write, self.step_pin
+        for period in periods:
+            write(step_pin, HIGH)
+            time.sleep(period / 2)
+            write(step_pin, LOW)
+            time.sleep(period / 2)
+
+            self._advance(1, self.direction)
+
+    def step_async(self, steps=1, delay=0.01, periods=None):
+        """
+        Starts a hardware-timed step train and returns immediately.
+
+        The position is brought up to date by wait() or stop().
+
+        Args:
+            steps (int): Number of steps to move.
+            delay (float): Seconds between pulse states (controls speed).
+            periods (Sequence[float]): Individual step periods in
+                microseconds, overrides steps and delay.
+
+        Raises:
+            RuntimeError: If the motor was created without hardware timing
+        """
+        if self.pulser is None:
+            raise RuntimeError("step_async() requires hardware_timing=True")
+
+        self.wait()
+        if periods is not None:
+            self.pulser.start(periods)
+        else:
+            self.pulser.start_constant(steps, delay)
+        self._train_active = True
+        self._train_direction = self.direction
+
+    @property
+    def busy(self):
+        return self._train_active and self.pulser.busy()
+
+    def wait(self, timeout=None):
+        """
+        Blocks until a running step train is done and accounts its steps.
+
+        Args:
+            timeout (float): Maximum wait in seconds, unlimited by default.
+
+        Returns:
+            bool: True if no train is running anymore, False on timeout.
+        """
+        if not self._train_active:
+            return True
+        if not self.pulser.wait(timeout):
+            return False
+        self._train_active = False
+        self._advance(self.pulser.steps_done(), self._train_direction)
+        return True
+
+    def stop(self):
+        """
+        Aborts a running step train.
+
+        Returns:
+            int: Steps made by the aborted train.
+        """
+        if not self._train_active:
+            return 0
+        done = self.pulser.stop()
+        self._train_active = False
+        self._advance(done, self._train_direction)
+        return done
+
+    def _advance(self, steps, clockwise):
+        if clockwise:
+            self.position = (self.position + steps) % self.steps_per_rev
+        else:
+            self.position = (self.position - steps) % self.steps_per_rev
 
     def cleanup(self):
         """
         Resets GPIO pins to a safe state and releases control.
         Should be called during system shutdown.
         """
-        GPIO.output(self.step_pin, GPIO.LOW)
-        GPIO.output(self.sleep_pin, GPIO.LOW)
-        GPIO.cleanup([self.step_pin, self.dir_pin])
+        if self.pulser is not None:
+            self.stop()
+            self.pulser.close()
+        self.gpio.write_many({self.step_pin: LOW, self.sleep_pin: LOW})
+        self.gpio.release()
         log(
             "INFO",
             "STEPPER",
@@ -14,6 +14,10 @@ from mqtt import load_config, StationMqttClient, StationController
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--mock", action="store_true")
+    parser.add_argument("--sim", action="store_true",
+                        help="locate and track a target on a simulated station")
+    parser.add_argument("--sim-duration", type=float, default=30.0,
+                        help="seconds of simulated tracking")
     parser.add_argument("--log-level", default="INFO",
                         choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     args = parser.parse_args()
@@ -23,6 +27,10 @@ def main() -> None:
         format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
     )
 
+    if args.sim:
+        _run_sim(args.sim_duration)
+        return
+
     config = load_config()
 
     if args.mock:
@@ -51,6 +59,54 @@ def _run_mock(config) -> None:
         client.disconnect()
 
 
+def _run_sim(duration: float) -> None:
+    import threading
+    from core.station     import LMSStation
+    from drivers.backends import SIMULATION
+    from drivers.sim_bus  import Scene
+    from modes.locate     import locate_target
+    from modes.tracking   import track_object
+
+    log   = logging.getLogger("sim")
+    # Inside the scan window, drifting slowly to the right; a target a few
+    # centimetres across is seen 2 degrees off a beam at 15 cm
+    scene = Scene(target_az=12.0, target_el=41.5, az_rate=0.5,
+                  beam_half_angle=2.0, seed=0)
+    # Calibration files of a real station do not apply to the simulation
+    station = LMSStation(backends=SIMULATION, scene=scene, lidar_profiles=None,
+                         servo_calibration=None, lidar_array=None)
+    stop    = threading.Event()
+
+    try:
+        station.enable()
+        found = locate_target(station, az_min=-30.0, az_max=30.0,
+                              el_min=30.0, el_max=40.0, sweep_speed=20.0,
+                              stop_event=stop)
+        if found is None:
+            log.warning("Target not found")
+            return
+        target_az, target_el, _ = scene.target_at()
+        log.info("Found at az=%.2f el=%.2f, target at az=%.2f el=%.2f",
+                 found["az"], found["el"], target_az, target_el)
+
+        tracker = threading.Thread(target=track_object, args=(station, stop),
+                                   name="Tracking", daemon=True)
+        tracker.start()
+        deadline = time.monotonic() + duration
+        while tracker.is_alive() and time.monotonic() < deadline:
+            time.sleep(1.0)
+            az, el = station.pointing_at()
+            target_az, target_el, _ = scene.target_at()
+            log.info("Pointing az=%.2f el=%.2f, target at az=%.2f el=%.2f",
+                     az, el, target_az, target_el)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        station.disable()
+        station.cleanup()
+
+
 def _run_hardware(config) -> None:
     from core.station import LMSStation
     station = LMSStation()
@@ -1,5 +1,6 @@
 import time
 import math
+from itertools import groupby
 from typing import Optional, Dict, Iterator
 from utils.logger import log
 import threading
@@ -62,7 +63,19 @@ def locate_target(
     incremental_az_step: float = 2.0,
     servo_wait_timeout: float = 1.0,
     servo_tolerance_deg: float = 0.5,
+    sweep_speed: Optional[float] = None,
 ) -> Optional[dict]:
+    """
+    Scans the window row by row until a target is detected.
+
+    By default each row is stepped through with a dwell at every
+    incremental_az_step. With sweep_speed (deg/s) every row is instead
+    swept continuously; detections carry the pointing at their sample
+    time, and the station returns to that pointing once it has stopped.
+
+    Returns:
+        dict: Target found, see LMSStation.log_target_found(), or None.
+    """
 
     start_t = time.time()
     stop_event = stop_event or threading.Event()
@@ -71,29 +84,72 @@ def locate_target(
     el_min = max(el_min, station.el_min)
     el_max = min(el_max, station.el_max)
 
-    grid = scan_grid(az_min, az_max, az_step, el_min, el_max, el_step, serpentine=True)
+    station.set_lidar_mode("locate")
+
+    grid = list(
+        scan_grid(az_min, az_max, az_step, el_min, el_max, el_step, serpentine=True)
+    )
+    if not grid:
+        return None
 
-    for point in grid:
+    # Slew to the scan start with both axes at once; the scan itself only
+    # covers the requested window
+    slew = station.move_to(grid[0]["az"], grid[0]["el"], wait=False)
+    while not slew.wait(timeout=0.05):
         if stop_event.is_set() or (deadline and time.time() > deadline):
+            station.az_motion.stop()
             return None
 
-        target_az = point["az"]
-        target_el = point["el"]
-
-        station.move_elevation(
-            target_el, tolerance_deg=servo_tolerance_deg, timeout=servo_wait_timeout
-        )
-
-        found = station.move_azimuth_incremental(
-            target_az=target_az,
-            step=incremental_az_step,
-            dwell=dwell,
-            stop_event=stop_event,
-            timeout_deadline=deadline,
-            on_poll=lambda: station.detect_target() and station.distance > 0,
-        )
-
-        if found:
-            return station.log_target_found()
+    frames = station.hub.subscribe()
+
+    def target_seen() -> bool:
+        # Scores again only once a sensor has delivered a new frame
+        item = frames.get(timeout=0)
+        if item is None:
+            return False
+        return bool(station.detect_target(item))
+
+    try:
+        for target_el, row in groupby(grid, key=lambda point: point["el"]):
+            row = list(row)
+            if stop_event.is_set() or (deadline and time.time() > deadline):
+                return None
+
+            station.move_elevation(
+                target_el, tolerance_deg=servo_tolerance_deg, timeout=servo_wait_timeout
+            )
+
+            if sweep_speed is not None:
+                found = station.sweep_azimuth(
+                    target_az=row[-1]["az"],
+                    speed=sweep_speed,
+                    stop_event=stop_event,
+                    timeout_deadline=deadline,
+                    on_poll=target_seen,
+                )
+                if found:
+                    # The axes overran the detection while stopping
+                    state = station.state.get()
+                    station.move_to(state.az, state.el)
+                    return station.log_target_found()
+                continue
+
+            for point in row:
+                if stop_event.is_set() or (deadline and time.time() > deadline):
+                    return None
+
+                found = station.move_azimuth_incremental(
+                    target_az=point["az"],
+                    step=incremental_az_step,
+                    dwell=dwell,
+                    stop_event=stop_event,
+                    timeout_deadline=deadline,
+                    on_poll=target_seen,
+                )
+
+                if found:
+                    return station.log_target_found()
+    finally:
+        frames.close()
 
     return None
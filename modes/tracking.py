@@ -1,9 +1,52 @@
 import time
-from typing import Optional
+from typing import Optional, Tuple
 from utils.logger import log
 import threading
 
+import numpy as np
+from numpy.typing import NDArray
+
+from core.confidence import fuse
+from core.hub import Subscription
 from core.station import LMSStation
+from drivers.lidar_array import ROLE_AZIMUTH, ROLE_ELEVATION
+
+# Longest wait for a new frame before the readings are scored anyway
+SAMPLE_TIMEOUT = 0.1
+
+
+def is_valid_reading(
+    dist: float,
+    detection_threshold: float,
+    confidence: float = 1.0,
+    min_confidence: float = 0.0,
+) -> bool:
+    in_range = 0.01 < dist < detection_threshold
+    return in_range and confidence > 0 and confidence >= min_confidence
+
+
+def side_readings(
+    distances: NDArray[np.float64],
+    confidences: NDArray[np.float64],
+    sides: NDArray[np.float64],
+) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """
+    Collapses the sensors of one axis to the most confident reading on
+    each side of the boresight, see SensorArray.sides().
+
+    Returns:
+        ((dist, conf) below/left, (dist, conf) above/right), (0.0, 0.0)
+        for a side without sensors.
+    """
+    readings = []
+    for side in (-1, 1):
+        on_side = sides == side
+        if not on_side.any():
+            readings.append((0.0, 0.0))
+            continue
+        best = int(np.argmax(np.where(on_side, confidences, -np.inf)))
+        readings.append((float(distances[best]), float(confidences[best])))
+    return readings[0], readings[1]
 
 
 def compute_elevation_adjustment(
@@ -11,9 +54,16 @@ def compute_elevation_adjustment(
     lidar2_dist: float,
     detection_threshold: float,
     el_step: float,
+    lidar1_conf: float = 1.0,
+    lidar2_conf: float = 1.0,
+    min_confidence: float = 0.0,
 ):
-    lidar1_valid = 0.01 < lidar1_dist < detection_threshold
-    lidar2_valid = 0.01 < lidar2_dist < detection_threshold
+    lidar1_valid = is_valid_reading(
+        lidar1_dist, detection_threshold, lidar1_conf, min_confidence
+    )
+    lidar2_valid = is_valid_reading(
+        lidar2_dist, detection_threshold, lidar2_conf, min_confidence
+    )
 
     if lidar1_valid and lidar2_valid:
         return -el_step
@@ -25,9 +75,21 @@ def compute_elevation_adjustment(
         return None
 
 
-def compute_azimuth_adjustment(lidar1_dist, lidar2_dist, detection_threshold, az_step):
-    lidar1_valid = 0.01 < lidar1_dist < detection_threshold
-    lidar2_valid = 0.01 < lidar2_dist < detection_threshold
+def compute_azimuth_adjustment(
+    lidar1_dist,
+    lidar2_dist,
+    detection_threshold,
+    az_step,
+    lidar1_conf=1.0,
+    lidar2_conf=1.0,
+    min_confidence=0.0,
+):
+    lidar1_valid = is_valid_reading(
+        lidar1_dist, detection_threshold, lidar1_conf, min_confidence
+    )
+    lidar2_valid = is_valid_reading(
+        lidar2_dist, detection_threshold, lidar2_conf, min_confidence
+    )
 
     if lidar1_valid and lidar2_valid:
         return -az_step if lidar2_dist < lidar1_dist else az_step
@@ -52,8 +114,7 @@ def handle_miss(consecutive_misses: int, max_misses: int):
 
 def track_elevation(
     station: LMSStation,
-    lidar_lock: threading.Lock,
-    shared_data: dict,
+    samples: Subscription,
     stop_event: threading.Event,
     el_step: float = 7.0,
     lidar_detection_threshold: float = 0.3,
@@ -61,25 +122,40 @@ def track_elevation(
     consecutive_misses = 0
     max_misses = 20
 
+    el_mask = station.array.mask(ROLE_ELEVATION)
+    el_sides = station.array.sides(ROLE_ELEVATION)
+
     log("INFO", "ELEVATION TRACKING", "Elevation tracking thread started")
 
     while not stop_event.is_set():
-        with lidar_lock:
-            lidar1_dist, lidar2_dist, _, _ = station.read_lidars()
-            valid = [d for d in (lidar1_dist, lidar2_dist) if 0.01 < d < lidar_detection_threshold]
-            station.distance = sum(valid) / len(valid) if valid else 0.0
-            shared_data.update(
-                {
-                    "lidar1_dist": lidar1_dist,
-                    "lidar2_dist": lidar2_dist,
-                    "timestamp": time.time(),
-                }
-            )
+        # Paced by new frames of the elevation sensors, only those are
+        # scored; a timeout scores as no reading, which counts as a miss
+        item = samples.get(timeout=SAMPLE_TIMEOUT)
+        distances, confidences, sample_times = station.score_samples(
+            item, samples.sensors, max_range=lidar_detection_threshold
+        )
+        (lower_dist, lower_conf), (upper_dist, upper_conf) = side_readings(
+            distances, confidences, el_sides
+        )
+
+        # Published for telemetry, which reads the station state
+        detection = fuse(
+            distances[el_mask], confidences[el_mask], station.min_confidence
+        )
+        state = station.publish_state(
+            detection, distances, confidences, sample_times
+        )
 
-        current_el = station.elevation
+        current_el = state.el
 
         el_adjustment = compute_elevation_adjustment(
-            lidar1_dist, lidar2_dist, lidar_detection_threshold, el_step
+            upper_dist,
+            lower_dist,
+            lidar_detection_threshold,
+            el_step,
+            upper_conf,
+            lower_conf,
+            station.min_confidence,
         )
 
         if el_adjustment is None:
@@ -103,43 +179,54 @@ def track_elevation(
         log(
             "INFO",
             "ELEVATION TRACKING",
-            f"Move EL: {current_el:.2f}° → {target_el:.2f}° (L1={lidar1_dist:.3f}m, L2={lidar2_dist:.3f}m)",
+            f"Move EL: {current_el:.2f}° → {target_el:.2f}° "
+            f"(up={upper_dist:.3f}m, down={lower_dist:.3f}m)",
         )
 
-        station.move_elevation(target_el)
+        station.move_elevation(target_el, wait=False)
 
         time.sleep(0.05)
 
 
 def track_azimuth(
     station: LMSStation,
-    lidar_lock: threading.Lock,
-    shared_data: dict,
+    samples: Subscription,
     stop_event: threading.Event,
     az_step: float = 2.0,
     lidar_detection_threshold: float = 0.3,
+    az_rate: Optional[float] = None,
 ):
+    """
+    Keeps the target between the left and right azimuth sensors by
+    turning the azimuth axis.
+
+    With az_rate set, the axis is jogged continuously at that rate (deg/s)
+    towards the target instead of being moved in hops of az_step.
+    """
 
     log("INFO", "AZIMUTH TRACKING", "Azimuth tracking thread started")
+    jog_rate = 0.0
+    az_sides = station.array.sides(ROLE_AZIMUTH)
 
     while not stop_event.is_set():
-        with lidar_lock:
-            _, _, lidar3_dist, lidar4_dist = station.read_lidars()
-            shared_data.update(
-                {
-                    "lidar3_dist": lidar3_dist,
-                    "lidar4_dist": lidar4_dist,
-                    "timestamp": time.time(),
-                }
-            )
+        item = samples.get(timeout=SAMPLE_TIMEOUT)
+        distances, confidences, _ = station.score_samples(
+            item, samples.sensors, max_range=lidar_detection_threshold
+        )
+        (left_dist, left_conf), (right_dist, right_conf) = side_readings(
+            distances, confidences, az_sides
+        )
 
         az_before = station.azimuth
 
         az_adjustment = compute_azimuth_adjustment(
-            lidar3_dist,
-            lidar4_dist,
+            left_dist,
+            right_dist,
             lidar_detection_threshold,
             az_step,
+            left_conf,
+            right_conf,
+            station.min_confidence,
         )
         
         if station.elevation > 94 and az_adjustment is not None:
@@ -148,31 +235,50 @@ def track_azimuth(
         if az_adjustment != 0 and az_adjustment is not None:
             target_az = az_before + az_adjustment
 
-            lidar1_valid = 0.01 < lidar3_dist < lidar_detection_threshold
-            lidar2_valid = 0.01 < lidar4_dist < lidar_detection_threshold
+            if az_rate is not None:
+                rate = az_rate if az_adjustment > 0 else -az_rate
+                if rate != jog_rate:
+                    log(
+                        "INFO",
+                        "AZIMUTH TRACKING",
+                        f"Jog {rate:+.1f}°/s at az={az_before:.2f}°",
+                    )
+                    station.az_actuator.set_velocity(rate)
+                    jog_rate = rate
+                time.sleep(0.01)
+                continue
+
+            left_valid = is_valid_reading(
+                left_dist, lidar_detection_threshold, left_conf, station.min_confidence
+            )
 
             direction = "LEFT" if az_adjustment < 0 else "RIGHT"
-            active_lidar = "L1" if lidar1_valid else "L2"
+            active_side = "Left" if left_valid else "Right"
 
             log(
                 "INFO",
                 "AZIMUTH TRACKING",
-                f"{active_lidar} only → {direction}: BEFORE move az={az_before:.2f}°, targeting {target_az:.2f}°",
+                f"{active_side} only → {direction}: BEFORE move az={az_before:.2f}°, targeting {target_az:.2f}°",
             )
 
-            station.az_actuator.move_to_angle(target_az, delay=0.0005)
+            # Non-blocking: the motion thread blends into the new target
+            station.az_motion.move_to(target_az)
 
             time.sleep(0.01)
 
-            az_after = station.azimuth
+            status = station.az_motion.status()
 
             log(
                 "INFO",
                 "AZIMUTH TRACKING",
-                f"AFTER move: az={az_after:.2f}° (expected {target_az:.2f}°, actually moved {az_after - az_before:.2f}°)",
+                f"Moving: az={status.angle:.2f}° at {status.velocity:.1f}°/s "
+                f"(target {status.target:.2f}°)",
             )
 
         else:
+            if jog_rate != 0.0:
+                station.az_actuator.set_velocity(0.0)
+                jog_rate = 0.0
             log(
                 "DEBUG",
                 "AZIMUTH TRACKING",
@@ -187,19 +293,22 @@ def track_object(
     el_step: float = 2.0,
     az_step: float = 3.0,
     lidar_detection_threshold: float = 0.2,
+    az_rate: Optional[float] = None,
 ):
     if stop_event is None:
         stop_event = threading.Event()
 
-    lidar_lock = threading.Lock()
-    shared_data = {"lidar1_dist": 0.0, "lidar2_dist": 0.0, "timestamp": 0.0}
+    # Each axis is woken by the frames of its own sensors
+    el_samples = station.hub.subscribe(
+        sensors=station.array.indices(ROLE_ELEVATION)
+    )
+    az_samples = station.hub.subscribe(sensors=station.array.indices(ROLE_AZIMUTH))
 
     el_thread = threading.Thread(
         target=track_elevation,
         args=(
             station,
-            lidar_lock,
-            shared_data,
+            el_samples,
             stop_event,
             el_step,
             lidar_detection_threshold,
@@ -212,16 +321,18 @@ def track_object(
         target=track_azimuth,
         args=(
             station,
-            lidar_lock,
-            shared_data,
+            az_samples,
             stop_event,
             az_step,
             lidar_detection_threshold,
+            az_rate,
         ),
         name="AzimuthTracking",
         daemon=True,
     )
 
+    station.set_lidar_mode("tracking")
+
     log("INFO", "TRACKING", "Starting dual-axis tracking...")
 
     el_thread.start()
@@ -236,5 +347,10 @@ def track_object(
         stop_event.set()
         el_thread.join(timeout=2.0)
         az_thread.join(timeout=2.0)
+    finally:
+        el_samples.close()
+        az_samples.close()
+
+    station.az_motion.stop()
 
     log("INFO", "TRACKING", "Tracking stopped")
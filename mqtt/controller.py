@@ -40,11 +40,12 @@ class StationController:
         def _publish_loop() -> None:
             interval = 1.0 / self._publish_hz
             while not stop.is_set():
-                az   = self._station.azimuth
-                el   = self._station.elevation
-                dist = self._station.distance
-                if dist > 0:
-                    self.mqtt.publish_position(obj_id, az, el, dist)
+                # One snapshot, so az, el and range belong to the same instant
+                state = self._station.state.get()
+                if state.range_m > 0:
+                    self.mqtt.publish_position(
+                        obj_id, state.az, state.el, state.range_m
+                    )
                 time.sleep(interval)
 
         def _run() -> None:
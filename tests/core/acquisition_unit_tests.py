@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from core.acquisition import AcquisitionEngine
+from core.health import REOPEN_AFTER
+from drivers.lidar import EMPTY_SAMPLE, STATUS_IO_ERROR, STATUS_OK, LidarSample
+
+
+class FakeLidar:
+    def __init__(self, bus_id, distance, fail=False):
+        self.bus_id = bus_id
+        self.distance = distance
+        self.sample = EMPTY_SAMPLE
+        self.last_status = STATUS_OK
+        self.fail = fail
+        self.reopened = 0
+
+    def update(self):
+        time.sleep(0.01)
+        if self.fail:
+            self.last_status = STATUS_IO_ERROR
+            return False
+        self.last_status = STATUS_OK
+        self.sample = LidarSample(self.distance, 1000, 25.0, time.monotonic())
+        return True
+
+    def reopen(self):
+        self.reopened += 1
+        self.fail = False
+
+
+class BarrierLidar(FakeLidar):
+    """Only answers when all sensors sharing the barrier read at once."""
+
+    def __init__(self, bus_id, distance, barrier):
+        super().__init__(bus_id, distance)
+        self.barrier = barrier
+
+    def update(self):
+        try:
+            self.barrier.wait(timeout=2.0)
+        except threading.BrokenBarrierError:
+            self.last_status = STATUS_IO_ERROR
+            return False
+        return super().update()
+
+
+class TestAcquisitionEngine(unittest.TestCase):
+    def test_snapshot_before_start(self):
+        """Snapshot of a stopped engine returns empty samples"""
+        engine = AcquisitionEngine([FakeLidar(1, 10), FakeLidar(3, 20)])
+        self.assertEqual(engine.snapshot(), (EMPTY_SAMPLE, EMPTY_SAMPLE))
+
+    def test_snapshot_latest_per_bus(self):
+        """Each bus publishes its own timestamped reading"""
+        lidars = [FakeLidar(b, d) for b, d in ((1, 10), (3, 20), (4, 30), (5, 40))]
+        engine = AcquisitionEngine(lidars)
+        engine.start()
+        try:
+            self.assertTrue(engine.wait_ready(timeout=1.0))
+            snapshot = engine.snapshot()
+            self.assertEqual([s.distance for s in snapshot], [10, 20, 30, 40])
+            self.assertTrue(all(s.timestamp > 0 for s in snapshot))
+        finally:
+            engine.stop()
+        self.assertFalse(engine.running)
+
+    def test_samplers_fill_engine_histories(self):
+        """Background frames land in the histories used for scoring"""
+        engine = AcquisitionEngine([FakeLidar(1, 10), FakeLidar(3, 20)])
+        engine.start()
+        try:
+            self.assertTrue(engine.wait_ready(timeout=1.0))
+            time.sleep(0.05)
+        finally:
+            engine.stop()
+        self.assertTrue(all(len(h) > 0 for h in engine.histories))
+        self.assertAlmostEqual(engine.histories[1].summary()[0], 0.2)
+
+    def test_buses_sampled_concurrently(self):
+        """Aggregate rate scales with the number of buses"""
+        lidars = [FakeLidar(b, 10) for b in (1, 3, 4, 5)]
+        engine = AcquisitionEngine(lidars)
+        engine.start()
+        try:
+            time.sleep(0.3)
+            # Sequential reads would be capped near 100 frames/s in total.
+            self.assertGreater(engine.sample_rate(), 200)
+        finally:
+            engine.stop()
+
+    def test_failing_bus_does_not_block_others(self):
+        """A sensor that never answers keeps its empty sample"""
+        lidars = [FakeLidar(1, 10), FakeLidar(3, 20, fail=True)]
+        engine = AcquisitionEngine(lidars)
+        engine.start()
+        try:
+            self.assertFalse(engine.wait_ready(timeout=0.2))
+            good, bad = engine.snapshot()
+            self.assertEqual(good.distance, 10)
+            self.assertEqual(bad, EMPTY_SAMPLE)
+        finally:
+            engine.stop()
+
+    def test_failing_bus_is_reopened(self):
+        """Persistent failures reopen the bus and sampling resumes"""
+        lidar = FakeLidar(1, 10, fail=True)
+        engine = AcquisitionEngine([lidar])
+        engine.start()
+        try:
+            self.assertTrue(engine.wait_ready(timeout=1.0))
+            self.assertEqual(lidar.reopened, 1)
+            health = engine.health[0]
+            self.assertEqual(health.reopen_count, 1)
+            self.assertEqual(health.consecutive_failures, 0)
+            self.assertGreater(health.error_rate(), 0)
+        finally:
+            engine.stop()
+
+    def test_poll_skips_bus_in_backoff(self):
+        """A sick bus backing off is not read and is reported stale"""
+        healthy, sick = FakeLidar(1, 10), FakeLidar(3, 20, fail=True)
+        sick.reopen = lambda: None
+        engine = AcquisitionEngine([healthy, sick])
+        try:
+            for _ in range(REOPEN_AFTER + 1):
+                engine.poll()
+            self.assertGreater(engine.health[1].retry_in(), 0)
+            engine.poll()
+            self.assertEqual(engine.health[1].total, REOPEN_AFTER + 1)
+            self.assertEqual(engine.stale_mask(max_age=1.0), (False, True))
+        finally:
+            engine.stop()
+
+    def test_poll_fans_out_without_samplers(self):
+        """poll() reads all buses concurrently and fills the histories"""
+        barrier = threading.Barrier(4)
+        lidars = [BarrierLidar(b, 10 * b, barrier) for b in (1, 3, 4, 5)]
+        engine = AcquisitionEngine(lidars)
+        try:
+            samples = engine.poll()
+            self.assertEqual([s.distance for s in samples], [10, 30, 40, 50])
+            self.assertTrue(all(len(h) == 1 for h in engine.histories))
+        finally:
+            engine.stop()
+
+    def test_apoll_gathers_on_event_loop(self):
+        """apoll() awaits all bus transactions concurrently"""
+        barrier = threading.Barrier(4)
+        lidars = [BarrierLidar(b, 10 * b, barrier) for b in (1, 3, 4, 5)]
+        engine = AcquisitionEngine(lidars)
+
+        async def read_twice():
+            await engine.apoll()
+            return await engine.apoll()
+
+        try:
+            samples = asyncio.run(read_twice())
+            self.assertEqual([s.distance for s in samples], [10, 30, 40, 50])
+            self.assertTrue(all(len(h) == 2 for h in engine.histories))
+        finally:
+            engine.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
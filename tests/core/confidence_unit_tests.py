@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from core.confidence import Detection, fuse, score_readings
+
+
+class TestConfidence(unittest.TestCase):
+    def score(self, distance, strength, spread=0.0, valid_fraction=1.0):
+        n = len(distance)
+        return score_readings(
+            np.array(distance, dtype=float),
+            np.array(strength, dtype=float),
+            np.full(n, spread),
+            np.full(n, valid_fraction),
+            max_range=0.3,
+        )
+
+    def test_range_gate(self):
+        """Readings outside (min_range, max_range) score zero"""
+        confidence = self.score([0.0, 0.15, 0.5], [2000, 2000, 2000])
+        np.testing.assert_allclose(confidence, [0.0, 1.0, 0.0])
+
+    def test_weak_signal_scores_low(self):
+        """Strength near the sensor floor gives low confidence"""
+        weak, strong = self.score([0.15, 0.15], [120, 1000])
+        self.assertLess(weak, 0.05)
+        self.assertEqual(strong, 1.0)
+
+    def test_noisy_and_intermittent_readings_score_lower(self):
+        """Spread and missing samples both reduce confidence"""
+        (steady,) = self.score([0.15], [1000])
+        (noisy,) = self.score([0.15], [1000], spread=0.02)
+        (patchy,) = self.score([0.15], [1000], valid_fraction=0.6)
+        self.assertAlmostEqual(noisy, steady / 2)
+        self.assertAlmostEqual(patchy, 0.6)
+
+    def test_fuse_weights_by_confidence(self):
+        """Fused range leans toward the more confident sensor"""
+        detection = fuse(np.array([0.10, 0.20]), np.array([0.9, 0.1]))
+        self.assertAlmostEqual(detection.range_m, 0.11)
+        self.assertAlmostEqual(detection.confidence, 1 - 0.1 * 0.9)
+        self.assertTrue(detection)
+
+    def test_fuse_rejects_weak_hits(self):
+        """Readings below min_confidence do not produce a detection"""
+        detection = fuse(np.array([0.10, 0.0]), np.array([0.2, 0.0]), 0.3)
+        self.assertFalse(detection)
+        range_m, confidence = detection
+        self.assertEqual((range_m, confidence), (0.0, 0.0))
+        self.assertFalse(Detection())
+
+
+if __name__ == "__main__":
+    unittest.main()
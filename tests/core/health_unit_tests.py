@@ -0,0 +1,54 @@
+import time
+import unittest
+
+from core.health import BACKOFF_MAX, BACKOFF_MIN, REOPEN_AFTER, SensorHealth
+from drivers.lidar import STATUS_BAD_CHECKSUM, STATUS_IO_ERROR, STATUS_OK
+
+
+class TestSensorHealth(unittest.TestCase):
+    def test_rates(self):
+        """Error and checksum rates cover the recent window"""
+        health = SensorHealth(bus_id=1, window=4)
+        health.record(False, STATUS_IO_ERROR, 0.001)
+        for status in (STATUS_OK, STATUS_BAD_CHECKSUM, STATUS_OK, STATUS_OK):
+            health.record(status == STATUS_OK, status, 0.001)
+        self.assertEqual(health.total, 5)
+        self.assertEqual(health.error_rate(), 0.0)
+        self.assertEqual(health.checksum_failure_rate(), 0.25)
+
+    def test_latency_percentiles(self):
+        """Latency percentiles are computed over recorded transactions"""
+        health = SensorHealth(bus_id=1)
+        for i in range(1, 101):
+            health.record(True, STATUS_OK, i / 1000)
+        p50, p95, p99 = health.latency_percentiles()
+        self.assertAlmostEqual(p50, 0.0505)
+        self.assertGreater(p99, p95)
+
+    def test_staleness(self):
+        """A sensor is stale until it delivers and after max_age without frames"""
+        health = SensorHealth(bus_id=1)
+        self.assertTrue(health.is_stale(1.0))
+        health.record(True, STATUS_OK, 0.001)
+        self.assertFalse(health.is_stale(1.0))
+        self.assertTrue(health.is_stale(1.0, now=time.monotonic() + 2))
+
+    def test_backoff_doubles_and_resets(self):
+        """Reopen backoff grows to its cap and resets after a good frame"""
+        health = SensorHealth(bus_id=1)
+        for _ in range(REOPEN_AFTER):
+            health.record(False, STATUS_IO_ERROR, 0.001)
+        self.assertTrue(health.needs_reopen)
+        delays = [health.backoff() for _ in range(10)]
+        self.assertEqual(delays[0], BACKOFF_MIN)
+        self.assertEqual(delays[-1], BACKOFF_MAX)
+        self.assertGreater(health.retry_in(), 0)
+
+        health.record(True, STATUS_OK, 0.001)
+        self.assertFalse(health.needs_reopen)
+        self.assertEqual(health.retry_in(), 0.0)
+        self.assertEqual(health.backoff(), BACKOFF_MIN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import time
+import unittest
+
+import numpy as np
+
+from core.history import SampleHistory, inlier_mask
+from drivers.lidar import STATUS_OK, STATUS_WEAK_SIGNAL, LidarSample
+
+
+def fill(history, distances_cm, t0=None, dt=0.01, status=STATUS_OK):
+    t = time.monotonic() if t0 is None else t0
+    for i, d in enumerate(distances_cm):
+        history.append(LidarSample(d, 1000, 25.0, t + i * dt, status))
+
+
+class TestSampleHistory(unittest.TestCase):
+    def test_ring_buffer_keeps_latest(self):
+        """Oldest samples are overwritten and windows stay chronological"""
+        history = SampleHistory(capacity=4)
+        fill(history, [10, 20, 30, 40, 50, 60])
+        self.assertEqual(len(history), 4)
+        distance = history.window()[0]
+        np.testing.assert_allclose(distance, [0.3, 0.4, 0.5, 0.6])
+        np.testing.assert_allclose(history.window(2)[0], [0.5, 0.6])
+
+    def test_window_until(self):
+        """A window can end at an earlier sample, ignoring newer frames"""
+        history = SampleHistory(capacity=4)
+        fill(history, [10, 20, 30, 40, 50, 60], t0=100.0, dt=1.0)
+        np.testing.assert_allclose(history.window(2, until=104.0)[0], [0.4, 0.5])
+        np.testing.assert_allclose(history.window(until=103.5)[0], [0.3, 0.4])
+        self.assertEqual(history.window(until=99.0)[0].size, 0)
+
+    def test_robust_distance_rejects_outlier(self):
+        """A single spike does not move the filtered distance"""
+        history = SampleHistory()
+        fill(history, [100, 101, 100, 400, 99, 100])
+        self.assertAlmostEqual(history.robust_distance(), 1.0)
+
+    def test_robust_distance_needs_majority(self):
+        """Isolated valid hits among sensor misses are ignored"""
+        history = SampleHistory()
+        fill(history, [0xFFFF] * 4, status=STATUS_WEAK_SIGNAL)
+        fill(history, [100])
+        self.assertEqual(history.robust_distance(5), 0.0)
+        self.assertAlmostEqual(history.median(5), 1.0)
+
+    def test_max_age_drops_old_samples(self):
+        """Samples older than max_age are not used"""
+        history = SampleHistory()
+        fill(history, [100, 100], t0=time.monotonic() - 10)
+        self.assertEqual(history.robust_distance(max_age=1.0), 0.0)
+
+    def test_summary(self):
+        """Summary condenses a window into distance, strength, spread and validity"""
+        history = SampleHistory()
+        fill(history, [0xFFFF], status=STATUS_WEAK_SIGNAL)
+        fill(history, [100, 100, 100])
+        distance, strength, spread, valid_fraction = history.summary()
+        self.assertAlmostEqual(distance, 1.0)
+        self.assertEqual(strength, 1000)
+        self.assertEqual(spread, 0.0)
+        self.assertEqual(valid_fraction, 0.75)
+
+    def test_rates(self):
+        """Sample rate and range rate are estimated from timestamps"""
+        history = SampleHistory()
+        fill(history, [100 + i for i in range(20)], dt=0.01)
+        self.assertAlmostEqual(history.sample_rate(), 100.0, places=3)
+        self.assertAlmostEqual(history.range_rate(), 1.0, places=3)
+
+    def test_inlier_mask_resolution_floor(self):
+        """Quantized readings one step apart are not flagged as outliers"""
+        mask = inlier_mask(np.array([1.0, 1.0, 1.0, 1.01, 1.5]))
+        np.testing.assert_array_equal(mask, [True, True, True, True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import threading
+import time
+import unittest
+
+from core.acquisition import AcquisitionEngine
+from core.hub import AcquisitionHub
+from tests.core.acquisition_unit_tests import FakeLidar
+
+
+class TestAcquisitionHub(unittest.TestCase):
+    def setUp(self):
+        lidars = [FakeLidar(b, d) for b, d in ((1, 10), (3, 20), (4, 30), (5, 40))]
+        self.engine = AcquisitionEngine(lidars)
+        self.hub = AcquisitionHub(self.engine)
+        self.addCleanup(self.engine.stop)
+        self.addCleanup(self.hub.close)
+
+    def test_subscribe_starts_sampling(self):
+        """The first subscriber starts the samplers and receives all sensors"""
+        self.assertFalse(self.engine.running)
+        with self.hub.subscribe() as samples:
+            self.assertTrue(self.engine.running)
+            item = samples.get(timeout=1.0)
+            self.assertIsNotNone(item)
+            self.assertEqual(len(item.samples), 4)
+
+    def test_sensor_filter(self):
+        """Subscribers are only woken by frames of their sensors"""
+        with self.hub.subscribe(sensors=(2, 3), maxsize=100) as samples:
+            time.sleep(0.1)
+            seen = set()
+            while (item := samples.get(timeout=0)) is not None:
+                seen.add(item.sensor)
+            self.assertEqual(seen, {2, 3})
+
+    def test_latest_value_semantics(self):
+        """A slow consumer gets the newest set, older ones are dropped"""
+        with self.hub.subscribe() as samples:
+            time.sleep(0.1)
+            first = samples.get(timeout=0)
+            self.assertIsNotNone(first)
+            self.assertIsNone(samples.get(timeout=0))
+            self.assertGreater(samples.dropped, 0)
+            self.assertGreater(samples.get(timeout=1.0).sequence, first.sequence)
+
+    def test_fan_out(self):
+        """Every subscriber receives the stream independently"""
+        subscriptions = [self.hub.subscribe() for _ in range(3)]
+        for samples in subscriptions:
+            self.assertIsNotNone(samples.get(timeout=1.0))
+        for samples in subscriptions:
+            samples.close()
+
+    def test_close_wakes_consumer(self):
+        """Closing a subscription releases a blocked get()"""
+        samples = self.hub.subscribe(sensors=())
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(samples.get()))
+        consumer.start()
+        samples.close()
+        consumer.join(timeout=1.0)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(result, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from core.recorder import FrameRecorder
+from drivers.frame_log import FrameLog
+from drivers.lidar import Lidar
+from drivers.replay_bus import ReplayBus
+from drivers.sim_bus import encode_frame
+
+
+class ScriptedBus:
+    """Answers reads with a fixed sequence of frames."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def i2c_rdwr(self, *msgs):
+        for msg in msgs:
+            if msg.flags & 0x0001:
+                frame = self.frames.pop(0)
+                for i, b in enumerate(frame):
+                    msg.buf[i] = bytes([b])
+
+    def close(self):
+        pass
+
+
+class TestFrameRecorder(unittest.TestCase):
+    def setUp(self):
+        self.sleep = patch("drivers.lidar.time.sleep").start()
+        self.addCleanup(patch.stopall)
+        fd, self.path = tempfile.mkstemp(suffix=".frames")
+        os.close(fd)
+        os.unlink(self.path)
+        self.addCleanup(lambda: os.path.exists(self.path) and os.unlink(self.path))
+
+    def record_session(self):
+        lidar_a = Lidar(
+            bus_id=1, bus=ScriptedBus([encode_frame(d, 1000) for d in (100, 101)])
+        )
+        lidar_b = Lidar(bus_id=3, bus=ScriptedBus([encode_frame(250, 1000)]))
+        pointing = iter([(10.0, 45.0), (11.0, 45.0), (12.0, 46.0)])
+
+        recorder = FrameRecorder(self.path, pointing=lambda t: next(pointing))
+        recorder.attach([lidar_a, lidar_b])
+        lidar_a.update()
+        lidar_b.update()
+        lidar_a.update()
+        recorder.close()
+        return recorder
+
+    def test_records_are_memory_mapped(self):
+        """Every raw frame is logged with bus, address and pointing"""
+        self.assertEqual(self.record_session().count, 3)
+
+        frames = FrameLog(self.path)
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames.bus_ids(), (1, 3))
+        self.assertEqual(list(frames.indices_for(1)), [0, 2])
+
+        record = frames[1]
+        self.assertEqual(record.bus_id, 3)
+        self.assertEqual(record.address, 0x10)
+        self.assertEqual(record.frame, encode_frame(250, 1000))
+        self.assertEqual((record.az, record.el), (11.0, 45.0))
+        self.assertEqual(frames.records["az"][-1], 12.0)
+        frames.close()
+
+    def test_log_is_append_only(self):
+        """A second session appends to an existing log"""
+        self.record_session()
+        self.record_session()
+        frames = FrameLog(self.path)
+        self.assertEqual(len(frames), 6)
+        frames.close()
+
+    def test_rejects_foreign_file(self):
+        """Files without the log header are refused"""
+        with open(self.path, "wb") as f:
+            f.write(b"not a frame log at all")
+        with self.assertRaises(ValueError):
+            FrameLog(self.path)
+
+    def test_replay_bus_feeds_lidar(self):
+        """A Lidar on a ReplayBus parses the recorded frames in order"""
+        self.record_session()
+        frames = FrameLog(self.path)
+
+        bus = ReplayBus(frames, bus_id=1)
+        lidar = Lidar(bus_id=1, bus=bus)
+        self.assertTrue(lidar.update())
+        self.assertEqual(lidar.distance, 100)
+        self.assertEqual(bus.pointing(), (10.0, 45.0))
+        self.assertTrue(lidar.update())
+        self.assertEqual(lidar.distance, 101)
+        self.assertTrue(bus.exhausted)
+        self.assertFalse(lidar.update())
+
+        looping = Lidar(bus_id=3, bus=ReplayBus(frames, bus_id=3, loop=True))
+        for _ in range(3):
+            self.assertTrue(looping.update())
+            self.assertEqual(looping.distance, 250)
+        frames.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
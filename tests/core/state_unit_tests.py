@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+
+from core.state import EMPTY_STATE, StateCell, StationState
+
+
+def make_state(value):
+    return StationState(
+        az=value,
+        el=value,
+        range_m=value,
+        confidence=1.0,
+        distances=(value,) * 4,
+        confidences=(1.0,) * 4,
+        sample_times=(time.monotonic(),) * 4,
+        timestamp=time.monotonic(),
+    )
+
+
+class TestStationState(unittest.TestCase):
+    def test_immutable_and_slotted(self):
+        """Snapshots cannot be changed and carry no instance dict"""
+        state = make_state(1.0)
+        with self.assertRaises(AttributeError):
+            state.az = 2.0
+        self.assertFalse(hasattr(state, "__dict__"))
+
+    def test_age(self):
+        """The age counts from the snapshot's monotonic timestamp"""
+        state = make_state(1.0)._replace(timestamp=time.monotonic() - 0.5)
+        self.assertAlmostEqual(state.age, 0.5, delta=0.05)
+
+
+class TestStateCell(unittest.TestCase):
+    def test_publish_and_get(self):
+        """Readers see the latest snapshot and the version counts writes"""
+        cell = StateCell()
+        self.assertIs(cell.get(), EMPTY_STATE)
+        state = make_state(3.0)
+        cell.publish(state)
+        self.assertIs(cell.get(), state)
+        self.assertEqual(cell.version, 1)
+
+    def test_readers_see_consistent_snapshots(self):
+        """Concurrent readers never observe fields from different writes"""
+        cell = StateCell(make_state(0.0))
+        stop = threading.Event()
+        mixed = []
+
+        def read():
+            while not stop.is_set():
+                state = cell.get()
+                if not state.az == state.el == state.range_m == state.distances[0]:
+                    mixed.append(state)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(20000):
+            cell.publish(make_state(float(i)))
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(mixed, [])
+        self.assertEqual(cell.get().az, 19999.0)
+
+    def test_concurrent_writers(self):
+        """Every publish from several writers is counted"""
+        cell = StateCell()
+
+        def write(value):
+            for _ in range(5000):
+                cell.publish(make_state(value))
+
+        writers = [threading.Thread(target=write, args=(float(i),)) for i in range(4)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+        self.assertEqual(cell.version, 20000)
+        self.assertIn(cell.get().az, (0.0, 1.0, 2.0, 3.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
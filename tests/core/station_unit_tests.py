@@ -0,0 +1,179 @@
+import threading
+import time
+import unittest
+
+from core.station import LMSStation
+from drivers.azimuth_motion import AzimuthMotionExecutor
+from drivers.backends import SIMULATION
+from drivers.sim_bus import Scene
+from drivers.servo_motor import Servo
+from tests.drivers.azimuth_motion_unit_tests import FakeController
+from tests.drivers.servo_motor_unit_tests import FailingPi, FakePi
+
+
+class TestCoordinatedMove(unittest.TestCase):
+    def setUp(self):
+        # Only the motion parts of a station, without LIDARs or GPIO
+        self.station = LMSStation.__new__(LMSStation)
+        self.station.el_min, self.station.el_max = 30.0, 150.0
+
+        self.controller = FakeController()
+        self.controller.motor.time_scale = 1.0
+        self.station.az_actuator = self.controller
+        self.station.az_motion = AzimuthMotionExecutor(self.controller)
+        self.station.az_motion.start()
+        self.addCleanup(self.station.az_motion.shutdown)
+
+        self.station.servo = Servo(angle=30, speed=100, pi=FakePi(), calibration=None)
+        self.addCleanup(self.station.servo.close)
+
+    def test_axes_move_in_parallel(self):
+        """A combined move takes as long as the slower axis"""
+        az_time = self.station.az_motion.move_time(20.0)
+        el_time = 30.0 / self.station.servo.speed
+
+        start = time.monotonic()
+        move = self.station.move_to(20.0, 60.0, synchronize=False)
+        elapsed = time.monotonic() - start
+
+        self.assertTrue(move.done)
+        self.assertLess(elapsed, az_time + el_time - 0.1)
+        self.assertAlmostEqual(self.station.azimuth, 20.0)
+        self.assertEqual(self.station.elevation, 60.0)
+
+    def test_synchronized_arrival(self):
+        """The faster axis is slowed down to arrive with the slower one"""
+        move = self.station.move_to(10.0, 90.0, wait=False)
+        self.assertFalse(move.done)
+        time.sleep(0.3)
+        self.assertFalse(self.station.az_motion.done)
+
+        self.assertTrue(move.wait(timeout=2.0))
+        # Servo: 60° at 100°/s
+        self.assertAlmostEqual(self.controller.motor.duration, 0.6, delta=0.01)
+
+    def test_long_moves_are_slewed(self):
+        """Long azimuth moves take the planned path, slowed to the servo"""
+        self.controller.slew_min_degrees = 10.0
+        move = self.station.move_to(20.0, 60.0)
+        self.assertTrue(move.done)
+        ((angle, speed),) = self.controller.slews
+        self.assertEqual(angle, 20.0)
+        # Servo: 30° at 100°/s
+        self.assertAlmostEqual(speed, 20.0 / 0.3, delta=0.1)
+        self.assertAlmostEqual(self.station.azimuth, 20.0)
+
+    def test_wait_times_out(self):
+        """wait() gives up after the timeout while the axes still move"""
+        move = self.station.move_to(-10.0, 40.0, wait=False)
+        self.assertFalse(move.wait(timeout=0.05))
+        self.assertTrue(move.wait(timeout=2.0))
+
+    def test_failed_servo_ends_wait(self):
+        """A servo error ends a waiting move instead of blocking forever"""
+        pi = FailingPi()
+        self.station.servo = Servo(angle=30, speed=100, pi=pi, calibration=None)
+        self.addCleanup(self.station.servo.close)
+
+        pi.failing = True
+        start = time.monotonic()
+        move = self.station.move_to(5.0, 60.0)
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertFalse(move.wait(timeout=0))
+
+    def test_pointing_during_move(self):
+        """Times during a move map to the interpolated pointing"""
+        start = time.monotonic()
+        move = self.station.move_to(10.0, 90.0, wait=False)
+        time.sleep(0.3)
+        self.assertTrue(move.wait(timeout=2.0))
+
+        az, el = self.station.pointing_at(start + 0.3)
+        self.assertGreater(az, 1.0)
+        self.assertLess(az, 9.0)
+        self.assertAlmostEqual(el, 60.0, delta=2.0)
+        self.assertEqual(self.station.pointing_at(), (10.0, 90.0))
+
+    def test_sweep_stops_on_detection(self):
+        """A sweep runs without dwell and stops once on_poll reports"""
+        start = time.monotonic()
+        found = self.station.sweep_azimuth(
+            target_az=40.0,
+            speed=20.0,
+            stop_event=threading.Event(),
+            on_poll=lambda: time.monotonic() - start > 0.5,
+        )
+        self.assertTrue(found)
+        self.assertTrue(self.station.az_motion.wait(2.0))
+        self.assertGreater(self.station.azimuth, 5.0)
+        self.assertLess(self.station.azimuth, 20.0)
+
+
+class TestSimulatedStation(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(target_az=10.0, target_el=61.5, seed=0)
+        self.station = LMSStation(
+            backends=SIMULATION,
+            scene=self.scene,
+            lidar_profiles=None,
+            servo_calibration=None,
+            lidar_array=None,
+        )
+        self.addCleanup(self.station.cleanup)
+
+    def test_sensors_see_along_pointing(self):
+        """Simulated LIDARs follow the motors and detect the target"""
+        self.station.move_to(10.0, 60.0)
+        time.sleep(0.1)
+        detection = self.station.detect_target()
+        self.assertAlmostEqual(detection.range_m, 0.15, delta=0.01)
+        az, el = self.station.target_direction(self.station.state.get())
+        self.assertAlmostEqual(az, 10.0, delta=0.1)
+        self.assertAlmostEqual(el, 61.5, delta=0.1)
+
+        self.station.move_to(-10.0, 60.0)
+        time.sleep(0.1)
+        self.assertEqual(self.station.detect_target().range_m, 0.0)
+
+    def test_state_tagged_with_scored_samples(self):
+        """Published sample times are those of the samples that were scored"""
+        self.station.detect_target()
+        state = self.station.state.get()
+        newest = [h.window(1)[3][-1] for h in self.station.acquisition.histories]
+        self.assertEqual(state.sample_times, tuple(newest))
+        self.assertLessEqual(max(state.sample_times), state.timestamp)
+
+    def test_score_delivered_samples(self):
+        """Only the subscribed sensors are scored, up to the delivered set"""
+        self.station.move_to(10.0, 60.0)
+        with self.station.hub.subscribe(sensors=(0, 1)) as samples:
+            item = samples.get(timeout=1.0)
+            time.sleep(0.05)
+            distances, _, sample_times = self.station.score_samples(
+                item, samples.sensors
+            )
+        self.assertEqual(sample_times[:2], tuple(s.timestamp for s in item.samples[:2]))
+        self.assertEqual(sample_times[2:], (0.0, 0.0))
+        self.assertEqual(distances[2:].tolist(), [0.0, 0.0])
+
+        distances, confidences, sample_times = self.station.score_samples(None)
+        self.assertFalse(distances.any() or confidences.any() or any(sample_times))
+
+    def test_incremental_move_ends_off_step_grid(self):
+        """A target between two steps ends the move instead of looping"""
+        target = 0.3 + 0.3 / self.station.az_actuator.steps_per_degree
+        start = time.monotonic()
+        self.station.move_azimuth_incremental(
+            target_az=target,
+            step=0.1,
+            dwell=0.0,
+            stop_event=threading.Event(),
+            timeout_deadline=time.time() + 5.0,
+        )
+        self.assertLess(time.monotonic() - start, 4.0)
+        half_step = 0.5 / self.station.az_actuator.steps_per_degree
+        self.assertLessEqual(abs(self.station.azimuth - target), half_step)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from drivers.azimuth_controller import AzimuthController
+from drivers.motion_planner import MotionLimits
+
+
+class TestAzimuthController(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("drivers.azimuth_controller.StepperMotor")
+        stepper = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.motor = MagicMock(motor_steps_per_rev=200, microstep=8)
+        stepper.return_value = self.motor
+
+    def controller(self, **kwargs):
+        # 200 * 8 * 4 / 360 = 17.78 steps per degree
+        kwargs.setdefault("slew_microstep", 8)
+        return AzimuthController(gear_ratio=4, arg_microstep=8, limits=None, **kwargs)
+
+    def test_small_moves_do_not_drift(self):
+        """Sub-step remainders accumulate instead of being dropped"""
+        az = self.controller()
+        for _ in range(1000):
+            az.move_by_degree(0.1, delay=0)
+        self.assertEqual(az.position_steps, 1777)
+        self.assertAlmostEqual(az.current_angle, 100.0, delta=1 / az.steps_per_degree)
+
+    def test_angle_follows_steps(self):
+        """The reported angle is derived from the steps actually made"""
+        az = self.controller()
+        az.move_by_degree(0.01, delay=0)
+        self.assertEqual(az.position_steps, 0)
+        self.assertEqual(az.current_angle, 0.0)
+        self.motor.step.assert_not_called()
+
+    def test_move_to_angle_is_absolute(self):
+        """Absolute moves land on the nearest step of the target"""
+        az = self.controller()
+        az.move_by_degree(0.1, delay=0)
+        az.move_to_angle(45.0, delay=0)
+        self.assertEqual(az.position_steps, 800)
+        az.move_to_angle(-45.0, delay=0)
+        self.assertEqual(az.position_steps, -800)
+        self.motor.set_direction.assert_called_with(clockwise=False)
+        self.motor.step.assert_called_with(1600, delay=0)
+
+    def test_wrap_takes_shortest_path(self):
+        """In wrap mode 350° is reached by turning 10° backwards"""
+        az = self.controller(wrap=True)
+        self.assertAlmostEqual(az.resolve_target(350.0), -10.0)
+        self.assertAlmostEqual(az.resolve_target(-170.0), -170.0)
+        self.assertAlmostEqual(az.resolve_target(720.0), 0.0)
+
+    def test_wrap_respects_cable_limits(self):
+        """The long way round is taken when the short one crosses a limit"""
+        az = self.controller(wrap=True, cable_limits=(-5.0, 355.0))
+        self.assertAlmostEqual(az.resolve_target(350.0), 350.0)
+
+    def test_cable_limits_clamp(self):
+        """Targets beyond the cable limits are clamped"""
+        az = self.controller(cable_limits=(-90.0, 90.0))
+        self.assertEqual(az.resolve_target(120.0), 90.0)
+        self.assertEqual(az.resolve_target(-100.0), -90.0)
+
+    def test_slews_use_coarse_steps(self):
+        """Long moves switch to full steps and back, 8x fewer pulses"""
+        az = self.controller(slew_microstep=1)
+        az.move_to_angle(45.0, delay=0.001)
+        self.assertEqual(az.position_steps, 800)
+        self.motor.step.assert_called_once_with(100, delay=0.008)
+        self.assertEqual(
+            [c.args[0] for c in self.motor.set_microstepping_state.call_args_list],
+            [1, 8],
+        )
+
+    def test_slew_aligns_to_full_steps(self):
+        """Coarse pulses start on a full-step boundary and the rest is fine"""
+        az = self.controller(slew_microstep=1)
+        az.sync_steps(3)
+        az.move_to_angle(45.0, delay=0.001)
+        self.assertEqual(az.position_steps, 800)
+        pulses = [c.args[0] for c in self.motor.step.call_args_list]
+        self.assertEqual(pulses, [5, 99])
+
+        az.move_to_angle(0.25, delay=0.001)
+        self.assertEqual(az.position_steps, 4)
+        pulses = [c.args[0] for c in self.motor.step.call_args_list[2:]]
+        self.assertEqual(pulses, [99, 4])
+
+    def test_short_moves_stay_fine(self):
+        """Tracking nudges keep the fine microstep"""
+        az = self.controller(slew_microstep=1)
+        az.move_by_degree(3.0, delay=0.0005)
+        self.motor.set_microstepping_state.assert_not_called()
+        self.motor.step.assert_called_once_with(53, delay=0.0005)
+
+    def test_plans_long_moves(self):
+        """Moves that are planned or coarse are reported as slews"""
+        self.assertFalse(self.controller(slew_microstep=1).plans(3.0))
+        self.assertTrue(self.controller(slew_microstep=1).plans(-45.0))
+        self.assertFalse(self.controller().plans(45.0))
+
+        limits = MotionLimits(60.0, 240.0, 2400.0, 5.0)
+        az = AzimuthController(gear_ratio=4, arg_microstep=8, limits=limits)
+        self.assertTrue(az.plans(6.0))
+        self.assertFalse(az.plans(3.0))
+
+    def test_move_time_and_speed_cap(self):
+        """Move times follow the pulses sent, a speed cap stretches them"""
+        az = self.controller(slew_microstep=1)
+        # 100 full steps of 16 ms
+        self.assertAlmostEqual(az.move_time(45.0, delay=0.001), 1.6)
+        self.assertAlmostEqual(az.move_time(45.0, delay=0.001, max_speed=10.0), 4.5)
+
+        az.move_to_angle(45.0, delay=0.001, max_speed=10.0)
+        self.assertEqual(az.position_steps, 800)
+        self.motor.step.assert_called_once_with(100, delay=0.0225)
+
+    def test_speed_cap_on_planned_slew(self):
+        """Planned slews keep below the speed cap and take the planned time"""
+        limits = MotionLimits(60.0, 240.0, 2400.0, 5.0)
+        az = AzimuthController(
+            gear_ratio=4, arg_microstep=8, limits=limits, slew_microstep=1
+        )
+        fast = az.move_time(90.0, delay=0.005)
+        slow = az.move_time(90.0, delay=0.005, max_speed=20.0)
+        self.assertGreater(slow, fast)
+
+        az.move_to_angle(90.0, delay=0.005, max_speed=20.0)
+        self.assertEqual(az.position_steps, 1600)
+        (periods,), _ = self.motor.step_periods.call_args
+        # 20°/s at 200 full steps per 90°
+        self.assertGreaterEqual(periods.min(), 1 / (20.0 * 200 / 90) - 1e-9)
+        self.assertAlmostEqual(periods.sum(), slow)
+
+    def test_history_follows_pulses(self):
+        """Every pulse is recorded on the timeline it is sent with"""
+        az = self.controller()
+        start = time.monotonic()
+        az.move_to_angle(45.0, delay=0.001)
+        # 800 pulses of 2 ms from start
+        self.assertAlmostEqual(az.history.angle_at(start + 0.8), 22.5, delta=0.5)
+        end, angle = az.history.latest()
+        self.assertAlmostEqual(end, start + 1.6, delta=0.05)
+        self.assertEqual(angle, az.current_angle)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from drivers.azimuth_controller import AzimuthController
+from drivers.azimuth_motion import AzimuthMotionExecutor
+from drivers.motion_history import MotionHistory
+from drivers.motion_planner import MotionLimits
+
+STEPS_PER_DEGREE = 10.0
+
+
+class FakeMotor:
+    """Counts steps and plays batches back at a fraction of real time."""
+
+    def __init__(self, time_scale=0.05):
+        self.direction = True
+        self.position = 0
+        self.max_speed = 0.0
+        self.duration = 0.0
+        self.time_scale = time_scale
+        self.lock = threading.Lock()
+
+    def enable(self):
+        pass
+
+    def set_direction(self, clockwise=True):
+        self.direction = clockwise
+
+    def step_periods(self, periods):
+        with self.lock:
+            self.position += len(periods) if self.direction else -len(periods)
+            self.max_speed = max(self.max_speed, max(1 / p for p in periods))
+            self.duration += sum(periods)
+        time.sleep(sum(periods) * self.time_scale)
+
+
+class FakeController:
+    def __init__(self):
+        self.motor = FakeMotor()
+        self.position_steps = 0
+        self.steps_per_degree = STEPS_PER_DEGREE
+        self.limits = MotionLimits(
+            max_speed=90.0, accel=360.0, jerk=None, start_speed=5.0
+        )
+        self.cable_limits = (-45.0, 45.0)
+        self.history = MotionHistory()
+        self.step_delay = 0.001
+        # Moves at least this long are planned slews, never by default
+        self.slew_min_degrees = float("inf")
+        self.slews = []
+
+    def plans(self, delta_degree):
+        return abs(delta_degree) >= self.slew_min_degrees
+
+    def move_time(self, delta_degree, delay, max_speed=None):
+        return abs(delta_degree) / (max_speed or self.limits.max_speed)
+
+    def move_to_angle(self, target_angle, delay, max_speed=None):
+        self.slews.append((target_angle, max_speed))
+        time.sleep(0.05)
+        self.position_steps = round(target_angle * self.steps_per_degree)
+
+    @property
+    def current_angle(self):
+        return self.position_steps / self.steps_per_degree
+
+    record_steps = AzimuthController.record_steps
+
+    def sync_steps(self, position_steps):
+        self.position_steps = position_steps
+
+    def resolve_target(self, target_angle):
+        return target_angle
+
+
+class TestAzimuthMotionExecutor(unittest.TestCase):
+    def setUp(self):
+        self.controller = FakeController()
+        self.executor = AzimuthMotionExecutor(self.controller)
+        self.executor.start()
+        self.addCleanup(self.executor.shutdown)
+
+    def test_move_completes(self):
+        """A move ends exactly on target and updates the controller angle"""
+        self.executor.move_to(30.0)
+        self.assertTrue(self.executor.wait(5.0))
+        status = self.executor.status()
+        self.assertTrue(status.done)
+        self.assertEqual(status.position, 300)
+        self.assertEqual(status.velocity, 0.0)
+        self.assertEqual(self.controller.motor.position, 300)
+        self.assertAlmostEqual(self.controller.current_angle, 30.0)
+
+    def test_speed_limit(self):
+        """Steps are never faster than the maximum speed"""
+        self.executor.move_to(90.0)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertLessEqual(self.controller.motor.max_speed, 900.0 + 1e-6)
+
+    def test_retarget_while_moving(self):
+        """A new target reverses through deceleration and is reached"""
+        self.executor.move_to(60.0)
+        time.sleep(0.01)
+        self.assertFalse(self.executor.done)
+        self.executor.move_to(-10.0)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertEqual(self.executor.status().position, -100)
+        self.assertEqual(self.controller.motor.position, -100)
+
+    def test_move_by_accumulates_targets(self):
+        """Relative moves stack onto the pending target"""
+        self.executor.move_by(10.0)
+        self.executor.move_by(5.0)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertEqual(self.executor.status().position, 150)
+
+    def test_bounded_stop(self):
+        """Stop decelerates to a standstill within the stopping distance"""
+        self.executor.move_to(40.0)
+        time.sleep(0.02)
+        self.assertTrue(self.executor.stop())
+        status = self.executor.status()
+        self.assertTrue(status.done)
+        self.assertEqual(status.velocity, 0.0)
+        self.assertLess(status.position, 400)
+        self.assertEqual(self.controller.motor.position, status.position)
+
+    def test_jog_follows_rate(self):
+        """Jogging ramps to the commanded rate and tracks rate updates"""
+        self.executor.set_velocity(20.0)
+        time.sleep(0.1)
+        status = self.executor.status()
+        self.assertTrue(status.jogging)
+        self.assertFalse(status.done)
+        self.assertAlmostEqual(status.velocity, 20.0, places=6)
+
+        self.executor.set_velocity(-10.0)
+        time.sleep(0.2)
+        self.assertAlmostEqual(self.executor.status().velocity, -10.0, places=6)
+
+        self.assertTrue(self.executor.stop())
+        status = self.executor.status()
+        self.assertEqual(status.velocity, 0.0)
+        self.assertFalse(status.jogging)
+        self.assertEqual(status.target, status.angle)
+        self.assertEqual(self.controller.motor.position, status.position)
+
+    def test_jog_stops_at_cable_limit(self):
+        """A jog decelerates and halts before the cable limit"""
+        self.executor.set_velocity(90.0)
+        self.assertTrue(self.executor.wait(5.0))
+        status = self.executor.status()
+        self.assertEqual(status.velocity, 0.0)
+        self.assertLessEqual(status.angle, 45.0)
+        self.assertGreater(status.angle, 40.0)
+
+    def test_move_after_jog(self):
+        """A position command ends jog mode"""
+        self.executor.set_velocity(30.0)
+        time.sleep(0.05)
+        self.executor.move_to(-5.0)
+        self.assertTrue(self.executor.wait(5.0))
+        status = self.executor.status()
+        self.assertFalse(status.jogging)
+        self.assertEqual(status.position, -50)
+
+    def test_move_time_matches_profile(self):
+        """The estimated duration is that of the steps actually sent"""
+        for distance in (40.0, 2.0):
+            self.controller.motor.duration = 0.0
+            self.executor.move_by(distance)
+            self.assertTrue(self.executor.wait(5.0))
+            self.assertAlmostEqual(
+                self.controller.motor.duration,
+                self.executor.move_time(distance),
+                places=6,
+            )
+
+    def test_speed_cap_stretches_move(self):
+        """A per-move speed cap makes the move last the requested time"""
+        speed = self.executor.speed_for_time(20.0, 1.0)
+        self.assertLess(speed, 90.0)
+        self.assertAlmostEqual(self.executor.move_time(20.0, speed), 1.0, delta=0.01)
+
+        self.executor.move_to(20.0, max_speed=speed)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertLessEqual(self.controller.motor.max_speed, speed * 10 + 1e-6)
+        self.assertAlmostEqual(self.controller.motor.duration, 1.0, delta=0.01)
+
+    def test_slew_uses_controller_path(self):
+        """Planned slews run through the controller, short moves do not"""
+        self.controller.slew_min_degrees = 10.0
+        self.executor.slew_to(30.0)
+        self.assertFalse(self.executor.done)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertEqual(self.controller.slews, [(30.0, None)])
+        self.assertEqual(self.controller.motor.position, 0)
+        self.assertEqual(self.executor.status().position, 300)
+
+        self.executor.slew_to(32.0)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertEqual(len(self.controller.slews), 1)
+        self.assertEqual(self.controller.motor.position, 20)
+        self.assertEqual(self.executor.slew_time(2.0), self.executor.move_time(2.0))
+        self.assertEqual(self.executor.slew_time(20.0, 10.0), 2.0)
+
+    def test_slew_starts_from_standstill(self):
+        """A slew ordered while moving brakes first, then runs to its target"""
+        self.controller.slew_min_degrees = 10.0
+        self.executor.move_to(40.0)
+        time.sleep(0.05)
+        self.executor.slew_to(-30.0)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertEqual(self.controller.slews, [(-30.0, None)])
+        self.assertEqual(self.executor.status().position, -300)
+
+    def test_commands_wait_for_running_slew(self):
+        """A stop does not undo a running slew, a new target follows it"""
+        self.controller.slew_min_degrees = 10.0
+        self.executor.slew_to(30.0)
+        time.sleep(0.01)
+        self.executor.stop(timeout=0)
+        self.executor.move_to(31.0)
+        self.assertTrue(self.executor.wait(5.0))
+        self.assertEqual(self.executor.status().position, 310)
+
+    def test_history_records_batches(self):
+        """The step timeline covers the move and ends on the target"""
+        start = time.monotonic()
+        self.executor.move_to(20.0)
+        self.assertTrue(self.executor.wait(5.0))
+        times, angles = self.controller.history.window()
+        self.assertGreaterEqual(times[0], start)
+        self.assertTrue((np.diff(times) >= 0).all())
+        self.assertEqual(angles[0], 0.0)
+        self.assertEqual(angles[-1], 20.0)
+
+    def test_constant_speed_without_limits(self):
+        """Without planning limits every step takes twice the step delay"""
+        self.controller.limits = None
+        self.controller.step_delay = 0.001
+        executor = AzimuthMotionExecutor(self.controller)
+        executor.start()
+        self.addCleanup(executor.shutdown)
+
+        executor.move_to(10.0)
+        self.assertTrue(executor.wait(5.0))
+        self.assertEqual(self.controller.motor.position, 100)
+        self.assertAlmostEqual(self.controller.motor.max_speed, 500.0)
+        self.assertAlmostEqual(self.controller.motor.duration, 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from drivers.backends import (
+    HARDWARE,
+    SIMULATION,
+    BackendConfig,
+    SimulatedPwm,
+    load_backends,
+    open_i2c,
+    open_pwm,
+)
+from drivers.gpio_backend import HIGH, open_backend
+from drivers.sim_bus import Scene, SimulatedBus
+
+
+class TestBackends(unittest.TestCase):
+    def test_simulated_devices(self):
+        """The sim backends open in-memory GPIO, PWM and I2C devices"""
+        gpio = open_backend((24, 25), "sim")
+        gpio.write_many({24: HIGH})
+        self.assertEqual(gpio.levels, {24: HIGH, 25: 0})
+
+        pwm = open_pwm("sim")
+        self.assertIsInstance(pwm, SimulatedPwm)
+        pwm.set_servo_pulsewidth(18, 1500)
+        self.assertEqual(pwm.pulse_widths, {18: 1500})
+
+        scene = Scene()
+        bus = open_i2c(4, "sim", scene=scene, offset=(-2.0, 0.0))
+        self.assertIsInstance(bus, SimulatedBus)
+        self.assertIs(bus.scene, scene)
+        self.assertEqual(bus.offset, (-2.0, 0.0))
+
+    def test_unknown_names(self):
+        """Unknown backend names are rejected"""
+        with self.assertRaises(ValueError):
+            open_pwm("servoblaster")
+        with self.assertRaises(ValueError):
+            open_i2c(1, "spi")
+        with self.assertRaises(ValueError):
+            BackendConfig(gpio="wiringpi")
+
+    def test_load_from_environment(self):
+        """LMS_BACKEND picks a preset, single variables override it"""
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(load_backends(), HARDWARE)
+        with patch.dict(os.environ, {"LMS_BACKEND": "sim"}, clear=True):
+            self.assertEqual(load_backends(), SIMULATION)
+        env = {"LMS_BACKEND": "sim", "GPIO_BACKEND": "lgpio"}
+        with patch.dict(os.environ, env, clear=True):
+            config = load_backends()
+            self.assertEqual((config.gpio, config.pwm), ("lgpio", "sim"))
+            self.assertTrue(config.simulated)
+        with patch.dict(os.environ, {"LMS_BACKEND": "pi"}, clear=True):
+            with self.assertRaises(ValueError):
+                load_backends()
+
+    def test_hardware_libraries_load_lazily(self):
+        """Importing the station loads no PWM, I2C or GPIO library"""
+        libraries = {"pigpio", "smbus2", "RPi", "gpiod", "lgpio"}
+        code = (
+            f"import sys, core.station; print(sorted({libraries} & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
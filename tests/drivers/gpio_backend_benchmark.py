@@ -0,0 +1,137 @@
+import statistics
+import time
+from types import SimpleNamespace
+
+from drivers.gpio_backend import (
+    HIGH,
+    LOW,
+    GpiodBackend,
+    LgpioBackend,
+    RPiGpioBackend,
+)
+
+STEP_PIN, DIR_PIN, SLEEP_PIN, MS1_PIN, MS2_PIN = 24, 25, 23, 20, 21
+PINS = (STEP_PIN, DIR_PIN, SLEEP_PIN, MS1_PIN, MS2_PIN)
+
+
+class MockChip:
+    """Line levels of a GPIO chip, with the time of every change."""
+
+    def __init__(self):
+        self.levels = {}
+        self.calls = 0
+        self.rising = []
+
+    def set(self, pin, level):
+        if pin == STEP_PIN and level and not self.levels.get(pin):
+            self.rising.append(time.perf_counter())
+        self.levels[pin] = level
+
+
+def mock_rpi_gpio(chip):
+    def output(pins, levels):
+        chip.calls += 1
+        if isinstance(pins, list):
+            for pin, level in zip(pins, levels):
+                chip.set(pin, level)
+        else:
+            chip.set(pins, levels)
+
+    return SimpleNamespace(
+        BCM="BCM",
+        OUT="OUT",
+        setmode=lambda mode: None,
+        setup=lambda pin, mode: None,
+        output=output,
+        cleanup=lambda pins: None,
+    )
+
+
+def mock_gpiod(chip):
+    value = SimpleNamespace(INACTIVE=0, ACTIVE=1)
+
+    class Request:
+        def set_value(self, pin, level):
+            chip.calls += 1
+            chip.set(pin, level)
+
+        def set_values(self, levels):
+            chip.calls += 1
+            for pin, level in levels.items():
+                chip.set(pin, level)
+
+        def release(self):
+            pass
+
+    return SimpleNamespace(
+        line=SimpleNamespace(Value=value, Direction=SimpleNamespace(OUTPUT="out")),
+        LineSettings=lambda **kwargs: kwargs,
+        request_lines=lambda path, consumer, config: Request(),
+    )
+
+
+def mock_lgpio(chip):
+    group = []
+
+    def group_claim_output(handle, pins, levels):
+        group[:] = pins
+
+    def group_write(handle, leader, bits, mask):
+        chip.calls += 1
+        for i, pin in enumerate(group):
+            if mask >> i & 1:
+                chip.set(pin, bits >> i & 1)
+
+    return SimpleNamespace(
+        gpiochip_open=lambda chip_number: 1,
+        group_claim_output=group_claim_output,
+        group_write=group_write,
+        group_free=lambda handle, leader: None,
+        gpiochip_close=lambda handle: None,
+    )
+
+
+BACKENDS = (
+    (RPiGpioBackend, mock_rpi_gpio),
+    (GpiodBackend, mock_gpiod),
+    (LgpioBackend, mock_lgpio),
+)
+
+
+def pulse_rate(backend, pulses=50000):
+    """Pulses per second with no delay between pin changes."""
+    write = backend.write
+    start = time.perf_counter()
+    for _ in range(pulses):
+        write(STEP_PIN, HIGH)
+        write(STEP_PIN, LOW)
+    return pulses / (time.perf_counter() - start)
+
+
+def jitter(backend, chip, pulses=2000, delay=0.00025):
+    """Mean and standard deviation of the step period in microseconds."""
+    chip.rising.clear()
+    write = backend.write
+    for _ in range(pulses):
+        write(STEP_PIN, HIGH)
+        time.sleep(delay)
+        write(STEP_PIN, LOW)
+        time.sleep(delay)
+    periods = [(b - a) * 1e6 for a, b in zip(chip.rising, chip.rising[1:])]
+    return statistics.mean(periods), statistics.pstdev(periods)
+
+
+def run_benchmark():
+    print(f"{'Backend':>8} | {'Pulses/s':>10} | {'Period us':>10} | {'Jitter us':>9}")
+    print("-" * 48)
+    for backend_class, mock in BACKENDS:
+        chip = MockChip()
+        backend = backend_class(PINS, lib=mock(chip))
+        rate = pulse_rate(backend)
+        mean, std = jitter(backend, chip)
+        backend.release()
+        print(f"{backend.name:>8} | {rate:>10.0f} | {mean:>10.1f} | {std:>9.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,61 @@
+import unittest
+
+from drivers.gpio_backend import HIGH, LOW, GpioBackend, open_backend
+from tests.drivers.gpio_backend_benchmark import (
+    BACKENDS,
+    DIR_PIN,
+    MS1_PIN,
+    MS2_PIN,
+    PINS,
+    STEP_PIN,
+    MockChip,
+    mock_gpiod,
+    mock_lgpio,
+)
+
+
+class TestGpioBackends(unittest.TestCase):
+    def test_single_writes(self):
+        """Every backend drives the requested line"""
+        for backend_class, mock in BACKENDS:
+            chip = MockChip()
+            backend = backend_class(PINS, lib=mock(chip))
+            backend.write(STEP_PIN, HIGH)
+            self.assertEqual(chip.levels[STEP_PIN], HIGH)
+            backend.write(STEP_PIN, LOW)
+            self.assertEqual(chip.levels[STEP_PIN], LOW)
+
+    def test_bulk_write_is_one_call(self):
+        """Line groups change several pins with a single library call"""
+        for backend_class, mock in BACKENDS:
+            chip = MockChip()
+            backend = backend_class(PINS, lib=mock(chip))
+            backend.write_many({MS1_PIN: HIGH, MS2_PIN: LOW, DIR_PIN: HIGH})
+            self.assertEqual(chip.calls, 1, backend.name)
+            self.assertEqual(chip.levels[MS1_PIN], HIGH)
+            self.assertEqual(chip.levels[MS2_PIN], LOW)
+            self.assertEqual(chip.levels[DIR_PIN], HIGH)
+
+    def test_lgpio_mask_leaves_other_lines(self):
+        """Masked group writes only touch the given lines"""
+        chip = MockChip()
+        backend = open_backend(PINS, "lgpio", lib=mock_lgpio(chip))
+        backend.write(DIR_PIN, HIGH)
+        backend.write(STEP_PIN, HIGH)
+        self.assertEqual(chip.levels, {DIR_PIN: HIGH, STEP_PIN: HIGH})
+
+    def test_open_backend_by_name(self):
+        """Backends are selected by name and unknown names are refused"""
+        backend = open_backend(PINS, "gpiod", lib=mock_gpiod(MockChip()))
+        self.assertEqual(backend.name, "gpiod")
+        with self.assertRaises(ValueError):
+            open_backend(PINS, "sysfs")
+
+    def test_backends_must_implement_write(self):
+        """The base class cannot be used without a write() implementation"""
+        with self.assertRaises(TypeError):
+            GpioBackend(PINS)
+
+
+if __name__ == "__main__":
+    unittest.main()
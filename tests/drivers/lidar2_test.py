@@ -20,9 +20,9 @@ def run_hardware_unit_test():
     for _ in range(stats["total"]):
         if lidar.update():
             data = lidar.get_data()
-            if data["distance"] > 0:
+            if data.distance > 0:
                 stats["success"] += 1
-                distances.append(data["distance"])
+                distances.append(data.distance)
         else:
             stats["checksum_errors"] += 1
         time.sleep(0.05)
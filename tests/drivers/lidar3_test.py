@@ -18,7 +18,7 @@ def run_hardware_unit_test():
         while True:
             lidar.update()
             data1 = lidar.get_data()
-            print(f"l1 = {data1['distance']}")
+            print(f"l1 = {data1.distance}")
             time.sleep(0.1)
     except KeyboardInterrupt:
         lidar.close()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from drivers.lidar_array import (
+    DEFAULT_SENSORS,
+    ROLE_AZIMUTH,
+    ROLE_ELEVATION,
+    ROLE_RANGE,
+    SensorArray,
+    SensorConfig,
+    load_array,
+    save_array,
+)
+from modes.tracking import side_readings
+
+# Six sensors: two more range sensors on the second bus address of 1 and 3
+WIDE = DEFAULT_SENSORS + (
+    SensorConfig(bus_id=1, address=0x11, az_offset=-3.0),
+    SensorConfig(bus_id=3, address=0x11, az_offset=3.0),
+)
+
+
+class TestSensorArray(unittest.TestCase):
+    def test_roles_and_sides(self):
+        """Masks select sensors by role, offsets give their side"""
+        array = SensorArray(WIDE)
+        self.assertEqual(len(array), 6)
+        self.assertEqual(array.indices(ROLE_ELEVATION), (0, 1))
+        self.assertEqual(array.indices(ROLE_AZIMUTH), (2, 3))
+        self.assertEqual(array.indices(ROLE_RANGE), (4, 5))
+        np.testing.assert_array_equal(array.sides(ROLE_ELEVATION), [1, -1, 0, 0, 0, 0])
+        np.testing.assert_array_equal(array.sides(ROLE_AZIMUTH), [0, 0, -1, 1, 0, 0])
+
+    def test_weighted_offset(self):
+        """The detecting sensors' offsets are averaged by weight"""
+        array = SensorArray(WIDE)
+        self.assertEqual(array.offset(np.zeros(6)), (0.0, 0.0))
+        self.assertEqual(array.offset(np.array([1.0, 0, 0, 0, 0, 0])), (0.0, 1.5))
+        az, el = array.offset(np.array([0, 0, 1.0, 0, 0, 1.0]))
+        self.assertAlmostEqual(az, 0.75)
+        self.assertEqual(el, 0.0)
+
+    def test_rejects_bad_layouts(self):
+        """Unknown roles, steering sensors on boresight and duplicates fail"""
+        with self.assertRaises(ValueError):
+            SensorConfig(bus_id=1, role="search")
+        with self.assertRaises(ValueError):
+            SensorConfig(bus_id=1, role=ROLE_AZIMUTH)
+        with self.assertRaises(ValueError):
+            SensorArray(DEFAULT_SENSORS + DEFAULT_SENSORS[:1])
+        with self.assertRaises(ValueError):
+            SensorArray(())
+
+    def test_side_readings(self):
+        """Each side of an axis is represented by its most confident sensor"""
+        array = SensorArray(
+            WIDE + (SensorConfig(bus_id=6, el_offset=3.0, role=ROLE_ELEVATION),)
+        )
+        distances = np.array([0.10, 0.0, 0.2, 0.3, 0.4, 0.5, 0.12])
+        confidences = np.array([0.5, 0.0, 0.9, 0.1, 1.0, 1.0, 0.8])
+        lower, upper = side_readings(
+            distances, confidences, array.sides(ROLE_ELEVATION)
+        )
+        self.assertEqual(lower, (0.0, 0.0))
+        self.assertEqual(upper, (0.12, 0.8))
+        left, right = side_readings(distances, confidences, array.sides(ROLE_AZIMUTH))
+        self.assertEqual(left, (0.2, 0.9))
+        self.assertEqual(right, (0.3, 0.1))
+
+
+class TestArrayFile(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def test_round_trip(self):
+        """A saved layout loads back unchanged"""
+        save_array(WIDE, self.path)
+        self.assertEqual(load_array(self.path), WIDE)
+
+    def test_missing_or_broken_file(self):
+        """Unusable files fall back to the default layout"""
+        self.assertEqual(load_array(self.path + ".missing"), DEFAULT_SENSORS)
+        with open(self.path, "w") as f:
+            f.write('[{"bus_id": 1, "role": "azimuth"}]')
+        self.assertEqual(load_array(self.path), DEFAULT_SENSORS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from drivers.lidar import Lidar, STATUS_OK, TRIGGER_READ_DELAY
+from drivers.lidar_calibration import (
+    LatencyProfile,
+    apply_profiles,
+    calibrate,
+    load_profiles,
+    save_profiles,
+)
+
+VALID_FRAME = bytes([0x59, 0x59, 0x64, 0x00, 0xE8, 0x03, 0xC8, 0x08, 0xD1])
+
+
+class SlowBus:
+    """Answers with a valid frame only if the read comes late enough."""
+
+    def __init__(self, latency, corrupt_reads=0):
+        self.latency = latency
+        self.corrupt_reads = corrupt_reads
+        self.requested_at = 0.0
+        self.reads = 0
+
+    def i2c_rdwr(self, *msgs):
+        for msg in msgs:
+            if msg.flags:
+                self.reads += 1
+                ready = time.monotonic() - self.requested_at >= self.latency
+                ready = ready and self.reads > self.corrupt_reads
+                frame = VALID_FRAME if ready else bytes(9)
+                for i, b in enumerate(frame):
+                    msg.buf[i] = bytes([b])
+            else:
+                self.requested_at = time.monotonic()
+
+    def close(self):
+        pass
+
+
+class TestLatencyCalibration(unittest.TestCase):
+    def make_lidar(self, latency, corrupt_reads=0):
+        self.bus = SlowBus(latency, corrupt_reads)
+        with patch("smbus2.SMBus", return_value=self.bus):
+            return Lidar(bus_id=3)
+
+    def test_calibrate_finds_shortest_valid_delay(self):
+        """Calibration picks the first candidate that always returns valid frames"""
+        lidar = self.make_lidar(latency=0.002)
+        profile = calibrate(
+            lidar,
+            trials=5,
+            margin=1.0,
+            read_candidates=(0.0, 0.001, 0.003, 0.005),
+            command_candidates=(0.001, 0.003),
+        )
+        self.assertEqual(profile.read_delay, 0.003)
+        self.assertEqual(profile.key, (3, 0x10))
+
+    def test_marginal_delay_falls_back(self):
+        """An invalid frame at the calibrated delay is retried at the safe delay"""
+        lidar = self.make_lidar(latency=0.0, corrupt_reads=1)
+        lidar.apply_profile(LatencyProfile(bus_id=3, address=0x10, read_delay=0.0))
+        self.assertTrue(lidar.update())
+        self.assertEqual(lidar.last_status, STATUS_OK)
+        self.assertEqual(self.bus.reads, 2)
+
+    def test_profiles_round_trip(self):
+        """Saved profiles are applied to the matching sensor only"""
+        path = os.path.join(tempfile.mkdtemp(), "profiles.json")
+        save_profiles(
+            [LatencyProfile(3, 0x10, read_delay=0.002, command_delay=0.02)], path
+        )
+        self.assertIn((3, 0x10), load_profiles(path))
+
+        lidar = self.make_lidar(latency=0.0)
+        other = self.make_lidar(latency=0.0)
+        other.bus_id = 4
+        self.assertEqual(apply_profiles([lidar, other], path), 1)
+        self.assertEqual(lidar.read_delay, 0.002)
+        self.assertEqual(other.read_delay, TRIGGER_READ_DELAY)
+
+    def test_unusable_profiles_ignored(self):
+        """Malformed or stale profile files fall back to the default delays"""
+        path = os.path.join(tempfile.mkdtemp(), "profiles.json")
+        for content in ('[{"bus_id": 3}]', '[{"bus": 3, "address": 16}]', "[3]"):
+            with open(path, "w") as f:
+                f.write(content)
+            self.assertEqual(load_profiles(path), {})
+
+        lidar = self.make_lidar(latency=0.0)
+        self.assertEqual(apply_profiles([lidar], path), 0)
+        self.assertEqual(lidar.read_delay, TRIGGER_READ_DELAY)
+
+
+if __name__ == "__main__":
+    unittest.main()
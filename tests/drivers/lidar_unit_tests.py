@@ -0,0 +1,174 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from drivers.lidar import Lidar, LIDAR_MODES, STATUS_BAD_CHECKSUM, STATUS_WEAK_SIGNAL
+
+
+def make_frame(distance, strength=1000, temp_raw=2248):
+    frame = [
+        0x59,
+        0x59,
+        distance & 0xFF,
+        distance >> 8,
+        strength & 0xFF,
+        strength >> 8,
+        temp_raw & 0xFF,
+        temp_raw >> 8,
+    ]
+    frame.append(sum(frame) & 0xFF)
+    return bytes(frame)
+
+
+class FakeBus:
+    """Records writes and answers every read with the configured frame."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.writes = []
+        self.closed = False
+
+    def i2c_rdwr(self, *msgs):
+        if self.closed:
+            raise OSError("bus closed")
+        for msg in msgs:
+            if msg.flags:
+                for i, b in enumerate(self.frame[: msg.len]):
+                    msg.buf[i] = bytes([b])
+            else:
+                self.writes.append(list(bytes(msg)))
+
+    def close(self):
+        self.closed = True
+
+
+class TestLidar(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus(make_frame(123))
+        patcher = patch("smbus2.SMBus", return_value=self.bus)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleep_patcher = patch("drivers.lidar.time.sleep", return_value=None)
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+        self.lidar = Lidar(bus_id=1)
+
+    def test_update_decodes_frame(self):
+        """A valid frame updates distance, strength and temperature"""
+        self.assertTrue(self.lidar.update())
+        self.assertEqual(self.lidar.distance, 123)
+        self.assertEqual(self.lidar.strength, 1000)
+        self.assertAlmostEqual(self.lidar.temperature, 25.0)
+        sample = self.lidar.get_data()
+        self.assertEqual(sample.distance, 123)
+        self.assertGreater(sample.timestamp, 0)
+
+    def test_update_reuses_transaction_buffers(self):
+        """Repeated updates do not allocate new i2c messages"""
+        request, read = self.lidar._request_msg, self.lidar._read_msg
+        self.lidar.update()
+        self.lidar.update()
+        self.assertIs(self.lidar._request_msg, request)
+        self.assertIs(self.lidar._read_msg, read)
+
+    def test_update_flags_weak_signal(self):
+        """Sensor error codes are reported as sample status"""
+        self.bus.frame = make_frame(0xFFFF, strength=40)
+        self.assertTrue(self.lidar.update())
+        self.assertEqual(self.lidar.get_data().status, STATUS_WEAK_SIGNAL)
+
+    def test_update_rejects_bad_checksum(self):
+        """A corrupted frame is rejected and keeps the previous reading"""
+        frame = bytearray(make_frame(200))
+        frame[8] ^= 0xFF
+        self.bus.frame = bytes(frame)
+        self.assertFalse(self.lidar.update())
+        self.assertEqual(self.lidar.distance, 0)
+        self.assertEqual(self.lidar.last_status, STATUS_BAD_CHECKSUM)
+
+    def test_frame_rate_command(self):
+        """Frame rate command carries the rate and a valid checksum"""
+        self.assertTrue(self.lidar.set_frame_rate(100))
+        self.assertEqual(self.bus.writes[-1], [0x5A, 0x06, 0x03, 0x64, 0x00, 0xC7])
+        self.assertFalse(self.lidar.set_frame_rate(5000))
+
+    def test_apply_mode_starts_streaming(self):
+        """Operating modes select filtering and frame rate"""
+        self.assertTrue(self.lidar.apply_mode("tracking"))
+        self.assertTrue(self.lidar.streaming)
+        self.assertEqual(self.lidar.frame_rate, LIDAR_MODES["tracking"]["frame_rate"])
+        self.assertIn(self.lidar.KALMAN_FILTER_OFF_CMD, self.bus.writes)
+        self.assertIn(self.lidar.OUTPUT_ON_CMD, self.bus.writes)
+        self.assertFalse(self.lidar.apply_mode("unknown"))
+
+    def test_streaming_paces_reads_to_frame_rate(self):
+        """Streaming reads are scheduled one frame period apart"""
+        self.lidar.start_streaming(200)
+        start = time.monotonic()
+        self.lidar.update()
+        self.lidar.update()
+        self.assertAlmostEqual(self.lidar._next_frame_at - start, 2 / 200, places=2)
+
+    def test_streaming_reads_without_request(self):
+        """Streaming reads the output frame, polled reads request it first"""
+        self.lidar.update()
+        self.assertEqual(self.bus.writes, [self.lidar.GET_DATA_CMD])
+
+        self.lidar.start_streaming(200)
+        self.bus.writes.clear()
+        self.assertTrue(self.lidar.update())
+        self.assertEqual(self.lidar.distance, 123)
+        self.assertEqual(self.bus.writes, [])
+
+        self.assertTrue(self.lidar.stop_streaming())
+        self.assertFalse(self.lidar.streaming)
+        self.assertEqual(self.lidar.frame_rate, 100)
+        self.assertEqual(self.bus.writes[-1], self.lidar._frame_rate_cmd(100))
+
+        self.bus.writes.clear()
+        self.assertTrue(self.lidar.update())
+        self.assertEqual(self.bus.writes, [self.lidar.GET_DATA_CMD])
+
+    def test_apply_mode_skips_current_mode(self):
+        """Re-applying the active mode sends no commands"""
+        self.assertTrue(self.lidar.apply_mode("locate"))
+        sent = len(self.bus.writes)
+        self.assertTrue(self.lidar.apply_mode("locate"))
+        self.assertEqual(len(self.bus.writes), sent)
+
+        self.assertTrue(self.lidar.apply_mode("tracking"))
+        self.assertGreater(len(self.bus.writes), sent)
+        self.lidar.set_frame_rate(100)
+        sent = len(self.bus.writes)
+        self.assertTrue(self.lidar.apply_mode("tracking"))
+        self.assertGreater(len(self.bus.writes), sent)
+
+    def test_reopen_opens_new_bus(self):
+        """reopen() closes the bus and continues on a newly opened one"""
+        buses = []
+
+        def open_bus():
+            buses.append(FakeBus(make_frame(200)))
+            return buses[-1]
+
+        lidar = Lidar(bus_id=1, bus_factory=open_bus)
+        lidar.reopen()
+        self.assertEqual(len(buses), 2)
+        self.assertTrue(buses[0].closed)
+        self.assertIs(lidar.bus, buses[1])
+        self.assertTrue(lidar.update())
+        self.assertEqual(lidar.distance, 200)
+
+    def test_reopen_default_bus(self):
+        """Without an injected bus reopen() opens the I2C bus again"""
+        with patch("smbus2.SMBus", side_effect=lambda _: FakeBus(make_frame(200))):
+            lidar = Lidar(bus_id=1)
+            old = lidar.bus
+            lidar.reopen()
+        self.assertIsNot(lidar.bus, old)
+        self.assertTrue(old.closed)
+        self.assertTrue(lidar.update())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,7 +22,7 @@ def run_hardware_unit_test():
             lidar2.update()
             data1 = lidar.get_data()
             data2 = lidar2.get_data()
-            print(f"l1 = {data1['distance']}, l2 = {data2['distance']}")
+            print(f"l1 = {data1.distance}, l2 = {data2.distance}")
             time.sleep(0.1)
     except KeyboardInterrupt:
         lidar.close()
@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from drivers.motion_history import MotionHistory
+
+
+class TestMotionHistory(unittest.TestCase):
+    def test_initial_angle(self):
+        """Before anything is recorded the initial angle is reported"""
+        history = MotionHistory(angle=30.0)
+        self.assertEqual(history.angle_at(5.0), 30.0)
+        self.assertIsNone(history.latest())
+
+    def test_interpolates_between_points(self):
+        """Times between points get the linearly interpolated angle"""
+        history = MotionHistory()
+        history.record(1.0, 0.0)
+        history.record(2.0, 10.0)
+        self.assertAlmostEqual(history.angle_at(1.25), 2.5)
+        np.testing.assert_allclose(history.angle_at([0.0, 1.5, 3.0]), [0.0, 5.0, 10.0])
+
+    def test_extend_records_a_step_train(self):
+        """A vectorized run of points is added in order"""
+        history = MotionHistory()
+        history.extend(np.arange(10.0), np.arange(10.0) * 2)
+        self.assertEqual(len(history), 10)
+        self.assertEqual(history.latest(), (9.0, 18.0))
+        self.assertAlmostEqual(history.angle_at(4.5), 9.0)
+
+    def test_ring_buffer_keeps_newest(self):
+        """Beyond capacity the oldest points are overwritten"""
+        history = MotionHistory(capacity=8)
+        for i in range(20):
+            history.record(float(i), float(i))
+        times, angles = history.window()
+        np.testing.assert_array_equal(times, np.arange(12.0, 20.0))
+        np.testing.assert_array_equal(angles, times)
+
+        history.extend(np.arange(20.0, 40.0), np.arange(20.0, 40.0))
+        times, _ = history.window()
+        np.testing.assert_array_equal(times, np.arange(32.0, 40.0))
+
+    def test_retarget_replaces_planned_points(self):
+        """An earlier point cuts off the planned points after it"""
+        history = MotionHistory()
+        history.record(0.0, 0.0)
+        history.record(10.0, 100.0)
+        # Retargeted halfway, back to 0 by t=7
+        history.record(5.0, 50.0)
+        history.record(7.0, 0.0)
+        self.assertEqual(len(history), 3)
+        self.assertAlmostEqual(history.angle_at(6.0), 25.0)
+        self.assertEqual(history.angle_at(9.0), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
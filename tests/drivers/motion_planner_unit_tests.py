@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from drivers.motion_planner import MotionLimits, move_duration, plan_periods
+
+TRAPEZOID = MotionLimits(max_speed=1000.0, accel=4000.0, start_speed=100.0)
+S_CURVE = MotionLimits(max_speed=1000.0, accel=4000.0, jerk=40000.0, start_speed=100.0)
+
+
+class TestMotionPlanner(unittest.TestCase):
+    def test_one_period_per_step(self):
+        """Every step gets a positive period"""
+        for limits in (TRAPEZOID, S_CURVE):
+            for steps in (1, 7, 120, 5000):
+                periods = plan_periods(steps, limits)
+                self.assertEqual(len(periods), steps)
+                self.assertTrue((periods > 0).all())
+
+    def test_speed_limit(self):
+        """Long moves cruise at, and never exceed, the maximum speed"""
+        periods = plan_periods(5000, TRAPEZOID)
+        self.assertAlmostEqual(periods.min(), 1 / 1000.0, places=6)
+        self.assertAlmostEqual(np.median(periods), 1 / 1000.0, places=6)
+
+    def test_profile_is_symmetric(self):
+        """Acceleration and deceleration mirror each other"""
+        periods = plan_periods(800, S_CURVE)
+        np.testing.assert_allclose(periods, periods[::-1], rtol=1e-6)
+
+    def test_acceleration_limit(self):
+        """Speed changes between steps respect the acceleration limit"""
+        periods = plan_periods(5000, TRAPEZOID)
+        speed = 1 / periods
+        accel = np.diff(speed) / ((periods[1:] + periods[:-1]) / 2)
+        self.assertLess(np.abs(accel).max(), 4000.0 * 1.05)
+
+    def test_s_curve_is_gentler(self):
+        """Limiting jerk lengthens the ramps"""
+        self.assertGreater(move_duration(2000, S_CURVE), move_duration(2000, TRAPEZOID))
+
+    def test_faster_than_constant_rate(self):
+        """A planned slew beats stepping at the start speed throughout"""
+        self.assertLess(move_duration(3200, TRAPEZOID), 3200 / 100.0 / 5)
+
+    def test_profiles_are_cached(self):
+        """Equal requests share one read-only profile"""
+        first = plan_periods(300, TRAPEZOID)
+        second = plan_periods(300, MotionLimits(1000.0, 4000.0, None, 100.0))
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+
+    def test_scaled_limits(self):
+        """Per-degree limits convert to steps"""
+        limits = MotionLimits(60.0, 240.0, 2400.0, 5.0).scaled(10.0)
+        self.assertEqual(limits, MotionLimits(600.0, 2400.0, 24000.0, 50.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
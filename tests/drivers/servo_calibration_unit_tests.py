@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from drivers.servo_calibration import PulseTable, load_calibration, save_calibration
+from drivers.servo_motor import Servo
+from tests.drivers.servo_motor_unit_tests import FakePi
+
+# A servo that travels less per microsecond towards its upper end
+POINTS = [(0.0, 600.0), (90.0, 1500.0), (150.0, 2100.0), (170.0, 2400.0)]
+
+
+class TestPulseTable(unittest.TestCase):
+    def test_measured_points_are_exact(self):
+        """The table reproduces every measured pair"""
+        table = PulseTable(POINTS)
+        for angle, pulse in POINTS:
+            self.assertAlmostEqual(table.pulse_width(angle), pulse, places=6)
+
+    def test_interpolates_between_points(self):
+        """Angles between measurements are linearly interpolated"""
+        table = PulseTable(POINTS)
+        self.assertAlmostEqual(table.pulse_width(45.0), 1050.0, places=6)
+        self.assertAlmostEqual(table.pulse_width(160.0), 2250.0, places=6)
+        self.assertAlmostEqual(table.pulse_width(45.05), 1050.5, places=6)
+
+    def test_extrapolates_end_segments(self):
+        """Angles beyond the measured range follow the outer slopes"""
+        table = PulseTable(POINTS)
+        self.assertAlmostEqual(table.pulse_width(175.0), 2475.0, places=6)
+        self.assertAlmostEqual(PulseTable(POINTS[1:]).pulse_width(0.0), 600.0)
+
+    def test_clips_to_servo_range(self):
+        """Extrapolated pulse widths stay within min_us and max_us"""
+        table = PulseTable([(30.0, 800.0), (150.0, 2200.0)])
+        self.assertAlmostEqual(table.pulse_width(0.0), 500.0)
+        self.assertAlmostEqual(table.pulse_width(180.0), 2500.0)
+        self.assertAlmostEqual(PulseTable(POINTS).pulse_width(180.0), 2500.0)
+
+        narrow = PulseTable([(60.0, 1200.0), (120.0, 1800.0)], min_us=1000, max_us=2000)
+        self.assertAlmostEqual(narrow.pulse_width(90.0), 1500.0)
+        self.assertAlmostEqual(narrow.pulse_width(0.0), 1000.0)
+        self.assertAlmostEqual(narrow.pulse_width(180.0), 2000.0)
+
+    def test_rejects_inconsistent_points(self):
+        """Non-monotonic measurements cannot build a table"""
+        with self.assertRaises(ValueError):
+            PulseTable([(10.0, 600.0), (5.0, 900.0)])
+        with self.assertRaises(ValueError):
+            PulseTable([(10.0, 600.0)])
+        with self.assertRaises(ValueError):
+            PulseTable([(0.0, 400.0), (90.0, 1500.0)])
+        with self.assertRaises(ValueError):
+            PulseTable(POINTS, max_us=2300)
+
+
+class TestCalibrationFile(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def test_round_trip(self):
+        """Saved points load back into an equivalent table"""
+        save_calibration(POINTS, self.path)
+        table = load_calibration(self.path)
+        self.assertEqual(table.points, POINTS)
+
+    def test_missing_or_broken_file(self):
+        """Unusable files fall back to no calibration"""
+        self.assertIsNone(load_calibration(self.path + ".missing"))
+        with open(self.path, "w") as f:
+            f.write("[{")
+        self.assertIsNone(load_calibration(self.path))
+
+    def test_servo_uses_table(self):
+        """The servo drives calibrated pulse widths, linear without a file"""
+        save_calibration(POINTS, self.path)
+        pi = FakePi()
+        servo = Servo(angle=150, speed=10000, pi=pi, calibration=self.path)
+        self.addCleanup(servo.close)
+        self.assertAlmostEqual(pi.pulses[-1], 2100.0, places=6)
+
+        pi = FakePi()
+        servo = Servo(angle=150, speed=10000, pi=pi, calibration=None)
+        self.addCleanup(servo.close)
+        self.assertAlmostEqual(pi.pulses[-1], 500 + 2000 * 150 / 180)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -62,7 +62,7 @@ def test_servo():
     time.sleep(1)
 
     start = time.time()
-    servo.set_angle(60)  # 60° move
+    servo.set_angle(60).result()  # 60° move
     elapsed = time.time() - start
 
     print(
@@ -90,8 +90,9 @@ def test_servo():
     # Test 6: Internal state tracking
     # -------------------------------------------------
     print("[TEST 6] Testing get_angle()")
-    servo.set_angle(45)
-    time.sleep(0.5)
+    arrived = servo.set_angle(45)
+    print(f" → get_angle() while moving: {servo.get_angle():.1f}")
+    arrived.result()
 
     angle = servo.get_angle()
     print(f" → get_angle() returned: {angle}")
@@ -105,8 +106,8 @@ def test_servo():
     # -------------------------------------------------
     print("[TEST 8] Long-term stability test")
     for i in range(10):
-        servo.set_angle(0)
-        servo.set_angle(180)
+        servo.set_angle(0).result()
+        servo.set_angle(180).result()
     print("✔ Stability test complete\n")
 
     # -------------------------------------------------
@@ -120,7 +121,7 @@ def test_servo():
     servo.set_angle(90)
     time.sleep(1)
 
-    servo.stop()
+    servo.close()
     print(" → Servo PWM stopped")
     print(" → Shaft should now move freely by hand")
     time.sleep(2)
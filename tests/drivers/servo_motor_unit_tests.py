@@ -0,0 +1,137 @@
+import threading
+import time
+import unittest
+
+from drivers.servo_motor import Servo
+
+
+class FakePi:
+    """Records the pulse widths a pigpio connection would output."""
+
+    connected = True
+
+    def __init__(self):
+        self.pulses = []
+        self.lock = threading.Lock()
+
+    def set_servo_pulsewidth(self, pin, pulsewidth):
+        with self.lock:
+            self.pulses.append(pulsewidth)
+
+
+class FailingPi(FakePi):
+    """Refuses pulse widths while failing is set, like a bad pigpio call."""
+
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+
+    def set_servo_pulsewidth(self, pin, pulsewidth):
+        if self.failing and pulsewidth:
+            raise RuntimeError("bad pulsewidth")
+        super().set_servo_pulsewidth(pin, pulsewidth)
+
+
+class TestServo(unittest.TestCase):
+    def setUp(self):
+        self.pi = FakePi()
+        # 100°/s keeps moves long enough to observe
+        self.servo = Servo(
+            angle=0, speed=100, update_period=0.005, pi=self.pi, calibration=None
+        )
+        self.addCleanup(self.servo.close)
+
+    def test_set_angle_returns_immediately(self):
+        """Commands return before the move has taken its physical time"""
+        start = time.monotonic()
+        arrived = self.servo.set_angle(30)
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertFalse(arrived.done())
+        self.assertFalse(self.servo.done)
+
+        self.assertEqual(arrived.result(timeout=1.0), 30)
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        self.assertTrue(self.servo.done)
+        self.assertEqual(self.pi.pulses[-1], 500 + 2000 * 30 / 180)
+
+    def test_angle_is_interpolated(self):
+        """get_angle() follows the move at the configured speed"""
+        self.servo.set_angle(40)
+        time.sleep(0.2)
+        self.assertAlmostEqual(self.servo.get_angle(), 20, delta=5)
+        self.assertEqual(self.servo.get_target(), 40)
+        self.assertTrue(self.servo.wait(timeout=1.0))
+        self.assertEqual(self.servo.get_angle(), 40)
+
+    def test_smooth_move_ramps_pulses(self):
+        """Smooth moves step the pulse width towards the target"""
+        self.pi.pulses.clear()
+        self.servo.set_angle(10).result(timeout=1.0)
+        self.assertGreater(len(self.pi.pulses), 2)
+        self.assertEqual(self.pi.pulses, sorted(self.pi.pulses))
+
+    def test_retarget_resolves_superseded_move(self):
+        """A new command takes over from the estimated position"""
+        first = self.servo.set_angle(60)
+        time.sleep(0.1)
+        second = self.servo.set_angle(0)
+        self.assertLess(self.servo.get_angle(), 12)
+        self.assertEqual(second.result(timeout=1.0), 0)
+        self.assertEqual(first.result(timeout=0), 0)
+
+    def test_stop_completes_pending_moves(self):
+        """stop() ends the move where it is and turns the pulses off"""
+        arrived = self.servo.set_angle(90)
+        time.sleep(0.1)
+        self.servo.stop()
+        angle = arrived.result(timeout=0.1)
+        self.assertAlmostEqual(angle, 10, delta=5)
+        self.assertEqual(self.pi.pulses[-1], 0)
+
+    def test_out_of_bounds(self):
+        """Angles outside 0–180° are rejected before anything moves"""
+        with self.assertRaises(ValueError):
+            self.servo.set_angle(200)
+        self.assertTrue(self.servo.done)
+
+    def test_history_tracks_moves(self):
+        """The history interpolates a move and is cut short by a retarget"""
+        start = time.monotonic()
+        self.servo.set_angle(60)
+        self.assertAlmostEqual(
+            self.servo.history.angle_at(start + 0.3), 30.0, delta=1.0
+        )
+        time.sleep(0.1)
+        self.servo.set_angle(0).result(timeout=1.0)
+        end, angle = self.servo.history.latest()
+        self.assertEqual(angle, 0.0)
+        self.assertLess(end, start + 0.3)
+
+
+class TestServoFailures(unittest.TestCase):
+    def test_failed_update_fails_move(self):
+        """A refused pulse width fails the move and keeps the thread alive"""
+        pi = FailingPi()
+        servo = Servo(angle=0, speed=100, pi=pi, calibration=None)
+        self.addCleanup(servo.close)
+
+        pi.failing = True
+        arrived = servo.set_angle(30)
+        with self.assertRaises(RuntimeError):
+            arrived.result(timeout=1.0)
+        self.assertTrue(servo.done)
+        self.assertLess(servo.get_target(), 30)
+
+        pi.failing = False
+        self.assertEqual(servo.set_angle(10).result(timeout=1.0), 10)
+
+    def test_failed_initial_move(self):
+        """The constructor raises instead of waiting forever"""
+        pi = FailingPi()
+        pi.failing = True
+        with self.assertRaises(RuntimeError):
+            Servo(angle=30, speed=100, pi=pi, calibration=None)
+
+
+if __name__ == "__main__":
+    unittest.main()
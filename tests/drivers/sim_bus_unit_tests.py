@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+from drivers.lidar import (
+    STATUS_BAD_CHECKSUM,
+    STATUS_IO_ERROR,
+    STATUS_OK,
+    STATUS_WEAK_SIGNAL,
+    Lidar,
+)
+from drivers.sim_bus import Scene, SimulatedBus, encode_frame, sim_bus_factory
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSimulatedBus(unittest.TestCase):
+    def setUp(self):
+        patch("drivers.lidar.time.sleep").start()
+        self.addCleanup(patch.stopall)
+
+    def lidar(self, scene, bus_id=1):
+        return Lidar(bus_id=bus_id, bus=SimulatedBus(scene, bus_id))
+
+    def test_encode_frame_checksum(self):
+        """Encoded frames carry the header and a valid checksum"""
+        frame = encode_frame(100, 1000)
+        self.assertEqual(frame[:2], b"\x59\x59")
+        self.assertEqual(frame[-1], sum(frame[:-1]) & 0xFF)
+
+    def test_on_target_reading(self):
+        """A sensor whose beam covers the target reports its range"""
+        scene = Scene(target_el=91.5, target_range=0.5, noise_std=0.0)
+        lidar = self.lidar(scene)
+        self.assertTrue(lidar.update())
+        self.assertEqual(lidar.distance, 50)
+        self.assertEqual(lidar.strength, scene.strength)
+
+    def test_mount_offsets_split_the_target(self):
+        """Upper and lower sensors see a target above the boresight differently"""
+        scene = Scene(target_el=91.5, noise_std=0.0)
+        upper, lower = self.lidar(scene, 1), self.lidar(scene, 3)
+        self.assertTrue(upper.update())
+        self.assertEqual(upper.last_status, STATUS_OK)
+        self.assertTrue(lower.update())
+        self.assertEqual(lower.last_status, STATUS_WEAK_SIGNAL)
+
+        scene.point(0.0, 93.0)
+        lower.update()
+        self.assertEqual(lower.last_status, STATUS_OK)
+
+    def test_target_motion(self):
+        """The target moves at the configured rates on the scene clock"""
+        clock = ManualClock()
+        scene = Scene(target_az=0.0, az_rate=10.0, range_rate=-0.1, clock=clock)
+        clock.now = 2.0
+        az, el, rng = scene.target_at()
+        self.assertAlmostEqual(az, 20.0)
+        self.assertAlmostEqual(rng, scene.target_range - 0.2)
+
+    def test_dropouts_and_corruption(self):
+        """Dropouts fail the transaction and corrupt frames fail the checksum"""
+        lidar = self.lidar(Scene(target_el=91.5, dropout_rate=1.0))
+        self.assertFalse(lidar.update())
+        self.assertEqual(lidar.last_status, STATUS_IO_ERROR)
+
+        lidar = self.lidar(Scene(target_el=91.5, corrupt_rate=1.0))
+        self.assertFalse(lidar.update())
+        self.assertEqual(lidar.last_status, STATUS_BAD_CHECKSUM)
+
+    def test_seeded_noise_is_reproducible(self):
+        """Equal seeds yield equal reading sequences"""
+
+        def run():
+            lidar = self.lidar(Scene(target_el=91.5, noise_std=0.05, seed=7))
+            return [lidar.update() and lidar.distance for _ in range(20)]
+
+        self.assertEqual(run(), run())
+
+    def test_factory(self):
+        """The factory builds a bus per sensor from the same scene"""
+        scene = Scene()
+        bus = sim_bus_factory(scene)(4)
+        self.assertIs(bus.scene, scene)
+        self.assertEqual(bus.offset, (-1.5, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
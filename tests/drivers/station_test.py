@@ -25,10 +25,10 @@ def run_stress_test():
         print("\n[Phase 2] High-Torque Multi-Axis Stress")
         for i in range(3):
             print(f"  Cycle {i+1}: Snapping to Extremes")
-            # Move to bottom-left fast
-            station.move_to(-30, 10, delay=0.0003)
-            # Move to top-right slow (precision)
-            station.move_to(30, 170, delay=0.005)
+            # Move to bottom-left, each axis at full speed
+            station.move_to(-30, 10, synchronize=False)
+            # Move to top-right, both axes arriving together
+            station.move_to(30, 170)
             time.sleep(0.2)
 
         # TEST 3: Infinite Detection Loop (Manual verification)
@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import patch
+
+from drivers.step_pulser import MAX_LOOP_COUNT, WavePulser
+
+
+class FakePi:
+    """Keeps the waves and chains a pigpio connection would transmit."""
+
+    connected = True
+
+    def __init__(self):
+        self.pending = []
+        self.waves = {}
+        self.chain = None
+        self.busy = False
+        self.next_id = 0
+
+    def set_mode(self, pin, mode):
+        pass
+
+    def write(self, pin, level):
+        pass
+
+    def wave_add_generic(self, pulses):
+        self.pending += pulses
+
+    def wave_create(self):
+        wave_id = self.next_id
+        self.next_id += 1
+        self.waves[wave_id], self.pending = self.pending, []
+        return wave_id
+
+    def wave_delete(self, wave_id):
+        del self.waves[wave_id]
+
+    def wave_chain(self, chain):
+        self.chain = chain
+        self.busy = True
+        return 0
+
+    def wave_tx_busy(self):
+        return int(self.busy)
+
+    def wave_tx_stop(self):
+        self.busy = False
+
+    def expand(self):
+        """Returns the step periods the chain would produce."""
+        periods, i, chain = [], 0, self.chain
+        while i < len(chain):
+            if chain[i] == 255 and chain[i + 1] == 0:
+                wave = self.waves[chain[i + 2]]
+                loops = chain[i + 5] + 256 * chain[i + 6]
+                periods += [wave[0].delay + wave[1].delay] * loops
+                i += 7
+            else:
+                wave = self.waves[chain[i]]
+                periods += [a.delay + b.delay for a, b in zip(wave[::2], wave[1::2])]
+                i += 1
+        return periods
+
+
+class TestWavePulser(unittest.TestCase):
+    def setUp(self):
+        self.pi = FakePi()
+        self.pulser = WavePulser(step_pin=24, pi=self.pi)
+
+    def test_constant_train_is_one_looped_wave(self):
+        """A constant-rate train is a single-step wave repeated by a loop"""
+        self.pulser.start_constant(400, 0.0005)
+        self.assertEqual(len(self.pi.waves), 1)
+        self.assertEqual(self.pi.expand(), [1000] * 400)
+
+        pulses = self.pi.waves[0]
+        self.assertEqual(pulses[0].gpio_on, 1 << 24)
+        self.assertEqual(pulses[1].gpio_off, 1 << 24)
+
+    def test_long_runs_split_loops(self):
+        """Runs longer than a chain loop counter are split"""
+        self.pulser.start([100] * (MAX_LOOP_COUNT + 10))
+        self.assertEqual(len(self.pi.expand()), MAX_LOOP_COUNT + 10)
+
+    def test_irregular_train(self):
+        """Ramps are packed into waves and keep their exact timing"""
+        periods = [2000, 1500, 1200, 1000, 1000, 1000, 1200, 1500, 2000]
+        self.pulser.start(periods)
+        self.assertEqual(self.pi.expand(), periods)
+
+    def test_wait_releases_waves(self):
+        """Waves are deleted once the train is done"""
+        self.pulser.start_constant(10, 0.001)
+        self.pi.busy = False
+        self.assertTrue(self.pulser.wait())
+        self.assertEqual(self.pi.waves, {})
+        self.assertEqual(self.pulser.steps_done(), 10)
+
+    def test_empty_train_counts_no_steps(self):
+        """An empty train does not report the steps of the previous one"""
+        self.pulser.start_constant(5, 0.001)
+        self.pi.busy = False
+        self.assertTrue(self.pulser.wait())
+        self.pulser.start([])
+        self.assertEqual(self.pulser.steps_done(), 0)
+
+    def test_refuses_overlapping_trains(self):
+        """A second train cannot start while one is running"""
+        self.pulser.start_constant(10, 0.001)
+        with self.assertRaises(RuntimeError):
+            self.pulser.start_constant(10, 0.001)
+
+    def test_stop_counts_emitted_steps(self):
+        """Stopping reports the steps emitted according to the schedule"""
+        with patch("drivers.step_pulser.time.monotonic", side_effect=[0.0, 0.0045]):
+            self.pulser.start_constant(100, 0.0005)
+            done = self.pulser.stop()
+        self.assertEqual(done, 5)
+        self.assertFalse(self.pulser.busy())
+
+
+if __name__ == "__main__":
+    unittest.main()
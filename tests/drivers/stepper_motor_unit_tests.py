@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import patch
+from drivers.step_pulser import WavePulser
 from drivers.stepper_motor import StepperMotor, SAFE_MICROSTEP
+from tests.drivers.step_pulser_unit_tests import FakePi
 
 
 class TestStepperMotor(unittest.TestCase):
@@ -80,6 +82,31 @@ class VerboseTestResult(unittest.TextTestResult):
         print(f"[ERROR] {test._testMethodName}: {test._testMethodDoc}")
 
 
+class TestMicrostepSwitching(unittest.TestCase):
+    def test_switching_keeps_sub_step_position(self):
+        """Coarse steps between fine ones do not lose the fine position"""
+        motor = StepperMotor(motor_steps_per_rev=200, microstep=8, gpio_backend="sim")
+        motor.step(3, delay=0)
+        motor.set_microstepping_state(1)
+        self.assertEqual(motor.position, 0)
+        motor.step(2, delay=0)
+        motor.set_microstepping_state(8)
+        self.assertEqual(motor.position, 3 + 2 * 8)
+
+
+class TestHardwareTiming(unittest.TestCase):
+    def test_empty_train_after_train(self):
+        """A move of zero steps does not count the previous train again"""
+        motor = StepperMotor(motor_steps_per_rev=200, microstep=8, gpio_backend="sim")
+        pi = FakePi()
+        motor.pulser = WavePulser(step_pin=24, pi=pi)
+
+        motor.step_async(5, delay=0.001)
+        pi.busy = False
+        motor.step(0)
+        self.assertEqual(motor.position, 5)
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(resultclass=VerboseTestResult, verbosity=0)
     unittest.main(testRunner=runner, exit=False)
@@ -48,13 +48,13 @@ def test_measurement_noise(num_samples: int = 200, sample_interval: float = 0.02
             log(
                 "INFO",
                 "NOISE TEST",
-                f"Sample {i+1}: LIDAR1={station.lidar1.distance/100:.4f}m, "
-                f"LIDAR2={station.lidar2.distance/100:.4f}m, "
+                f"Sample {i+1}: LIDAR1={station.lidars[0].distance/100:.4f}m, "
+                f"LIDAR2={station.lidars[1].distance/100:.4f}m, "
                 f"Detected={detected}, Combined={station.distance:.4f}m",
             )
 
-        lidar1_readings.append(station.lidar1.distance / 100.0)
-        lidar2_readings.append(station.lidar2.distance / 100.0)
+        lidar1_readings.append(station.lidars[0].distance / 100.0)
+        lidar2_readings.append(station.lidars[1].distance / 100.0)
 
         if detected and station.distance > 0:
             distances.append(station.distance)